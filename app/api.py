@@ -2,20 +2,52 @@
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import json
+import threading
 import time
-import sqlite3
-from typing import Any, Dict, List, Optional
-
-from fastapi import Depends, FastAPI, HTTPException, Query
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import (
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
-from app.sqlite_store import initialize_db
+from app.broadcast import ReadingBroadcaster, Subscription, encode_event
+from app.export import MEDIA_TYPES, stream_export
+from app.live_feed import LiveFeedReader
+from app.recent_readings import DEFAULT_CAPACITY, RecentReadingsCache
+from app.sqlite_store import (
+    ROLLUP_BUCKETS,
+    ReadOnlyPool,
+    as_utc,
+    initialize_db,
+    utc_isoformat,
+)
 
 
 APP_START_TIME = time.time()
 DB_PATH = "/var/lib/pi-log/readings.db"
+READ_POOL_SIZE = 4
+RECENT_CACHE_ROWS = DEFAULT_CAPACITY
+LIVE_FEED_PATH: Optional[str] = "/run/pi-log/live.feed"
+SSE_KEEPALIVE_SECONDS = 15.0
 
-app = FastAPI(title="Pi-Log API", version="0.1.0")
+# Readings arrive about once a second: a shared cache may reuse a response
+# for that long, then must revalidate (cheap, see Store.read_version)
+READINGS_CACHE_CONTROL = "public, max-age=1, must-revalidate"
 
 
 class HealthDBStatus(BaseModel):
@@ -35,95 +67,504 @@ class Reading(BaseModel):
     cps: float
     cpm: float
     mode: str
+    device_id: Optional[str] = None
     raw: Optional[str] = None
 
 
+class AggregateBucket(BaseModel):
+    bucket_start: str
+    count: int
+    cpm_min: float
+    cpm_max: float
+    cpm_mean: float
+    usv_min: float
+    usv_max: float
+    usv_mean: float
+
+
 class MetricsResponse(BaseModel):
     ingested_count: int
     uptime_seconds: float
     version: str = "0.1.0"
 
 
-class Store:
-    """Canonical SQLite store wrapper for API use."""
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
 
-    def __init__(self, db_path: str) -> None:
+def encode_cursor(timestamp: str, row_id: int) -> str:
+    raw = json.dumps([timestamp, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return str(timestamp), int(row_id)
+    except Exception:
+        raise InvalidCursor(cursor) from None
+
+
+def _epoch_bucket(value: datetime, bucket_seconds: int) -> int:
+    """
+    Start (unix seconds) of the bucket containing value.
+    """
+    epoch = int(as_utc(value).timestamp())
+    return epoch - epoch % bucket_seconds
+
+
+_READING_COLUMNS = """
+SELECT id, raw, counts_per_second, counts_per_minute,
+       microsieverts_per_hour, mode, device_id,
+       timestamp, pushed
+FROM geiger_readings
+"""
+
+
+# Newest reading time among rows up to a given id; walks the timestamp
+# index from the top and stops at the first row at or below that id
+_NEWEST_TIMESTAMP_SQL = """
+SELECT timestamp FROM geiger_readings
+WHERE id <= ?
+ORDER BY timestamp DESC
+LIMIT 1
+"""
+
+
+def _epoch_seconds(timestamp: Optional[str]) -> Optional[float]:
+    """
+    Stored timestamp as a Last-Modified value: never in the future
+    (RFC 9110 §8.8.2.1), and None when missing or unparseable.
+    """
+    if timestamp is None:
+        return None
+    try:
+        value = as_utc(datetime.fromisoformat(timestamp)).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return min(value, time.time())
+
+
+def _row_to_reading(row: Tuple[Any, ...]) -> Dict[str, Any]:
+    return {
+        "id": row[0],
+        "raw": row[1],
+        "cps": row[2],
+        "cpm": row[3],
+        "mode": row[5],
+        "device_id": row[6],
+        "timestamp": row[7],
+    }
+
+
+class Store:
+    """
+    Canonical SQLite store wrapper for API use.
+
+    Created once per process. The schema is ensured at construction; every
+    request after that reads through a pool of read-only WAL connections,
+    so serving the API never writes to the database.
+
+    Latest/recent queries are answered from an in-memory ring of the last
+    cache_rows readings (0 disables it) that follows new commits. When the
+    agent publishes a live feed, the latest reading comes straight from
+    the shared mapping unless SQLite has a newer row and, while the feed
+    is moving, the ring only checks
+    SQLite when the feed announces a row it has not loaded.
+
+    /readings/stream subscribers share one ReadingBroadcaster, which uses
+    the Store as its ReadingSource.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        pool_size: int = READ_POOL_SIZE,
+        cache_rows: int = RECENT_CACHE_ROWS,
+        live_feed_path: Optional[str] = None,
+    ) -> None:
         self.db_path = db_path
         initialize_db(db_path)
+        self.pool = ReadOnlyPool(db_path, size=pool_size)
+        self.feed: Optional[LiveFeedReader] = (
+            LiveFeedReader(live_feed_path) if live_feed_path else None
+        )
+        self.recent: Optional[RecentReadingsCache] = None
+        if cache_rows:
+            self.recent = RecentReadingsCache(
+                db_path,
+                capacity=cache_rows,
+                published_max_id=self.feed.max_id if self.feed else None,
+            )
+        # Watcher thread starts with the first subscriber
+        self.broadcaster = ReadingBroadcaster(self)
+
+        # (max row id, newest reading time up to it); see read_version()
+        self._version_lock = threading.Lock()
+        self._version: Tuple[int, Optional[float]] = (0, None)
+        self._count: Tuple[int, int] = (0, 0)
+
+    def close(self) -> None:
+        self.broadcaster.close()
+        if self.feed is not None:
+            self.feed.close()
+        if self.recent is not None:
+            self.recent.close()
+        self.pool.close()
+
+    def read_version(self) -> Tuple[int, Optional[float]]:
+        """
+        (max committed row id, newest stored reading time in epoch seconds,
+        or None if it cannot be parsed).
+
+        Readings are append-only, so every read endpoint's answer is a
+        function of the max row id. With the recent cache this costs one
+        PRAGMA data_version (or nothing, when the live feed says no new
+        row exists); without it, one primary-key lookup. The reading time
+        is only looked up (on the timestamp index) when the max id moves.
+        """
+        max_id = self._committed_max_id()
+        with self._version_lock:
+            version = self._version
+        if max_id == version[0]:
+            return version
+
+        with self.pool.connection() as conn:
+            row = conn.execute(_NEWEST_TIMESTAMP_SQL, (max_id,)).fetchone()
+        modified_at = _epoch_seconds(row[0] if row else None)
+
+        with self._version_lock:
+            if self._version == version:
+                self._version = (max_id, modified_at)
+            return self._version
 
     def get_latest_reading(self) -> Optional[Dict[str, Any]]:
-        conn = sqlite3.connect(self.db_path)
-        try:
-            row = conn.execute(
-                """
-                SELECT id, raw, counts_per_second, counts_per_minute,
-                       microsieverts_per_hour, mode, device_id,
-                       timestamp, pushed
-                FROM geiger_readings
-                ORDER BY id DESC LIMIT 1
-                """
-            ).fetchone()
+        if self.feed is not None:
+            latest = self.feed.latest()
+            # A feed left behind by a stopped agent, or rows from a writer
+            # that does not publish, put the feed behind SQLite
+            if latest is not None and latest["id"] >= self._committed_max_id():
+                return latest
 
-            if row is None:
-                return None
+        if self.recent is not None:
+            return self.recent.latest()
 
-            return {
-                "id": row[0],
-                "raw": row[1],
-                "cps": row[2],
-                "cpm": row[3],
-                "mode": row[5],
-                "timestamp": row[7],
-            }
-        finally:
-            conn.close()
+        with self.pool.connection() as conn:
+            row = conn.execute(_READING_COLUMNS + "ORDER BY id DESC LIMIT 1").fetchone()
+
+        if row is None:
+            return None
+        return _row_to_reading(row)
 
     def get_recent_readings(self, limit: int) -> List[Dict[str, Any]]:
-        conn = sqlite3.connect(self.db_path)
-        try:
+        if self.recent is not None:
+            cached = self.recent.recent(limit)
+            if cached is not None:
+                return cached
+
+        with self.pool.connection() as conn:
             rows = conn.execute(
-                """
-                SELECT id, raw, counts_per_second, counts_per_minute,
-                       microsieverts_per_hour, mode, device_id,
-                       timestamp, pushed
-                FROM geiger_readings
-                ORDER BY id DESC LIMIT ?
-                """,
+                _READING_COLUMNS + "ORDER BY id DESC LIMIT ?",
                 (limit,),
             ).fetchall()
 
-            return [
-                {
-                    "id": r[0],
-                    "raw": r[1],
-                    "cps": r[2],
-                    "cpm": r[3],
-                    "mode": r[5],
-                    "timestamp": r[7],
-                }
-                for r in rows
-            ]
-        finally:
-            conn.close()
+        return [_row_to_reading(r) for r in rows]
+
+    def query_readings(
+        self,
+        limit: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        device_id: Optional[str] = None,
+        mode: Optional[str] = None,
+        cursor: Optional[str] = None,
+        order: str = "desc",
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Filtered, keyset-paginated readings ordered by (timestamp, id).
+
+        `since` is inclusive and `until` exclusive. The cursor is folded
+        into the timestamp bound so every page is a bounded range search
+        on idx_geiger_readings_timestamp (no OFFSET, no sort step).
+        Returns (rows, next_cursor); next_cursor is None on the last page.
+        """
+        descending = order != "asc"
+
+        # Unfiltered first page: the dashboard poll, served from memory
+        unfiltered = (since, until, device_id, mode, cursor) == (None,) * 5
+        if descending and unfiltered and self.recent is not None:
+            cached = self.recent.recent(limit + 1)
+            if cached is not None:
+                if len(cached) <= limit:
+                    return cached, None
+                cached = cached[:limit]
+                last = cached[-1]
+                return cached, encode_cursor(last["timestamp"], last["id"])
+
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(utc_isoformat(since))
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(utc_isoformat(until))
+        if cursor is not None:
+            cursor_ts, cursor_id = decode_cursor(cursor)
+            if descending:
+                clauses.append("timestamp <= ?")
+                clauses.append("(timestamp < ? OR id < ?)")
+            else:
+                clauses.append("timestamp >= ?")
+                clauses.append("(timestamp > ? OR id > ?)")
+            params.extend([cursor_ts, cursor_ts, cursor_id])
+        if device_id is not None:
+            clauses.append("device_id = ?")
+            params.append(device_id)
+        if mode is not None:
+            clauses.append("mode = ?")
+            params.append(mode)
+
+        sql = _READING_COLUMNS
+        if clauses:
+            sql += "WHERE " + " AND ".join(clauses) + "\n"
+        direction = "DESC" if descending else "ASC"
+        sql += f"ORDER BY timestamp {direction}, id {direction} LIMIT ?"
+        params.append(limit + 1)
+
+        with self.pool.connection() as conn:
+            rows: List[Tuple[Any, ...]] = conn.execute(sql, params).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_timestamp, last_id = rows[-1][7], rows[-1][0]
+            next_cursor = encode_cursor(last_timestamp, last_id)
+
+        return [_row_to_reading(r) for r in rows], next_cursor
+
+    def get_aggregates(
+        self,
+        bucket_seconds: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        device_id: Optional[str] = None,
+        limit: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-bucket CPM / uSv/h statistics from geiger_rollups.
+
+        Buckets are merged across devices unless device_id is given. Reads
+        touch one rollup row per bucket and device, never geiger_readings.
+        """
+        clauses = ["bucket_seconds = ?"]
+        params: List[Any] = [bucket_seconds]
+
+        if since is not None:
+            clauses.append("bucket_start >= ?")
+            params.append(_epoch_bucket(since, bucket_seconds))
+        if until is not None:
+            clauses.append("bucket_start < ?")
+            params.append(int(as_utc(until).timestamp()))
+        if device_id is not None:
+            clauses.append("device_id = ?")
+            params.append(device_id)
+
+        params.append(limit)
+
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT bucket_start, SUM(count),
+                       MIN(cpm_min), MAX(cpm_max), SUM(cpm_sum),
+                       MIN(usv_min), MAX(usv_max), SUM(usv_sum)
+                FROM geiger_rollups
+                WHERE {" AND ".join(clauses)}
+                GROUP BY bucket_start
+                ORDER BY bucket_start ASC
+                LIMIT ?
+                """,
+                params,
+            ).fetchall()
+
+        return [
+            {
+                "bucket_start": datetime.fromtimestamp(
+                    r[0], tz=timezone.utc
+                ).isoformat(),
+                "count": r[1],
+                "cpm_min": r[2],
+                "cpm_max": r[3],
+                "cpm_mean": r[4] / r[1],
+                "usv_min": r[5],
+                "usv_max": r[6],
+                "usv_mean": r[7] / r[1],
+            }
+            for r in rows
+        ]
+
+    # ------------------------------------------------------------
+    # ReadingSource (live stream)
+    # ------------------------------------------------------------
+
+    def _committed_max_id(self) -> int:
+        # The recent cache answers from memory while nothing was committed
+        if self.recent is not None:
+            return self.recent.high_water_id()
+        return self.max_reading_id()
+
+    def max_reading_id(self) -> int:
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT MAX(id) FROM geiger_readings").fetchone()
+        return int(row[0] or 0)
+
+    def readings_after(self, after_id: int, limit: int) -> List[Dict[str, Any]]:
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                _READING_COLUMNS + "WHERE id > ? ORDER BY id ASC LIMIT ?",
+                (after_id, limit),
+            ).fetchall()
+        return [_row_to_reading(r) for r in rows]
+
+    def change_token(self) -> Optional[int]:
+        return self.feed.seq() if self.feed is not None else None
+
+    def wait_for_change(self, token: Optional[int], timeout: float) -> None:
+        if token is None or self.feed is None:
+            time.sleep(timeout)
+            return
+        self.feed.wait(token, timeout)
 
     def count_readings(self) -> int:
-        conn = sqlite3.connect(self.db_path)
-        try:
-            row = conn.execute("SELECT COUNT(*) FROM geiger_readings").fetchone()
-            count = int(row[0])
+        """
+        Row count, maintained incrementally: only rows above the last
+        counted id are scanned (ids are assigned in commit order).
+        """
+        max_id = self.read_version()[0]
+        with self._version_lock:
+            counted_id, count = self._count
+        if max_id == counted_id:
             return count
-        finally:
-            conn.close()
+
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM geiger_readings WHERE id > ? AND id <= ?",
+                (counted_id, max_id),
+            ).fetchone()
+
+        with self._version_lock:
+            if self._count[0] == counted_id:
+                self._count = (max_id, count + int(row[0]))
+            return self._count[1]
+
+
+_store: Optional[Store] = None
+_store_lock = threading.Lock()
 
 
 def get_store() -> Store:
-    return Store(DB_PATH)
+    """
+    Return the process-wide Store, creating it on first use.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = Store(DB_PATH, live_feed_path=LIVE_FEED_PATH)
+        return _store
+
+
+def close_store() -> None:
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
+
+
+def configure_store(db_path: str, live_feed_path: Optional[str] = None) -> None:
+    """
+    Point the process-wide Store at db_path (and live_feed_path, None for
+    no feed), replacing any open one. Call before serving; the ingestion
+    agent's in-process API uses it to serve the database it writes.
+    """
+    global DB_PATH, LIVE_FEED_PATH
+    close_store()
+    with _store_lock:
+        DB_PATH = db_path
+        LIVE_FEED_PATH = live_feed_path
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    try:
+        get_store()
+    except Exception:
+        # /health reports the DB error; don't refuse to start
+        pass
+    yield
+    close_store()
+
+
+app = FastAPI(title="Pi-Log API", version="0.1.0", lifespan=lifespan)
 
 
 def get_uptime_seconds() -> float:
     return time.time() - APP_START_TIME
 
 
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110 13.1.2)
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(t.strip().removeprefix("W/") == opaque for t in header.split(","))
+
+
+def conditional_response(
+    request: Request, response: Response, store: Store
+) -> Optional[Response]:
+    """
+    Validate a read request against the store's version.
+
+    Sets ETag / Last-Modified / Cache-Control on `response` and returns a
+    304 response when the client's copy is current, else None. Must run
+    before the query, so a response is never older than its ETag.
+    """
+    max_id, modified_at = store.read_version()
+    if max_id == 0:
+        # Nothing stored yet: nothing to validate against
+        return None
+
+    headers = {
+        "ETag": f'W/"{max_id}"',
+        "Cache-Control": READINGS_CACHE_CONTROL,
+    }
+    if modified_at is not None:
+        headers["Last-Modified"] = formatdate(modified_at, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    not_modified = False
+    if if_none_match is not None:
+        # If-Modified-Since is ignored when present (RFC 9110 §13.1.3)
+        not_modified = _etag_matches(if_none_match, headers["ETag"])
+    elif if_modified_since is not None and modified_at is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            since = None
+        # HTTP dates have whole-second resolution
+        not_modified = since is not None and int(modified_at) <= int(since)
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
+
+
 @app.get("/health", response_model=HealthResponse)
 def health(store: Store = Depends(get_store)) -> HealthResponse:
     uptime = get_uptime_seconds()
@@ -144,7 +585,15 @@ def health(store: Store = Depends(get_store)) -> HealthResponse:
 
 
 @app.get("/readings/latest", response_model=Reading)
-def latest_reading(store: Store = Depends(get_store)) -> Reading:
+def latest_reading(
+    request: Request,
+    response: Response,
+    store: Store = Depends(get_store),
+) -> Any:
+    not_modified = conditional_response(request, response, store)
+    if not_modified is not None:
+        return not_modified
+
     row = store.get_latest_reading()
     if not row:
         raise HTTPException(status_code=404, detail="No readings available")
@@ -152,17 +601,151 @@ def latest_reading(store: Store = Depends(get_store)) -> Reading:
     return Reading(**row)
 
 
+async def _event_stream(
+    store: Store, sub: Subscription, backlog: List[Dict[str, Any]]
+) -> AsyncIterator[bytes]:
+    last_id = 0
+    try:
+        for reading in backlog:
+            last_id = reading["id"]
+            yield encode_event(reading)
+
+        while True:
+            try:
+                event = await asyncio.wait_for(sub.get(), SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if event is None:
+                # Closed: fell too far behind, or the API is shutting down
+                break
+            row_id, frame = event
+            if row_id > last_id:
+                last_id = row_id
+                yield frame
+    finally:
+        store.broadcaster.unsubscribe(sub)
+
+
+@app.get("/readings/stream")
+async def stream_readings(
+    last_event_id: Optional[str] = Header(None),
+    store: Store = Depends(get_store),
+) -> StreamingResponse:
+    """
+    Server-sent events: one `reading` event per newly stored reading.
+
+    Reconnecting clients send Last-Event-ID and receive what they missed,
+    up to the subscriber queue size. Clients that fall further behind
+    than that are disconnected and should reconnect.
+    """
+    sub = store.broadcaster.subscribe()
+
+    backlog: List[Dict[str, Any]] = []
+    if last_event_id and last_event_id.isdigit():
+        try:
+            backlog = await run_in_threadpool(
+                store.readings_after,
+                int(last_event_id),
+                store.broadcaster.queue_size,
+            )
+        except Exception:
+            store.broadcaster.unsubscribe(sub)
+            raise
+
+    return StreamingResponse(
+        _event_stream(store, sub, backlog),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/readings", response_model=List[Reading])
 def list_readings(
+    request: Request,
+    response: Response,
     limit: int = Query(10, ge=1, le=1000),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    device_id: Optional[str] = Query(None),
+    mode: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
     store: Store = Depends(get_store),
-) -> List[Reading]:
-    rows = store.get_recent_readings(limit=limit)
+) -> Any:
+    not_modified = conditional_response(request, response, store)
+    if not_modified is not None:
+        return not_modified
+
+    try:
+        rows, next_cursor = store.query_readings(
+            limit=limit,
+            since=since,
+            until=until,
+            device_id=device_id,
+            mode=mode,
+            cursor=cursor,
+            order=order,
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+
     return [Reading(**row) for row in rows]
 
 
+@app.get("/readings/aggregate", response_model=List[AggregateBucket])
+def aggregate_readings(
+    bucket: str = Query("1h", pattern="^(1m|1h|1d)$"),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    device_id: Optional[str] = Query(None),
+    limit: int = Query(1000, ge=1, le=10000),
+    store: Store = Depends(get_store),
+) -> List[AggregateBucket]:
+    rows = store.get_aggregates(
+        bucket_seconds=ROLLUP_BUCKETS[bucket],
+        since=since,
+        until=until,
+        device_id=device_id,
+        limit=limit,
+    )
+    return [AggregateBucket(**row) for row in rows]
+
+
+@app.get("/readings/export")
+def export_readings(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    device_id: Optional[str] = Query(None),
+    store: Store = Depends(get_store),
+) -> StreamingResponse:
+    """
+    Stream every matching reading as NDJSON or CSV in constant memory.
+    """
+    body = stream_export(
+        store.db_path,
+        fmt=format,
+        since=since,
+        until=until,
+        device_id=device_id,
+    )
+    filename = f"readings.{format}"
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @app.get("/metrics", response_model=MetricsResponse)
-def metrics(store: Store = Depends(get_store)) -> MetricsResponse:
+def metrics(response: Response, store: Store = Depends(get_store)) -> MetricsResponse:
+    # uptime_seconds changes on every call, so no validators here; the
+    # row count is kept incrementally instead (Store.count_readings)
+    response.headers["Cache-Control"] = "no-cache"
     try:
         count = store.count_readings()
     except Exception:
@@ -0,0 +1,238 @@
+# filename: app/broadcast.py
+
+"""
+In-process fan-out of new readings to streaming API clients.
+
+One ReadingBroadcaster per API process watches for new rows and hands
+every reading to all subscribers, so the database cost of live updates
+does not grow with the number of connected dashboards:
+
+- a single daemon thread waits for changes (the agent's live feed when
+  available, otherwise a timed poll) and loads new rows from SQLite
+  once per change, oldest first
+- each reading is encoded to its SSE frame once and shared by reference
+- every subscriber owns a bounded asyncio.Queue on its event loop; an
+  idle subscriber is just a suspended coroutine
+- a subscriber whose queue is full is disconnected instead of buffering
+  without bound or stalling everyone else
+
+The thread parks while nobody is subscribed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
+
+log = logging.getLogger(__name__)
+
+# (row id, encoded SSE frame)
+Event = Tuple[int, bytes]
+
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_POLL_INTERVAL = 1.0
+FETCH_LIMIT = 1000
+
+
+class ReadingSource(Protocol):
+    def max_reading_id(self) -> int: ...
+
+    def readings_after(self, after_id: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Readings with id > after_id, oldest first.
+        """
+        ...
+
+    def change_token(self) -> Any: ...
+
+    def wait_for_change(self, token: Any, timeout: float) -> None:
+        """
+        Block until the source moves past `token` or timeout.
+        """
+        ...
+
+
+def encode_event(reading: Dict[str, Any]) -> bytes:
+    """
+    SSE frame for one reading; the row id doubles as the event id so
+    clients can resume with Last-Event-ID.
+    """
+    data = json.dumps(reading, separators=(",", ":"))
+    return f"id: {reading['id']}\nevent: reading\ndata: {data}\n\n".encode("utf-8")
+
+
+class Subscription:
+    """
+    One streaming client. get() returns (row id, SSE frame) pairs; None
+    means the subscription was closed (slow consumer or shutdown).
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue[Optional[Event]] = asyncio.Queue(maxsize=maxsize)
+        self.closed = False
+        self.overflowed = False
+
+    async def get(self) -> Optional[Event]:
+        return await self.queue.get()
+
+    def _offer(self, events: List[Event]) -> None:
+        # Runs on the subscriber's loop
+        if self.closed:
+            return
+        for event in events:
+            try:
+                self.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.overflowed = True
+                self._close()
+                return
+
+    def _close(self) -> None:
+        # Runs on the subscriber's loop. Pending frames are discarded so
+        # the end-of-stream marker is delivered right away.
+        if self.closed:
+            return
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class ReadingBroadcaster:
+    """
+    Single watcher thread -> per-subscriber bounded queues.
+    """
+
+    def __init__(
+        self,
+        source: ReadingSource,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        if queue_size < 1:
+            raise ValueError("queue_size must be >= 1")
+
+        self.source = source
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Subscription] = {}
+        self._active = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_id: Optional[int] = None
+
+        # Counters (read-only for callers)
+        self.readings_broadcast = 0
+        self.slow_disconnects = 0
+        self.fetch_errors = 0
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "readings_broadcast": self.readings_broadcast,
+            "slow_disconnects": self.slow_disconnects,
+            "fetch_errors": self.fetch_errors,
+        }
+
+    # ------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------
+
+    def subscribe(self) -> Subscription:
+        """
+        Register a subscriber on the running event loop.
+        """
+        sub = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers[id(sub)] = sub
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="reading-broadcaster", daemon=True
+                )
+                self._thread.start()
+            self._active.set()
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            if self._subscribers.pop(id(sub), None) is not None and sub.overflowed:
+                self.slow_disconnects += 1
+            if not self._subscribers:
+                self._active.clear()
+
+    def close(self) -> None:
+        """
+        Stop the watcher thread and end every subscription.
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+            subscribers = list(self._subscribers.values())
+            self._subscribers.clear()
+            self._stop.set()
+            self._active.set()
+
+        for sub in subscribers:
+            self._call(sub, sub._close)
+        if thread is not None:
+            thread.join(timeout=self.poll_interval + 1.0)
+
+    # ------------------------------------------------------------
+    # Watcher thread
+    # ------------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if not self._active.is_set():
+                # Nobody listening: forget the position, park the thread
+                self._last_id = None
+                self._active.wait()
+                continue
+
+            try:
+                # Taken before the fetch so a write in between is not missed
+                token = self.source.change_token()
+                if self._last_id is None:
+                    self._last_id = self.source.max_reading_id()
+                readings = self.source.readings_after(self._last_id, FETCH_LIMIT)
+            except Exception as exc:
+                self.fetch_errors += 1
+                log.error("broadcast_fetch_error", extra={"error": repr(exc)})
+                self._stop.wait(self.poll_interval)
+                continue
+
+            if readings:
+                self._last_id = readings[-1]["id"]
+                self._fanout([(r["id"], encode_event(r)) for r in readings])
+                if len(readings) == FETCH_LIMIT:
+                    continue
+
+            self.source.wait_for_change(token, self.poll_interval)
+
+    def _fanout(self, events: List[Event]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+
+        for sub in subscribers:
+            if sub.closed:
+                self.unsubscribe(sub)
+                continue
+            self._call(sub, sub._offer, events)
+        self.readings_broadcast += len(events)
+
+    def _call(self, sub: Subscription, fn: Callable[..., None], *args: Any) -> None:
+        try:
+            sub.loop.call_soon_threadsafe(fn, *args)
+        except RuntimeError:
+            # Loop already closed: the client is gone
+            self.unsubscribe(sub)
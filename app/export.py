@@ -0,0 +1,201 @@
+# filename: app/export.py
+
+"""
+Streaming bulk export of readings as NDJSON or CSV.
+
+Rows are pulled from a dedicated read-only connection with fetchmany()
+and encoded chunk by chunk, so exporting tens of millions of rows runs in
+constant memory. Used by the /readings/export endpoint and by the CLI:
+
+    python -m app.export --db /var/lib/pi-log/readings.db --format csv \
+        --since 2025-01-01T00:00:00Z --output readings.csv
+
+Note: an export holds one WAL read snapshot open for its whole duration,
+so the WAL file cannot be checkpointed past it until the export finishes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import sys
+from datetime import datetime
+from typing import Any, BinaryIO, Iterator, List, Optional, Sequence, Tuple
+
+from app.sqlite_store import connect, utc_isoformat
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+EXPORT_COLUMNS = (
+    "id",
+    "timestamp",
+    "device_id",
+    "mode",
+    "cps",
+    "cpm",
+    "usv",
+    "raw",
+    "pushed",
+)
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+DEFAULT_CHUNK_ROWS = 1000
+
+
+def iter_rows(
+    db_path: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    device_id: Optional[str] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Iterator[List[Tuple[Any, ...]]]:
+    """
+    Yield chunks of export rows (EXPORT_COLUMNS order) from one cursor.
+
+    Unfiltered exports walk the primary key; time-windowed exports walk
+    idx_geiger_readings_timestamp.
+    """
+    clauses: List[str] = []
+    params: List[Any] = []
+
+    if since is not None:
+        clauses.append("timestamp >= ?")
+        params.append(utc_isoformat(since))
+    if until is not None:
+        clauses.append("timestamp < ?")
+        params.append(utc_isoformat(until))
+    if device_id is not None:
+        clauses.append("device_id = ?")
+        params.append(device_id)
+
+    sql = """
+        SELECT id, timestamp, device_id, mode, counts_per_second,
+               counts_per_minute, microsieverts_per_hour, raw, pushed
+        FROM geiger_readings
+    """
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    if since is not None or until is not None:
+        sql += " ORDER BY timestamp ASC, id ASC"
+    else:
+        sql += " ORDER BY id ASC"
+
+    conn = connect(db_path, read_only=True)
+    try:
+        cursor = conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                return
+            yield rows
+    finally:
+        conn.close()
+
+
+def encode_ndjson(chunks: Iterator[Sequence[Tuple[Any, ...]]]) -> Iterator[bytes]:
+    for rows in chunks:
+        lines = [
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), separators=(",", ":"))
+            for row in rows
+        ]
+        lines.append("")
+        yield "\n".join(lines).encode("utf-8")
+
+
+def encode_csv(chunks: Iterator[Sequence[Tuple[Any, ...]]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+
+    writer.writerow(EXPORT_COLUMNS)
+    yield buf.getvalue().encode("utf-8")
+
+    for rows in chunks:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(rows)
+        yield buf.getvalue().encode("utf-8")
+
+
+def stream_export(
+    db_path: str,
+    fmt: str = "ndjson",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    device_id: Optional[str] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Iterator[bytes]:
+    """
+    Encoded export body as an iterator of byte chunks.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+
+    chunks = iter_rows(db_path, since, until, device_id, chunk_rows)
+    if fmt == "csv":
+        return encode_csv(chunks)
+    return encode_ndjson(chunks)
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pi-log-export",
+        description="Stream Geiger readings from SQLite as NDJSON or CSV.",
+    )
+
+    parser.add_argument("--db", required=True, type=str)
+    parser.add_argument(
+        "--format", required=False, default="ndjson", choices=EXPORT_FORMATS
+    )
+    parser.add_argument(
+        "--since", required=False, default=None, type=datetime.fromisoformat
+    )
+    parser.add_argument(
+        "--until", required=False, default=None, type=datetime.fromisoformat
+    )
+    parser.add_argument("--device-id", required=False, default=None, type=str)
+    parser.add_argument(
+        "--output", required=False, default="-", type=str, help="file or '-'"
+    )
+
+    return parser
+
+
+def _write_all(out: BinaryIO, body: Iterator[bytes]) -> None:
+    for chunk in body:
+        out.write(chunk)
+    out.flush()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    body = stream_export(
+        args.db,
+        fmt=args.format,
+        since=args.since,
+        until=args.until,
+        device_id=args.device_id,
+    )
+
+    if args.output == "-":
+        _write_all(sys.stdout.buffer, body)
+    else:
+        with open(args.output, "wb") as f:
+            _write_all(f, body)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
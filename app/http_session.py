@@ -0,0 +1,145 @@
+# filename: app/http_session.py
+
+"""
+Shared, pooled HTTP session for all outbound clients.
+
+PushClient, LogExpClient and TelemetryWorker used to call the module-level
+`requests.post`, which builds a throwaway Session (and a fresh TCP/TLS
+connection) per call. On a Pi 3 the handshake dominates the cost of a
+small JSON payload, so every client now goes through one PooledSession:
+
+- keep-alive connections reused across calls
+- `pool_connections`: number of per-host pools kept open
+- `pool_maxsize`: connections kept per host; with `pool_block=True` it is
+  also a hard per-host limit
+- explicit (connect, read) timeouts applied when a caller passes none
+- counters for requests, new connections and reused connections
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10.0
+
+
+class PooledSession:
+    """
+    Thin wrapper around requests.Session with a tuned connection pool.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 4,
+        pool_block: bool = False,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        keep_alive: bool = True,
+    ) -> None:
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        self.session = requests.Session()
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return (self.connect_timeout, self.read_timeout)
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        with self._lock:
+            self._requests += 1
+        try:
+            return self.session.request(method, url, **kwargs)
+        except Exception:
+            with self._lock:
+                self._errors += 1
+            raise
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return request/connection counters.
+
+        `connections_opened` is summed over the live per-host pools, so
+        `connections_reused` shows how many requests rode an existing
+        keep-alive connection instead of a new handshake.
+        """
+        opened = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+
+        with self._lock:
+            total = self._requests
+            errors = self._errors
+
+        return {
+            "requests": total,
+            "errors": errors,
+            "connections_opened": opened,
+            "connections_reused": max(total - errors - opened, 0),
+        }
+
+    def close(self) -> None:
+        self.session.close()
+
+
+# ----------------------------------------------------------------------
+# Process-wide shared session
+# ----------------------------------------------------------------------
+
+_shared: Optional[PooledSession] = None
+_shared_lock = threading.Lock()
+
+
+def get_session() -> PooledSession:
+    """
+    Return the process-wide PooledSession, creating it with defaults.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = PooledSession()
+        return _shared
+
+
+def configure_session(**kwargs: Any) -> PooledSession:
+    """
+    Replace the process-wide PooledSession with one built from kwargs.
+    Call this once at startup, before clients are constructed.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is not None:
+            _shared.close()
+        _shared = PooledSession(**kwargs)
+        return _shared
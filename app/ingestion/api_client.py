@@ -2,12 +2,26 @@
 
 from __future__ import annotations
 
-import sqlite3
-import requests
+import logging
+import threading
 from datetime import datetime, timezone
-from typing import Any, Dict
+from functools import partial
+from typing import Any, Dict, List, Optional, Set
 
+from app.http_session import PooledSession, get_session
+from app.ingestion.batch_sender import (
+    BatchPushSender,
+    BatchRejected,
+    is_permanent_rejection,
+)
+from app.live_feed import LiveFeedWriter
 from app.models import GeigerRecord
+from app.sqlite_store import DEFAULT_COMMIT_MAX_DELAY_MS, SQLiteStore
+from app.wire import BodyEncoder, dumps
+
+log = logging.getLogger(__name__)
+
+PUSH_MODES = ("sync", "batch")
 
 
 class PushClient:
@@ -15,121 +29,245 @@ class PushClient:
     PushClient is the ingestion engine:
       - receives parsed records via handle_record()
       - writes them to SQLite
-      - pushes them immediately to the ingestion API
+      - pushes them to the ingestion API
       - marks them pushed on success
+
+    Push modes:
+      - "sync": push each record inline from handle_record()
+      - "batch": handle_record() only persists and enqueues; a background
+        BatchPushSender pushes one HTTP request per batch
+
+    SQLite writes go through a SQLiteStore and its GroupCommitWriter;
+    commit_max_rows and commit_max_delay_ms bound how many rows can be
+    lost on power failure.
+
+    Request bodies go through a BodyEncoder (app/wire.py):
+    content_encoding ("identity", "gzip", "zstd") and batch_format
+    ("rows", "columnar") are opt-in and downgraded automatically when the
+    server answers 415.
     """
 
     def __init__(
-        self, api_url: str, api_token: str, device_id: str, db_path: str
+        self,
+        api_url: str,
+        api_token: str,
+        device_id: str,
+        db_path: str,
+        push_mode: str = "sync",
+        batch_size: int = 50,
+        batch_max_age: float = 5.0,
+        session: Optional[PooledSession] = None,
+        commit_max_rows: int = 1,
+        commit_max_delay_ms: float = DEFAULT_COMMIT_MAX_DELAY_MS,
+        live_feed: Optional[LiveFeedWriter] = None,
+        content_encoding: str = "identity",
+        batch_format: str = "rows",
     ) -> None:
         if not api_url:
             raise ValueError("PushClient requires a non-empty api_url")
+        if push_mode not in PUSH_MODES:
+            raise ValueError(f"Unknown push_mode: {push_mode!r}")
 
         self.ingest_url = api_url
         self.api_token = api_token or ""
         self.device_id = device_id
         self.db_path = db_path
+        self.push_mode = push_mode
+        self.live_feed = live_feed
+        self._http = session or get_session()
+        self._wire = BodyEncoder(content_encoding, batch_format)
+
+        # Inserts and pushed-flag updates share group commits; the store
+        # also serialises the serial thread and the sender thread.
+        self._store = SQLiteStore(
+            self.db_path,
+            commit_max_rows=commit_max_rows,
+            commit_max_delay_ms=commit_max_delay_ms,
+        )
 
-        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self._conn.execute("PRAGMA journal_mode=WAL;")
-        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        # Live push bookkeeping, used to keep backlog replay off live rows
+        self._live_lock = threading.Lock()
+        self._inflight_ids: Set[int] = set()
+        self._last_row_id: int = self._store.max_id()
+
+        self._sender: Optional[BatchPushSender] = None
+        if push_mode == "batch":
+            self._sender = BatchPushSender(
+                push_batch=self.push_batch,
+                on_pushed=self._mark_pushed_many,
+                batch_size=batch_size,
+                max_batch_age=batch_max_age,
+            )
+            self._sender.start()
+
+    def close(self) -> None:
+        """
+        Flush and stop the background sender (batch mode), then close SQLite.
+        """
+        if self._sender is not None:
+            self._sender.stop()
+        self._store.close()
 
     # ------------------------------------------------------------
     # SQLite helpers
     # ------------------------------------------------------------
 
-    def _insert_record(self, parsed: Dict[str, Any]) -> int:
+    def _insert_record(self, record: GeigerRecord) -> int:
         """
-        Insert a parsed geiger record into SQLite.
-        Returns the inserted row ID.
+        Insert a record into SQLite. Returns the inserted row ID.
+
+        With a live feed, the record is published once its row is
+        committed, so readers never see a reading SQLite does not have.
         """
+        feed = self.live_feed
+        on_commit = None
+        if feed is not None:
+            on_commit = partial(self._publish, feed, record)
+        return self._store.insert_row(record.to_db_tuple(), on_commit)
 
-        timestamp = parsed.get("timestamp") or datetime.now(timezone.utc)
+    @staticmethod
+    def _publish(feed: LiveFeedWriter, record: GeigerRecord, row_id: int) -> None:
+        record.id = row_id
+        feed.publish(record)
 
-        cur = self._conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO geiger_readings (
-                raw,
-                counts_per_second,
-                counts_per_minute,
-                microsieverts_per_hour,
-                mode,
-                device_id,
-                timestamp,
-                pushed
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, 0)
-            """,
-            (
-                parsed["raw"],
-                parsed["cps"],
-                parsed["cpm"],
-                parsed["usv"],
-                parsed["mode"],
-                self.device_id,
-                timestamp.isoformat(),
-            ),
-        )
-        self._conn.commit()
+    def _mark_pushed(self, row_id: int) -> None:
+        self._store.mark_records_pushed([row_id])
 
-        rowid = cur.lastrowid
-        assert rowid is not None
-        return rowid
+    @property
+    def store(self) -> SQLiteStore:
+        """
+        The client's store; the only writer connection to db_path.
+        """
+        return self._store
 
-    def _mark_pushed(self, row_id: int) -> None:
-        cur = self._conn.cursor()
-        cur.execute(
-            "UPDATE geiger_readings SET pushed = 1 WHERE id = ?",
-            (row_id,),
-        )
-        self._conn.commit()
+    def replay_horizon(self) -> int:
+        """
+        Highest row id the backlog replayer may push without racing the
+        live push path (rows queued or in flight are excluded).
+        """
+        with self._live_lock:
+            if self._sender is not None:
+                floor = self._sender.pending_floor()
+            else:
+                floor = min(self._inflight_ids) if self._inflight_ids else None
+
+            if floor is not None:
+                return floor - 1
+            return self._last_row_id
+
+    def _mark_pushed_many(self, row_ids: List[int]) -> None:
+        self._store.mark_records_pushed(row_ids)
+
+    def storage_stats(self) -> Dict[str, Any]:
+        """
+        Group-commit counters, including rows currently at risk.
+        """
+        return self._store.stats()
+
+    def wire_stats(self) -> Dict[str, Any]:
+        """
+        Negotiated encoding/format and uncompressed vs sent body bytes.
+        """
+        return self._wire.stats()
 
     # ------------------------------------------------------------
     # Push logic
     # ------------------------------------------------------------
 
+    def _headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.api_token:
+            headers["Authorization"] = f"Bearer {self.api_token}"
+        return headers
+
     def _push_single(self, record: GeigerRecord) -> bool:
         """
         Push a single GeigerRecord to the ingestion endpoint.
         Returns True on success.
         """
-        headers = {}
-        if self.api_token:
-            headers["Authorization"] = f"Bearer {self.api_token}"
-
         try:
-            resp = requests.post(
-                self.ingest_url, json=record.to_logexp_payload(), headers=headers
+            resp = self._wire.post(
+                self._http,
+                self.ingest_url,
+                lambda: self._wire.encode(dumps(record.to_logexp_payload())),
+                headers=self._headers(),
             )
             resp.raise_for_status()
             return True
         except Exception:
             return False
 
+    def push_batch(self, records: List[GeigerRecord]) -> bool:
+        """
+        Push a batch of GeigerRecords as one request, in the negotiated
+        batch format. Returns True on success, False on a failure worth
+        retrying; raises BatchRejected if the server refused the batch.
+        """
+        if not records:
+            return True
+
+        try:
+            resp = self._wire.post(
+                self._http,
+                self.ingest_url,
+                lambda: self._wire.encode_records(records),
+                headers=self._headers(),
+            )
+            if is_permanent_rejection(resp.status_code):
+                raise BatchRejected(resp.status_code)
+            resp.raise_for_status()
+            return True
+        except BatchRejected:
+            raise
+        except Exception as exc:
+            log.warning(
+                "push_batch_failed",
+                extra={"error": repr(exc), "batch_size": len(records)},
+            )
+            return False
+
     # ------------------------------------------------------------
     # Public callback for SerialReader
     # ------------------------------------------------------------
 
     def handle_record(self, parsed: Dict[str, Any]) -> None:
         """
-        Called by SerialReader for every parsed record.
-        """
-
-        row_id = self._insert_record(parsed)
+        Called by SerialReader for every parsed record. A "device_id" key
+        in the parsed record (multi-device agents) overrides the client's.
 
-        timestamp = parsed.get("timestamp") or datetime.now(timezone.utc)
+        In batch mode this never touches the network: the record is
+        persisted and handed to the background sender.
+        """
 
+        # One record per reading: the same object feeds the insert tuple
+        # and the push payload
         record = GeigerRecord(
-            id=row_id,
-            raw=parsed["raw"],
-            counts_per_second=parsed["cps"],
-            counts_per_minute=parsed["cpm"],
-            microsieverts_per_hour=parsed["usv"],
-            mode=parsed["mode"],
-            device_id=self.device_id,
-            timestamp=timestamp,
+            None,
+            parsed["raw"],
+            parsed["cps"],
+            parsed["cpm"],
+            parsed["usv"],
+            parsed["mode"],
+            parsed.get("device_id") or self.device_id,
+            parsed.get("timestamp") or datetime.now(timezone.utc),
         )
+        row_id = record.id = self._insert_record(record)
 
-        if self._push_single(record):
-            self._mark_pushed(row_id)
+        if self._sender is not None:
+            with self._live_lock:
+                queued = self._sender.enqueue(record)
+                self._last_row_id = row_id
+            if not queued:
+                log.warning("push_queue_full", extra={"row_id": row_id})
+            return
+
+        with self._live_lock:
+            self._inflight_ids.add(row_id)
+
+        try:
+            if self._push_single(record):
+                self._mark_pushed(row_id)
+        finally:
+            with self._live_lock:
+                self._inflight_ids.discard(row_id)
+                self._last_row_id = max(self._last_row_id, row_id)
@@ -0,0 +1,265 @@
+# filename: app/ingestion/async_agent.py
+
+"""
+asyncio variant of the ingestion agent.
+
+The blocking stack (SerialReader -> WatchdogSerialReader -> PushClient)
+is driven as cooperating tasks on one event loop:
+
+- one reader task per serial source; each blocking read_line() runs on a
+  dedicated single-thread executor so readers never share a thread
+- a bounded asyncio.Queue between readers and processors; a full queue
+  suspends the reader tasks (backpressure onto the UART buffer)
+- processor tasks parse inline and offload the handler (SQLite write +
+  HTTP push) to a bounded I/O executor
+
+Because everything runs on one loop, the same process can also serve the
+FastAPI app through uvicorn.Server (see serve_api()).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
+
+from app.ingestion.csv_parser import parse_geiger_csv
+
+log = logging.getLogger(__name__)
+
+
+class LineSource(Protocol):
+    def read_line(self) -> str: ...
+
+
+class AsyncIngestionAgent:
+    """
+    Reader tasks -> bounded asyncio.Queue -> processor tasks.
+    """
+
+    def __init__(
+        self,
+        readers: Sequence[LineSource],
+        handler: Callable[[Dict[str, Any]], None],
+        queue_size: int = 1024,
+        consumers: int = 1,
+        device_ids: Optional[Sequence[Optional[str]]] = None,
+    ) -> None:
+        if not readers:
+            raise ValueError("at least one reader is required")
+        if device_ids is not None and len(device_ids) != len(readers):
+            raise ValueError("device_ids must match readers")
+        if consumers < 1:
+            raise ValueError("consumers must be >= 1")
+
+        self.readers = list(readers)
+        # Per-reader device tag injected into parsed records (None = keep)
+        self.device_ids: List[Optional[str]] = (
+            list(device_ids) if device_ids is not None else [None] * len(readers)
+        )
+        self.handler = handler
+        self.queue_size = queue_size
+        self.consumers = consumers
+
+        self._queue: Optional[asyncio.Queue[Tuple[Optional[str], str]]] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._read_executors: List[ThreadPoolExecutor] = []
+        self._io_executor: Optional[ThreadPoolExecutor] = None
+
+        # Counters (read-only for callers)
+        self.lines_read = 0
+        self.records_handled = 0
+        self.parse_failures = 0
+        self.handler_errors = 0
+        self.backpressure_waits = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "capacity": self.queue_size,
+            "lines_read": self.lines_read,
+            "records_handled": self.records_handled,
+            "parse_failures": self.parse_failures,
+            "handler_errors": self.handler_errors,
+            "backpressure_waits": self.backpressure_waits,
+        }
+
+    def stop(self) -> None:
+        """
+        Ask run() to finish. Must be called from the agent's event loop.
+        """
+        if self._stop is not None:
+            self._stop.set()
+
+    # ------------------------------------------------------------
+    # Main coroutine
+    # ------------------------------------------------------------
+
+    async def run(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._stop = asyncio.Event()
+        self._read_executors = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"serial-{i}")
+            for i in range(len(self.readers))
+        ]
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=self.consumers, thread_name_prefix="ingest-io"
+        )
+
+        tasks = [
+            asyncio.create_task(self._read_loop(reader, device_id, executor))
+            for reader, device_id, executor in zip(
+                self.readers, self.device_ids, self._read_executors
+            )
+        ]
+        tasks.extend(
+            asyncio.create_task(self._process_loop()) for _ in range(self.consumers)
+        )
+
+        try:
+            await self._stop.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            # Blocked read_line() calls return within the serial timeout
+            for executor in self._read_executors:
+                executor.shutdown(wait=False, cancel_futures=True)
+            self._io_executor.shutdown(wait=True)
+
+    # ------------------------------------------------------------
+    # Tasks
+    # ------------------------------------------------------------
+
+    async def _read_loop(
+        self,
+        reader: LineSource,
+        device_id: Optional[str],
+        executor: ThreadPoolExecutor,
+    ) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+
+        while True:
+            try:
+                line = await loop.run_in_executor(executor, reader.read_line)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                log.error("async_read_error", extra={"error": repr(exc)})
+                await asyncio.sleep(0.1)
+                continue
+
+            if not line:
+                continue
+
+            self.lines_read += 1
+            if self._queue.full():
+                self.backpressure_waits += 1
+            await self._queue.put((device_id, line))
+
+    async def _process_loop(self) -> None:
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+
+        while True:
+            device_id, raw = await self._queue.get()
+            try:
+                parsed = parse_geiger_csv(raw)
+                if parsed is None:
+                    self.parse_failures += 1
+                    continue
+                if device_id is not None:
+                    parsed["device_id"] = device_id
+
+                await loop.run_in_executor(self._io_executor, self.handler, parsed)
+                self.records_handled += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.handler_errors += 1
+                log.error("async_handler_error", extra={"error": repr(exc)})
+            finally:
+                self._queue.task_done()
+
+
+# ----------------------------------------------------------------------
+# Entry point helpers
+# ----------------------------------------------------------------------
+
+
+def api_app(db_path: Optional[str] = None, live_feed_path: Optional[str] = None) -> Any:
+    """
+    The FastAPI app, with its store pointed at the agent's database and
+    live feed (db_path None keeps the API's own defaults).
+    """
+    from app.api import app, configure_store
+
+    if db_path is not None:
+        configure_store(db_path, live_feed_path)
+    return app
+
+
+async def serve_api(
+    host: str,
+    port: int,
+    db_path: Optional[str] = None,
+    live_feed_path: Optional[str] = None,
+) -> None:
+    """
+    Serve the FastAPI app on the running loop.
+    """
+    import uvicorn
+
+    app = api_app(db_path, live_feed_path)
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port))
+    await server.serve()
+
+
+async def run_agent(
+    agent: AsyncIngestionAgent,
+    api_host: Optional[str] = None,
+    api_port: int = 8000,
+    stats_interval: float = 60.0,
+    db_path: Optional[str] = None,
+    live_feed_path: Optional[str] = None,
+) -> None:
+    """
+    Run the agent (and optionally the API) until cancelled or the API
+    server exits. The API serves db_path / live_feed_path, i.e. what
+    the agent writes.
+    """
+    agent_task = asyncio.create_task(agent.run())
+    api_task = None
+    if api_host is not None:
+        api_task = asyncio.create_task(
+            serve_api(api_host, api_port, db_path, live_feed_path)
+        )
+
+    started = time.monotonic()
+    try:
+        while not agent_task.done():
+            if api_task is not None and api_task.done():
+                break
+            await asyncio.sleep(min(stats_interval, 1.0))
+            if time.monotonic() - started >= stats_interval:
+                log.info("async_agent_stats", extra={"stats": agent.stats()})
+                started = time.monotonic()
+    finally:
+        agent_task.cancel()
+        await asyncio.gather(agent_task, return_exceptions=True)
+        if api_task is not None:
+            api_task.cancel()
+            await asyncio.gather(api_task, return_exceptions=True)
@@ -0,0 +1,252 @@
+# filename: app/ingestion/batch_sender.py
+
+"""
+Background batch sender for the push pipeline.
+
+PushClient persists every reading to SQLite first and then hands it to
+this sender, so the serial loop never waits on the network. The sender
+drains its queue on a dedicated thread and pushes records in batches:
+
+- a batch is flushed when it reaches `batch_size` records, or
+- when its oldest record has waited `max_batch_age` seconds.
+
+A failed batch is retried with exponential backoff. A batch the server
+rejects outright (BatchRejected: a 4xx other than 408/429) is not
+retried, so it cannot block the batches behind it; like records that
+cannot be queued (queue full), its rows stay `pushed = 0` in SQLite and
+are picked up by the backlog replay later, so nothing is lost on the
+network side.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional
+
+from app.models import GeigerRecord
+
+log = logging.getLogger(__name__)
+
+PushBatchFn = Callable[[List[GeigerRecord]], bool]
+OnPushedFn = Callable[[List[int]], None]
+
+
+class BatchRejected(Exception):
+    """
+    Raised by a PushBatchFn when the server will never accept the batch
+    as sent; retrying it is pointless.
+    """
+
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"batch rejected with HTTP {status_code}")
+        self.status_code = status_code
+
+
+def is_permanent_rejection(status_code: int) -> bool:
+    """
+    4xx means the request itself is wrong, except 408 (Request Timeout)
+    and 429 (Too Many Requests), which are worth retrying.
+    """
+    return 400 <= status_code < 500 and status_code not in (408, 429)
+
+
+class BatchPushSender(threading.Thread):
+    """
+    Drains queued GeigerRecords and pushes them one HTTP request per batch.
+    """
+
+    def __init__(
+        self,
+        push_batch: PushBatchFn,
+        on_pushed: OnPushedFn,
+        batch_size: int = 50,
+        max_batch_age: float = 5.0,
+        max_queue: int = 10000,
+        max_backoff: float = 30.0,
+    ) -> None:
+        super().__init__(daemon=True, name="batch-push-sender")
+
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+
+        self._push_batch = push_batch
+        self._on_pushed = on_pushed
+        self.batch_size = batch_size
+        self.max_batch_age = max_batch_age
+        self.max_backoff = max_backoff
+
+        # None is a wake-up sentinel posted by stop()
+        self.q: queue.Queue[Optional[GeigerRecord]] = queue.Queue(maxsize=max_queue)
+        self._stop_event = threading.Event()
+
+        # Row ids queued or in flight, in queue order. Concurrent producers
+        # may enqueue ids slightly out of order, so _floor keeps the running
+        # minimum: the increasing minima of _pending_ids, front = smallest.
+        self._ids_lock = threading.Lock()
+        self._pending_ids: Deque[int] = deque()
+        self._floor: Deque[int] = deque()
+
+        # Counters (read-only for callers)
+        self.sent_batches = 0
+        self.sent_records = 0
+        self.failed_batches = 0
+        self.rejected_batches = 0
+        self.dropped_records = 0
+
+    # ------------------------------------------------------------
+    # Producer side (serial thread)
+    # ------------------------------------------------------------
+
+    def enqueue(self, record: GeigerRecord) -> bool:
+        """
+        Queue a persisted record for pushing. Never blocks.
+        Returns False if the queue is full; the row stays unpushed in SQLite.
+        """
+        with self._ids_lock:
+            try:
+                self.q.put_nowait(record)
+            except queue.Full:
+                self.dropped_records += 1
+                return False
+
+            if record.id is not None:
+                self._pending_ids.append(record.id)
+                while self._floor and self._floor[-1] > record.id:
+                    self._floor.pop()
+                self._floor.append(record.id)
+            return True
+
+    def pending_floor(self) -> Optional[int]:
+        """
+        Oldest row id still owned by the sender (queued or in flight).
+        """
+        with self._ids_lock:
+            return self._floor[0] if self._floor else None
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Signal the sender to flush what is queued and exit.
+        """
+        self._stop_event.set()
+        try:
+            self.q.put_nowait(None)
+        except queue.Full:
+            pass
+        if self.is_alive():
+            self.join(timeout)
+
+    # ------------------------------------------------------------
+    # Consumer side (sender thread)
+    # ------------------------------------------------------------
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                batch = self._collect_batch()
+                if batch:
+                    self._send_with_retry(batch)
+            except Exception as exc:
+                # Never crash the sender
+                log.error("batch_sender_error", extra={"error": repr(exc)})
+                time.sleep(1.0)
+
+        # Final best-effort flush of whatever is still queued; stops at the
+        # first batch that failed and could be retried
+        batch = self._drain_nowait()
+        while batch:
+            if not self._send_once(batch):
+                break
+            batch = self._drain_nowait()
+
+    def _collect_batch(self) -> List[GeigerRecord]:
+        """
+        Block for the first record, then gather more until the batch is
+        full or the first record is older than max_batch_age.
+        """
+        try:
+            first = self.q.get(timeout=self.max_batch_age)
+        except queue.Empty:
+            return []
+        if first is None:
+            return []
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_batch_age
+
+        while len(batch) < self.batch_size and not self._stop_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.q.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                break
+            batch.append(item)
+
+        return batch
+
+    def _drain_nowait(self) -> List[GeigerRecord]:
+        items: List[GeigerRecord] = []
+        try:
+            while len(items) < self.batch_size:
+                item = self.q.get_nowait()
+                if item is not None:
+                    items.append(item)
+        except queue.Empty:
+            pass
+        return items
+
+    def _send_with_retry(self, batch: List[GeigerRecord]) -> None:
+        backoff = 1.0
+        while not self._send_once(batch):
+            if self._stop_event.wait(backoff):
+                return
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def _send_once(self, batch: List[GeigerRecord]) -> bool:
+        """
+        Push one batch. Returns False if it failed and should be retried,
+        True once it was pushed or permanently rejected.
+        """
+        ids = [r.id for r in batch if r.id is not None]
+        try:
+            ok = self._push_batch(batch)
+        except BatchRejected as exc:
+            # Left unpushed for the backlog replay; the queue moves on
+            self.rejected_batches += 1
+            log.error(
+                "push_batch_rejected",
+                extra={
+                    "status_code": exc.status_code,
+                    "first_id": ids[0] if ids else None,
+                    "batch_size": len(batch),
+                },
+            )
+            self._release(ids)
+            return True
+        except Exception:
+            ok = False
+
+        if not ok:
+            self.failed_batches += 1
+            return False
+
+        self._on_pushed(ids)
+        self._release(ids)
+        self.sent_batches += 1
+        self.sent_records += len(batch)
+        return True
+
+    def _release(self, ids: List[int]) -> None:
+        # Batches complete in queue order, so these are the oldest ids
+        with self._ids_lock:
+            for _ in ids:
+                done = self._pending_ids.popleft()
+                if self._floor and self._floor[0] == done:
+                    self._floor.popleft()
@@ -2,7 +2,29 @@
 
 from __future__ import annotations
 
-from typing import Optional, Dict, Any
+import re
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+# MightyOhm line body: CPS, <cps>, CPM, <cpm>, uSv/hr, <usv>, <mode>
+_BODY = (
+    r"CPS[ \t]*,[ \t]*(\d+)[ \t]*,[ \t]*"
+    r"CPM[ \t]*,[ \t]*(\d+)[ \t]*,[ \t]*"
+    r"uSv/hr[ \t]*,[ \t]*(\d+(?:\.\d+)?)[ \t]*,[ \t]*"
+    r"([A-Za-z]+)"
+)
+
+# Single stripped line (str / bytes)
+_LINE_RE = re.compile(_BODY, re.ASCII)
+_LINE_BYTES_RE = re.compile(_BODY.encode("ascii"))
+
+# Every valid line in a block of bytes, found in one C-level scan
+_BLOCK_RE = re.compile(
+    rb"^[ \t]*(" + _BODY.encode("ascii") + rb")[ \t\r]*$", re.MULTILINE
+)
+_NONBLANK_RE = re.compile(rb"^[ \t\r]*\S", re.MULTILINE)
 
 
 def parse_geiger_csv(line: Any) -> Optional[Dict[str, Any]]:
@@ -24,33 +46,216 @@ def parse_geiger_csv(line: Any) -> Optional[Dict[str, Any]]:
         return None
 
     raw = line.strip()
-    if not raw:
+    m = _LINE_RE.fullmatch(raw)
+    if m is None:
         return None
 
-    parts = [p.strip() for p in raw.split(",")]
-    if len(parts) != 7:
+    return {
+        "raw": raw,
+        "cps": int(m.group(1)),
+        "cpm": int(m.group(2)),
+        "usv": float(m.group(3)),
+        "mode": m.group(4),
+    }
+
+
+def parse_geiger_bytes(line: Any) -> Optional[Dict[str, Any]]:
+    """
+    Same contract as parse_geiger_csv(), for raw serial bytes.
+
+    Matching runs on the bytes; only a valid line is decoded.
+    """
+    if not isinstance(line, (bytes, bytearray, memoryview)):
         return None
 
-    try:
-        # Expected positions:
-        # 0: "CPS"
-        # 1: cps value
-        # 2: "CPM"
-        # 3: cpm value
-        # 4: "uSv/hr"
-        # 5: usv value
-        # 6: mode
-        cps = int(parts[1])
-        cpm = int(parts[3])
-        usv = float(parts[5])
-        mode = parts[6]
-    except Exception:
+    raw = bytes(line).strip()
+    m = _LINE_BYTES_RE.fullmatch(raw)
+    if m is None:
         return None
 
     return {
-        "raw": raw,
-        "cps": cps,
-        "cpm": cpm,
-        "usv": usv,
-        "mode": mode,
+        "raw": raw.decode("ascii"),
+        "cps": int(m.group(1)),
+        "cpm": int(m.group(2)),
+        "usv": float(m.group(3)),
+        "mode": m.group(4).decode("ascii"),
     }
+
+
+# ----------------------------------------------------------------------
+# Batch / columnar parsing
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class ParsedColumns:
+    """
+    Columnar parse result: one entry per valid line, in input order.
+    """
+
+    cps: array = field(default_factory=lambda: array("q"))
+    cpm: array = field(default_factory=lambda: array("q"))
+    usv: array = field(default_factory=lambda: array("d"))
+    mode: List[str] = field(default_factory=list)
+    raw: Optional[List[str]] = None
+    rejected: int = 0
+
+    def __len__(self) -> int:
+        return len(self.cps)
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Columns as NumPy arrays (zero-copy for the numeric columns).
+        Requires numpy, which is not a runtime dependency.
+        """
+        import numpy as np
+
+        return {
+            "cps": np.frombuffer(self.cps, dtype=np.int64),
+            "cpm": np.frombuffer(self.cpm, dtype=np.int64),
+            "usv": np.frombuffer(self.usv, dtype=np.float64),
+            "mode": np.array(self.mode),
+        }
+
+
+def _append_modes(out: ParsedColumns, modes: Sequence[bytes]) -> None:
+    # Only a handful of distinct modes: decode each once, map the rest in C
+    lookup = {m: sys.intern(m.decode("ascii")) for m in set(modes)}
+    out.mode.extend(map(lookup.__getitem__, modes))
+
+
+def _is_decimal(token: bytes) -> bool:
+    """
+    Same grammar as _BODY's usv group: digits, optionally "." and digits.
+    """
+    whole, dot, frac = token.partition(b".")
+    return whole.isdigit() and (not dot or frac.isdigit())
+
+
+def _parse_block_canonical(block: bytes, out: ParsedColumns) -> bool:
+    """
+    Fast path for blocks where every line is exactly in MightyOhm's
+    canonical "CPS, n, CPM, n, uSv/hr, x, MODE" form.
+
+    The whole block is split on ", " once; line i then owns tokens
+    6i..6i+6, and the token between lines is "MODE\nCPS". Labels and
+    numbers are validated column-wise with slices, so the per-line work
+    is all in C. Returns False (nothing appended) if any line deviates.
+    """
+    data = block.replace(b"\r", b"").strip()
+    if not data:
+        return True
+
+    n_lines = data.count(b"\n") + 1
+    tokens = data.split(b", ")
+    if len(tokens) != 6 * n_lines + 1 or tokens[0] != b"CPS":
+        return False
+
+    # Junction tokens "MODE\nCPS" -> [mode, CPS, mode, CPS, ...]
+    junctions = b"\n".join(tokens[6:-1:6]).split(b"\n") if n_lines > 1 else []
+    if len(junctions) != 2 * (n_lines - 1):
+        return False
+    if n_lines > 1 and set(junctions[1::2]) != {b"CPS"}:
+        return False
+    if set(tokens[2::6]) != {b"CPM"} or set(tokens[4::6]) != {b"uSv/hr"}:
+        return False
+
+    cps, cpm, usv = tokens[1::6], tokens[3::6], tokens[5::6]
+    modes = junctions[0::2] + [tokens[-1]]
+    if not (b"".join(cps).isdigit() and b"".join(cpm).isdigit()):
+        return False
+    # Readings repeat, so the distinct values are few
+    if not all(map(_is_decimal, set(usv))):
+        return False
+    if not all(m.isalpha() and m.isascii() for m in set(modes)):
+        return False
+
+    try:
+        cps_col = array("q", map(int, cps))
+        cpm_col = array("q", map(int, cpm))
+        usv_col = array("d", map(float, usv))
+    except ValueError:
+        # Empty cps/cpm token
+        return False
+
+    out.cps.extend(cps_col)
+    out.cpm.extend(cpm_col)
+    out.usv.extend(usv_col)
+    _append_modes(out, modes)
+    if out.raw is not None:
+        out.raw.extend(data.decode("ascii").split("\n"))
+    return True
+
+
+def _parse_block(block: bytes, out: ParsedColumns) -> None:
+    if _parse_block_canonical(block, out):
+        return
+
+    # Slow path: validate line by line with the precompiled matcher
+    rows = _BLOCK_RE.findall(block)
+    out.rejected += len(_NONBLANK_RE.findall(block)) - len(rows)
+    if not rows:
+        return
+
+    raws, cps, cpm, usv, modes = zip(*rows)
+    out.cps.extend(map(int, cps))
+    out.cpm.extend(map(int, cpm))
+    out.usv.extend(map(float, usv))
+    _append_modes(out, modes)
+
+    if out.raw is not None:
+        out.raw.extend(r.decode("ascii") for r in raws)
+
+
+def parse_many(
+    source: Union[bytes, str, Iterable[Union[bytes, str]]],
+    keep_raw: bool = False,
+) -> ParsedColumns:
+    """
+    Parse a block of lines (bytes/str) or an iterable of lines into columns.
+
+    Invalid lines are skipped and counted in ``rejected``.
+    """
+    out = ParsedColumns(raw=[] if keep_raw else None)
+
+    if isinstance(source, str):
+        block = source.encode("utf-8", errors="ignore")
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        block = bytes(source)
+    else:
+        block = b"\n".join(
+            line.encode("utf-8", errors="ignore") if isinstance(line, str) else line
+            for line in source
+        )
+
+    _parse_block(block, out)
+    return out
+
+
+def parse_file(
+    path: str,
+    keep_raw: bool = False,
+    chunk_bytes: int = 1 << 20,
+) -> ParsedColumns:
+    """
+    Parse an archived raw log file in fixed-size chunks.
+
+    Lines split across chunk boundaries are carried over to the next chunk.
+    """
+    out = ParsedColumns(raw=[] if keep_raw else None)
+    carry = b""
+
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_bytes)
+            if not chunk:
+                break
+            data = carry + chunk
+            cut = data.rfind(b"\n") + 1
+            carry = data[cut:]
+            if cut:
+                _parse_block(data[:cut], out)
+
+    if carry:
+        _parse_block(carry, out)
+    return out
@@ -0,0 +1,117 @@
+# filename: app/ingestion/devices.py
+
+"""
+Serial device specs for multi-device agents.
+
+One agent process can ingest from several counters. Devices come from the
+[serial] config section:
+
+    [serial]
+    baudrate = 9600
+
+    [[serial.devices]]
+    port = "/dev/ttyUSB0"
+    device_id = "garage"
+
+    [[serial.devices]]
+    port = "/dev/ttyUSB1"
+    device_id = "attic"
+    baudrate = 19200
+
+or from repeated --device PORT[=DEVICE_ID] arguments. Each device gets its
+own SerialReader and watchdog; all of them share one PushClient (and
+therefore one SQLite writer and push pipeline).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+ParsedHandler = Callable[[Dict[str, Any]], None]
+
+
+@dataclass(frozen=True)
+class SerialDevice:
+    port: str
+    device_id: str
+    baudrate: int = 9600
+
+
+def parse_device_arg(value: str, default_device_id: str, baudrate: int) -> SerialDevice:
+    """
+    Parse a --device value of the form PORT or PORT=DEVICE_ID.
+    """
+    port, sep, device_id = value.partition("=")
+    if not port:
+        raise ValueError(f"Invalid --device value: {value!r}")
+    return SerialDevice(
+        port=port,
+        device_id=device_id if sep and device_id else default_device_id,
+        baudrate=baudrate,
+    )
+
+
+def devices_from_config(
+    serial_section: Any, default_device_id: str
+) -> List[SerialDevice]:
+    """
+    Devices from a [serial] config section.
+
+    Accepts a dict or SettingsNamespace. Falls back to the single-device
+    form (serial.device) when no [[serial.devices]] entries exist.
+    """
+    if serial_section is None:
+        return []
+
+    def get(section: Any, key: str, default: Any = None) -> Any:
+        if isinstance(section, dict):
+            return section.get(key, default)
+        return getattr(section, key, default)
+
+    default_baudrate = int(get(serial_section, "baudrate", 9600))
+    entries = get(serial_section, "devices", None) or []
+
+    devices: List[SerialDevice] = []
+    for entry in entries:
+        port = get(entry, "port")
+        if not port:
+            raise ValueError(f"serial.devices entry without port: {entry!r}")
+        devices.append(
+            SerialDevice(
+                port=port,
+                device_id=get(entry, "device_id") or default_device_id,
+                baudrate=int(get(entry, "baudrate", default_baudrate)),
+            )
+        )
+
+    if not devices and get(serial_section, "device"):
+        devices.append(
+            SerialDevice(
+                port=get(serial_section, "device"),
+                device_id=default_device_id,
+                baudrate=default_baudrate,
+            )
+        )
+
+    return devices
+
+
+def check_unique(devices: Sequence[SerialDevice]) -> None:
+    ports = [d.port for d in devices]
+    if len(set(ports)) != len(ports):
+        raise ValueError(f"Duplicate serial ports: {ports}")
+
+
+def tag_device(handler: ParsedHandler, device_id: Optional[str]) -> ParsedHandler:
+    """
+    Wrap a parsed-record handler so every record carries device_id.
+    """
+    if device_id is None:
+        return handler
+
+    def tagged(parsed: Dict[str, Any]) -> None:
+        parsed["device_id"] = device_id
+        handler(parsed)
+
+    return tagged
@@ -1,12 +1,44 @@
 # filename: app/ingestion/geiger_reader.py
 
 import argparse
+import asyncio
 import logging
 import sys
+import threading
+from dataclasses import replace
+from typing import Callable, List, Optional
 
-from app.ingestion.api_client import PushClient
+from app.config_loader import load_config
+from app.http_session import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    PooledSession,
+    configure_session,
+)
+from app.ingestion.api_client import PUSH_MODES, PushClient
+from app.ingestion.async_agent import AsyncIngestionAgent, run_agent
+from app.ingestion.devices import (
+    SerialDevice,
+    check_unique,
+    devices_from_config,
+    parse_device_arg,
+    tag_device,
+)
+from app.ingestion.pipeline import OVERFLOW_POLICIES, IngestionPipeline, LineBuffer
+from app.ingestion.replay import BacklogReplayer
 from app.ingestion.serial_reader import SerialReader
 from app.ingestion.watchdog import WatchdogSerialReader
+from app.live_feed import LiveFeedWriter
+from app.logging import (
+    DEFAULT_READINGS_INTERVAL,
+    logging_stats,
+    setup_console_logging,
+)
+from app.logging_telemetry import TelemetryHandler
+from app.sqlite_store import DEFAULT_COMMIT_MAX_DELAY_MS
+from app.telemetry_spool import DEFAULT_SPOOL_MAX_BYTES
+from app.wire import BATCH_FORMATS, ENCODINGS
+
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -14,28 +46,249 @@ def build_parser() -> argparse.ArgumentParser:
         description="Ingestion loop for MightyOhm Geiger counter readings.",
     )
 
-    parser.add_argument("--device", required=True, type=str)
-    parser.add_argument("--baudrate", required=True, type=int)
+    parser.add_argument(
+        "--device",
+        required=False,
+        default=None,
+        action="append",
+        help="serial port as PORT or PORT=DEVICE_ID; repeat for more devices",
+    )
+    parser.add_argument(
+        "--config",
+        required=False,
+        default=None,
+        type=str,
+        help="config.toml with [[serial.devices]] (used when --device is absent)",
+    )
+    parser.add_argument("--baudrate", required=False, default=None, type=int)
+    parser.add_argument(
+        "--serial-chunked",
+        required=False,
+        default=False,
+        action="store_true",
+        help="read all buffered bytes per call instead of one readline()",
+    )
     parser.add_argument("--device-type", required=True, choices=["mightyohm"])
     parser.add_argument("--db", required=True, type=str)
     parser.add_argument("--api-url", required=True, type=str)
     parser.add_argument("--api-token", required=False, default="", type=str)
     parser.add_argument("--device-id", required=True, type=str)
+    parser.add_argument(
+        "--push-mode", required=False, default="sync", choices=list(PUSH_MODES)
+    )
+    parser.add_argument("--batch-size", required=False, default=50, type=int)
+    parser.add_argument("--batch-max-age", required=False, default=5.0, type=float)
+    parser.add_argument(
+        "--push-encoding",
+        required=False,
+        default="identity",
+        choices=list(ENCODINGS),
+        help="compress push bodies; falls back if the server answers 415",
+    )
+    parser.add_argument(
+        "--push-format",
+        required=False,
+        default="rows",
+        choices=list(BATCH_FORMATS),
+        help="columnar: one array per field per batch instead of row objects",
+    )
+    parser.add_argument("--http-pool-size", required=False, default=4, type=int)
+    parser.add_argument(
+        "--http-connect-timeout",
+        required=False,
+        default=DEFAULT_CONNECT_TIMEOUT,
+        type=float,
+    )
+    parser.add_argument(
+        "--http-read-timeout",
+        required=False,
+        default=DEFAULT_READ_TIMEOUT,
+        type=float,
+    )
+    parser.add_argument("--commit-max-rows", required=False, default=1, type=int)
+    parser.add_argument(
+        "--commit-max-delay-ms",
+        required=False,
+        default=DEFAULT_COMMIT_MAX_DELAY_MS,
+        type=float,
+        help="commit deadline when --commit-max-rows > 1; must be > 0",
+    )
+    parser.add_argument("--replay-interval", required=False, default=30.0, type=float)
+    parser.add_argument("--replay-rate", required=False, default=50.0, type=float)
+    parser.add_argument("--replay-batch-size", required=False, default=200, type=int)
+    parser.add_argument(
+        "--pipeline",
+        required=False,
+        default=False,
+        action="store_true",
+        help="read on a dedicated thread; parse/store/push on consumers",
+    )
+    parser.add_argument("--buffer-size", required=False, default=1024, type=int)
+    parser.add_argument(
+        "--overflow",
+        required=False,
+        default="block",
+        choices=list(OVERFLOW_POLICIES),
+    )
+    parser.add_argument("--spill-path", required=False, default=None, type=str)
+    parser.add_argument("--consumers", required=False, default=1, type=int)
+    parser.add_argument(
+        "--asyncio",
+        required=False,
+        default=False,
+        action="store_true",
+        help="run reader/processor as asyncio tasks on one event loop",
+    )
+    parser.add_argument(
+        "--serve-api-host",
+        required=False,
+        default=None,
+        type=str,
+        help="with --asyncio, also serve the FastAPI app on this host",
+    )
+    parser.add_argument("--serve-api-port", required=False, default=8000, type=int)
+    parser.add_argument(
+        "--log-level",
+        required=False,
+        default="INFO",
+        type=str,
+        help="DEBUG also logs RAW/PARSED lines (rate-limited)",
+    )
+    parser.add_argument(
+        "--log-readings-interval",
+        required=False,
+        default=DEFAULT_READINGS_INTERVAL,
+        type=float,
+        help="seconds between RAW/PARSED DEBUG messages; 0 logs every reading",
+    )
+    parser.add_argument(
+        "--live-feed",
+        required=False,
+        default=None,
+        type=str,
+        help="publish readings to this memory-mapped ring file for the API",
+    )
+    parser.add_argument("--live-feed-size", required=False, default=1024, type=int)
+    parser.add_argument(
+        "--telemetry-url",
+        required=False,
+        default=None,
+        type=str,
+        help="also ship the agent's log events to URL/telemetry",
+    )
+    parser.add_argument("--telemetry-token", required=False, default="", type=str)
+    parser.add_argument(
+        "--telemetry-encoding",
+        required=False,
+        default="identity",
+        choices=list(ENCODINGS),
+        help="compress telemetry bodies; falls back if the server answers 415",
+    )
+    parser.add_argument(
+        "--telemetry-spool-dir",
+        required=False,
+        default=None,
+        type=str,
+        help="keep telemetry events on disk while the endpoint is down",
+    )
+    parser.add_argument(
+        "--telemetry-spool-max-bytes",
+        required=False,
+        default=DEFAULT_SPOOL_MAX_BYTES,
+        type=int,
+    )
 
     return parser
 
 
+def resolve_devices(
+    args: argparse.Namespace, parser: argparse.ArgumentParser
+) -> List[SerialDevice]:
+    """
+    Devices from repeated --device arguments, else from --config [serial].
+    """
+    baudrate = args.baudrate if args.baudrate is not None else 9600
+
+    try:
+        if args.device:
+            devices = [
+                parse_device_arg(value, args.device_id, baudrate)
+                for value in args.device
+            ]
+        elif args.config:
+            config = load_config(args.config)
+            devices = devices_from_config(config.get("serial"), args.device_id)
+            if args.baudrate is not None:
+                devices = [replace(d, baudrate=args.baudrate) for d in devices]
+        else:
+            devices = []
+        check_unique(devices)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    if not devices:
+        parser.error("no serial devices: pass --device or --config")
+    return devices
+
+
+def build_telemetry_handler(
+    args: argparse.Namespace, session: Optional[PooledSession] = None
+) -> Optional[TelemetryHandler]:
+    """
+    TelemetryHandler for --telemetry-url, or None when it is not set.
+    """
+    if not args.telemetry_url:
+        return None
+    return TelemetryHandler(
+        base_url=args.telemetry_url,
+        token=args.telemetry_token,
+        spool_dir=args.telemetry_spool_dir,
+        spool_max_bytes=args.telemetry_spool_max_bytes,
+        content_encoding=args.telemetry_encoding,
+        session=session,
+    )
+
+
+def _run_in_threads(targets: List[Callable[[], object]]) -> None:
+    """
+    Run blocking loops on daemon threads until they exit or Ctrl-C.
+    """
+    threads = [
+        threading.Thread(target=target, daemon=True, name=f"ingest-{i}")
+        for i, target in enumerate(targets)
+    ]
+    for t in threads:
+        t.start()
+    while any(t.is_alive() for t in threads):
+        for t in threads:
+            t.join(timeout=1.0)
+
+
 def main() -> int:
-    args = build_parser().parse_args()
+    parser = build_parser()
+    args = parser.parse_args()
+    devices = resolve_devices(args, parser)
+
+    # Before logging, so the telemetry handler shares the pooled session
+    http = configure_session(
+        pool_maxsize=args.http_pool_size,
+        connect_timeout=args.http_connect_timeout,
+        read_timeout=args.http_read_timeout,
+    )
+    telemetry = build_telemetry_handler(args, session=http)
 
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s",
+    setup_console_logging(
+        args.log_level,
+        args.log_readings_interval,
+        handlers=[telemetry] if telemetry is not None else (),
     )
 
     logging.info("Starting ingestion agent")
-    logging.info(f"Device: {args.device}")
-    logging.info(f"Baudrate: {args.baudrate}")
+    for device in devices:
+        logging.info(
+            f"Device: {device.port} (id={device.device_id}, "
+            f"baudrate={device.baudrate})"
+        )
     logging.info(f"Device type: {args.device_type}")
     logging.info(f"DB path: {args.db}")
     logging.info(f"API URL: {args.api_url}")
@@ -43,24 +296,140 @@ def main() -> int:
         "API token: <empty>" if args.api_token == "" else "API token: <provided>"
     )
     logging.info(f"Device ID: {args.device_id}")
+    logging.info(f"Push mode: {args.push_mode}")
+    if telemetry is not None:
+        logging.info(
+            f"Telemetry: {args.telemetry_url} "
+            f"(spool={args.telemetry_spool_dir or '<none>'})"
+        )
 
-    base_reader = SerialReader(
-        device=args.device,
-        baudrate=args.baudrate,
-    )
-
-    reader = WatchdogSerialReader(base_reader)
+    # One reader + watchdog per device
+    readers = [
+        WatchdogSerialReader(
+            SerialReader(
+                device=device.port,
+                baudrate=device.baudrate,
+                chunked=args.serial_chunked,
+            )
+        )
+        for device in devices
+    ]
 
+    live_feed = None
+    if args.live_feed:
+        logging.info(f"Live feed: {args.live_feed} ({args.live_feed_size} slots)")
+        live_feed = LiveFeedWriter(args.live_feed, capacity=args.live_feed_size)
 
+    # All devices share one store (single writer) and push pipeline
     client = PushClient(
         api_url=args.api_url,
         api_token=args.api_token,
         device_id=args.device_id,
         db_path=args.db,
+        push_mode=args.push_mode,
+        batch_size=args.batch_size,
+        batch_max_age=args.batch_max_age,
+        commit_max_rows=args.commit_max_rows,
+        commit_max_delay_ms=args.commit_max_delay_ms,
+        live_feed=live_feed,
+        content_encoding=args.push_encoding,
+        batch_format=args.push_format,
     )
 
-    reader.set_handler(client.handle_record)
-    reader.run()
+    replayer = None
+    if args.replay_interval > 0:
+        replayer = BacklogReplayer(
+            db_path=args.db,
+            push_batch=client.push_batch,
+            horizon=client.replay_horizon,
+            batch_size=args.replay_batch_size,
+            max_records_per_second=args.replay_rate,
+            interval_seconds=args.replay_interval,
+            store=client.store,
+        )
+        replayer.start()
+
+    agent = None
+    pipelines: List[IngestionPipeline] = []
+    if args.asyncio:
+        logging.info(
+            f"asyncio agent: queue={args.buffer_size} consumers={args.consumers}"
+        )
+        agent = AsyncIngestionAgent(
+            readers=readers,
+            handler=client.handle_record,
+            queue_size=args.buffer_size,
+            consumers=args.consumers,
+            device_ids=[device.device_id for device in devices],
+        )
+    elif args.pipeline:
+        logging.info(
+            f"Pipeline: buffer={args.buffer_size} overflow={args.overflow} "
+            f"consumers={args.consumers}"
+        )
+        for device, reader in zip(devices, readers):
+            spill_path = args.spill_path
+            if spill_path and len(devices) > 1:
+                spill_path = f"{spill_path}.{device.device_id}"
+            pipelines.append(
+                IngestionPipeline(
+                    reader=reader,
+                    handler=tag_device(client.handle_record, device.device_id),
+                    buffer=LineBuffer(
+                        capacity=args.buffer_size,
+                        overflow=args.overflow,
+                        spill_path=spill_path,
+                    ),
+                    consumers=args.consumers,
+                )
+            )
+    else:
+        for device, reader in zip(devices, readers):
+            reader.set_handler(tag_device(client.handle_record, device.device_id))
+
+    try:
+        if agent is not None:
+            asyncio.run(
+                run_agent(
+                    agent,
+                    api_host=args.serve_api_host,
+                    api_port=args.serve_api_port,
+                    db_path=args.db,
+                    live_feed_path=args.live_feed,
+                )
+            )
+        elif len(pipelines) == 1:
+            pipelines[0].run()
+        elif pipelines:
+            for pipeline in pipelines:
+                pipeline.start()
+            _run_in_threads([pipeline.wait for pipeline in pipelines])
+        elif len(readers) == 1:
+            readers[0].run()
+        else:
+            _run_in_threads([reader.run for reader in readers])
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if agent is not None:
+            logging.info(f"asyncio agent stats: {agent.stats()}")
+        for device, pipeline in zip(devices, pipelines):
+            pipeline.stop()
+            logging.info(f"Pipeline stats ({device.device_id}): {pipeline.stats()}")
+        if replayer is not None:
+            replayer.stop()
+        logging.info(f"Storage stats: {client.storage_stats()}")
+        logging.info(f"Wire stats: {client.wire_stats()}")
+        client.close()
+        if live_feed is not None:
+            live_feed.close()
+        logging.info(f"HTTP session stats: {http.stats()}")
+        logging.info(f"Logging stats: {logging_stats()}")
+        if telemetry is not None:
+            # Flushed (or spooled) by logging.shutdown() at exit, after
+            # the log queue has drained into it
+            logging.info(f"Telemetry stats: {telemetry.stats()}")
+            logging.info(f"Telemetry wire stats: {telemetry.wire_stats()}")
 
     return 0
 
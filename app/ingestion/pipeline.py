@@ -0,0 +1,419 @@
+# filename: app/ingestion/pipeline.py
+
+"""
+Bounded producer/consumer pipeline for serial ingestion.
+
+SerialReader.run() reads, parses and calls the handler (SQLite + HTTP) on
+one thread, so a slow handler backs up the UART buffer and frames are
+lost. In pipeline mode a dedicated reader thread only pulls lines into a
+bounded LineBuffer, and one or more consumer threads parse and hand the
+records to the handler.
+
+Overflow policies when the buffer is full:
+- "block": the reader waits for space (back-pressure onto the UART)
+- "drop_oldest": the oldest buffered line is discarded and counted
+- "spill": lines overflow to an append-only file and are replayed in
+  order once the consumers catch up. The replay position is kept in
+  `<spill_path>.offset`, so after a restart only lines not yet handed
+  to a consumer are replayed; the file is truncated once drained
+
+Queue depth, drops, spills and per-stage latency are exposed via stats().
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+)
+
+from app.ingestion.csv_parser import parse_geiger_csv
+
+log = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "spill")
+
+# Replay offset of a spill file lives in <spill_path> + SPILL_OFFSET_SUFFIX
+SPILL_OFFSET_SUFFIX = ".offset"
+
+# (line, monotonic time the line was read)
+BufferedLine = Tuple[str, float]
+
+
+class LineSource(Protocol):
+    def read_line(self) -> str: ...
+
+
+class StageTimer:
+    """
+    Running count / mean / max latency for one pipeline stage.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            mean = self.total / self.count if self.count else 0.0
+            return {
+                "count": self.count,
+                "mean_ms": mean * 1000.0,
+                "max_ms": self.max * 1000.0,
+            }
+
+
+class LineBuffer:
+    """
+    Bounded FIFO of raw lines with an explicit overflow policy.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        overflow: str = "block",
+        spill_path: Optional[str] = None,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow!r}")
+        if overflow == "spill" and not spill_path:
+            raise ValueError("spill overflow requires spill_path")
+
+        self.capacity = capacity
+        self.overflow = overflow
+        self.spill_path = spill_path
+
+        self._items: Deque[BufferedLine] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # Spill file state: lines in [read offset, end of file) are pending.
+        # One handle (and one offset fd) stays open while lines are pending.
+        self._spill_pending = 0
+        self._spill_read_offset = 0
+        self._spill_file: Optional[BinaryIO] = None
+        self._offset_fd: Optional[int] = None
+
+        # Counters (read-only for callers)
+        self.dropped = 0
+        self.spilled = 0
+        self.high_water = 0
+
+        if spill_path and os.path.exists(spill_path):
+            # Lines spilled but not replayed before a restart are pending
+            self._recover_spill()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._items) + self._spill_pending
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def put(self, line: str, received: Optional[float] = None) -> None:
+        item = (line, received if received is not None else time.monotonic())
+
+        with self._cond:
+            if self.overflow == "spill" and self._spill_pending:
+                # Keep FIFO order: once spilling, new lines queue behind
+                self._spill(item)
+            elif len(self._items) >= self.capacity:
+                if self.overflow == "block":
+                    while len(self._items) >= self.capacity and not self._closed:
+                        self._cond.wait()
+                    self._items.append(item)
+                elif self.overflow == "drop_oldest":
+                    self._items.popleft()
+                    self.dropped += 1
+                    self._items.append(item)
+                else:
+                    self._spill(item)
+            else:
+                self._items.append(item)
+
+            depth = len(self._items)
+            if depth > self.high_water:
+                self.high_water = depth
+            self._cond.notify_all()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[BufferedLine]:
+        """
+        Next line in FIFO order, or None on timeout / close.
+        """
+        with self._cond:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._items and not self._spill_pending:
+                if self._closed:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+            if self._items:
+                item = self._items.popleft()
+            else:
+                item = self._unspill()
+
+            self._cond.notify_all()
+            return item
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------
+    # Spill file
+    # ------------------------------------------------------------
+
+    def _spill(self, item: BufferedLine) -> None:
+        line, _received = item
+        f = self._spill_handle()
+        f.write(line.replace("\n", " ").encode("utf-8") + b"\n")
+        f.flush()
+        self._spill_pending += 1
+        self.spilled += 1
+
+    def _unspill(self) -> BufferedLine:
+        f = self._spill_handle()
+        f.seek(self._spill_read_offset)
+        line = f.readline()
+        self._spill_read_offset = f.tell()
+
+        self._spill_pending -= 1
+        if self._spill_pending == 0:
+            # Fully drained: reset the file so it never grows unbounded
+            self._reset_spill()
+        else:
+            # Handed to a consumer: not replayed again after a restart
+            assert self._offset_fd is not None
+            os.pwrite(self._offset_fd, b"%020d\n" % self._spill_read_offset, 0)
+
+        # Latency for spilled lines is measured from when they are replayed
+        return (line.decode("utf-8", "replace").rstrip("\n"), time.monotonic())
+
+    def _spill_handle(self) -> BinaryIO:
+        assert self.spill_path is not None
+        if self._spill_file is None:
+            # Append mode: writes go to the end, reads seek to the offset
+            self._spill_file = open(self.spill_path, "a+b")
+            self._offset_fd = os.open(
+                self.spill_path + SPILL_OFFSET_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644
+            )
+        return self._spill_file
+
+    def _recover_spill(self) -> None:
+        assert self.spill_path is not None
+        offset = 0
+        try:
+            with open(self.spill_path + SPILL_OFFSET_SUFFIX, "rb") as f:
+                offset = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            pass
+
+        with open(self.spill_path, "rb") as f:
+            f.seek(min(offset, os.path.getsize(self.spill_path)))
+            self._spill_read_offset = end = f.tell()
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self._spill_pending += 1
+                end += len(line)
+
+        # A torn last line (crash mid-write) would merge with the next one
+        if end < os.path.getsize(self.spill_path):
+            os.truncate(self.spill_path, end)
+
+        if self._spill_pending == 0:
+            self._reset_spill()
+
+    def _reset_spill(self) -> None:
+        assert self.spill_path is not None
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        if self._offset_fd is not None:
+            os.close(self._offset_fd)
+            self._offset_fd = None
+
+        os.truncate(self.spill_path, 0)
+        try:
+            os.remove(self.spill_path + SPILL_OFFSET_SUFFIX)
+        except FileNotFoundError:
+            pass
+        self._spill_read_offset = 0
+
+
+class IngestionPipeline:
+    """
+    Reader thread -> LineBuffer -> consumer threads (parse + handle).
+    """
+
+    def __init__(
+        self,
+        reader: LineSource,
+        handler: Callable[[Dict[str, Any]], None],
+        buffer: Optional[LineBuffer] = None,
+        consumers: int = 1,
+        stats_interval: float = 60.0,
+    ) -> None:
+        if consumers < 1:
+            raise ValueError("consumers must be >= 1")
+
+        self.reader = reader
+        self.handler = handler
+        self.buffer = buffer if buffer is not None else LineBuffer()
+        self.consumers = consumers
+        self.stats_interval = stats_interval
+
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+        self.read_timer = StageTimer()
+        self.queue_timer = StageTimer()
+        self.parse_timer = StageTimer()
+        self.handle_timer = StageTimer()
+
+        self.lines_read = 0
+        self.parse_failures = 0
+        self.handler_errors = 0
+
+    # ------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------
+
+    def start(self) -> None:
+        reader = threading.Thread(
+            target=self._read_loop, daemon=True, name="pipeline-reader"
+        )
+        self._threads.append(reader)
+        for i in range(self.consumers):
+            self._threads.append(
+                threading.Thread(
+                    target=self._consume_loop,
+                    daemon=True,
+                    name=f"pipeline-consumer-{i}",
+                )
+            )
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop_event.set()
+        self.buffer.close()
+        for t in self._threads:
+            t.join(timeout)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until stop() is called; True if it was.
+        """
+        return self._stop_event.wait(timeout)
+
+    def run(self) -> None:
+        """
+        Start the pipeline and block until KeyboardInterrupt or stop().
+        """
+        self.start()
+        try:
+            while not self._stop_event.wait(self.stats_interval):
+                log.info("pipeline_stats", extra={"stats": self.stats()})
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": len(self.buffer),
+            "capacity": self.buffer.capacity,
+            "high_water": self.buffer.high_water,
+            "dropped": self.buffer.dropped,
+            "spilled": self.buffer.spilled,
+            "lines_read": self.lines_read,
+            "parse_failures": self.parse_failures,
+            "handler_errors": self.handler_errors,
+            "latency": {
+                "read": self.read_timer.snapshot(),
+                "queue": self.queue_timer.snapshot(),
+                "parse": self.parse_timer.snapshot(),
+                "handle": self.handle_timer.snapshot(),
+            },
+        }
+
+    # ------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------
+
+    def _read_loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                start = time.monotonic()
+                line = self.reader.read_line()
+                if not line:
+                    continue
+                now = time.monotonic()
+                self.read_timer.observe(now - start)
+                self.lines_read += 1
+                self.buffer.put(line, now)
+            except StopIteration:
+                break
+            except Exception as exc:
+                log.error("pipeline_read_error", extra={"error": repr(exc)})
+                time.sleep(0.1)
+
+        self.buffer.close()
+
+    def _consume_loop(self) -> None:
+        while True:
+            item = self.buffer.get(timeout=1.0)
+            if item is None:
+                if self._stop_event.is_set() or self.buffer.closed:
+                    return
+                continue
+
+            raw, received = item
+            start = time.monotonic()
+            self.queue_timer.observe(start - received)
+
+            parsed = parse_geiger_csv(raw)
+            parsed_at = time.monotonic()
+            self.parse_timer.observe(parsed_at - start)
+
+            if parsed is None:
+                self.parse_failures += 1
+                log.debug("pipeline_parse_failed", extra={"raw": raw})
+                continue
+
+            try:
+                self.handler(parsed)
+            except Exception as exc:
+                self.handler_errors += 1
+                log.error("pipeline_handler_error", extra={"error": repr(exc)})
+            finally:
+                self.handle_timer.observe(time.monotonic() - parsed_at)
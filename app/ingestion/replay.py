@@ -0,0 +1,167 @@
+# filename: app/ingestion/replay.py
+
+"""
+Backlog replay for readings that were stored but never pushed.
+
+After a network outage the database can hold millions of `pushed = 0`
+rows. BacklogReplayer streams them in id order with keyset pagination
+(see sqlite_store.iter_unpushed_pages), pushes each page as one batch,
+and marks it pushed with mark_records_pushed before moving on, so memory
+stays at one page regardless of backlog size.
+
+A page the server rejects outright (BatchRejected) is bisected, so the
+rest of the page is pushed and only the rejected rows are left behind;
+they are logged and retried on the next pass, but never stall replay.
+Any other failure ends the pass, since the endpoint is likely down.
+
+Replay is rate limited (records per second) so it never starves live
+ingestion, and it only touches rows at or below a horizon supplied by
+the live push path, so rows that are queued or in flight are not pushed
+twice.
+
+Pass the PushClient's store (PushClient.store) so replay reads and marks
+rows through the same connection and GroupCommitWriter as ingestion. A
+second writer connection would wait on the open group-commit transaction
+and fail with "database is locked" after the batch was already pushed.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable, List, Optional
+
+from app.ingestion.batch_sender import BatchRejected
+from app.models import GeigerRecord
+from app.sqlite_store import SQLiteStore, get_store
+
+log = logging.getLogger(__name__)
+
+PushBatchFn = Callable[[List[GeigerRecord]], bool]
+HorizonFn = Callable[[], Optional[int]]
+
+
+class BacklogReplayer(threading.Thread):
+    """
+    Background thread that periodically drains the unpushed backlog.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        push_batch: PushBatchFn,
+        horizon: Optional[HorizonFn] = None,
+        batch_size: int = 200,
+        max_records_per_second: float = 50.0,
+        interval_seconds: float = 30.0,
+        store: Optional[SQLiteStore] = None,
+    ) -> None:
+        super().__init__(daemon=True, name="backlog-replayer")
+
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        if max_records_per_second <= 0:
+            raise ValueError("max_records_per_second must be > 0")
+
+        self.db_path = db_path
+        self.store = store
+        self._push_batch = push_batch
+        self._horizon = horizon
+        self.batch_size = batch_size
+        self.max_records_per_second = max_records_per_second
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+
+        # Counters (read-only for callers)
+        self.replayed_records = 0
+        self.replayed_batches = 0
+        self.failed_batches = 0
+        self.rejected_records = 0
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.replay_once()
+            except Exception as exc:
+                # Never crash the replayer
+                log.error("replay_error", extra={"error": repr(exc)})
+            self._stop_event.wait(self.interval_seconds)
+
+    def replay_once(self) -> int:
+        """
+        Make one pass over the backlog and return rows replayed. Stops at
+        the first batch that failed for a reason other than rejection
+        (the endpoint is likely still down).
+        """
+        max_id = self._horizon() if self._horizon is not None else None
+        replayed = 0
+
+        store = self.store or get_store(self.db_path)
+        pages = store.iter_unpushed_pages(self.batch_size, max_id=max_id)
+        try:
+            for page in pages:
+                if self._stop_event.is_set():
+                    break
+
+                pushed = self._push_page(store, page)
+                if pushed is None:
+                    break
+                replayed += pushed
+
+                # Pace to max_records_per_second
+                if self._stop_event.wait(len(page) / self.max_records_per_second):
+                    break
+        finally:
+            pages.close()
+
+        if replayed:
+            log.info("replay_pass_complete", extra={"replayed": replayed})
+        return replayed
+
+    def _push_page(
+        self, store: SQLiteStore, records: List[GeigerRecord]
+    ) -> Optional[int]:
+        """
+        Push and mark `records`, bisecting a rejected batch down to the
+        rejected rows. Returns rows pushed, or None on a failure worth
+        retrying on a later pass.
+        """
+        try:
+            ok = self._push_batch(records)
+        except BatchRejected as exc:
+            if len(records) == 1:
+                self.rejected_records += 1
+                log.error(
+                    "replay_record_rejected",
+                    extra={"row_id": records[0].id, "status_code": exc.status_code},
+                )
+                return 0
+
+            pushed = 0
+            mid = len(records) // 2
+            for half in (records[:mid], records[mid:]):
+                done = self._push_page(store, half)
+                if done is None:
+                    return None
+                pushed += done
+            return pushed
+        except Exception:
+            ok = False
+
+        if not ok:
+            self.failed_batches += 1
+            log.warning(
+                "replay_batch_failed",
+                extra={"first_id": records[0].id, "batch_size": len(records)},
+            )
+            return None
+
+        store.mark_records_pushed([r.id for r in records if r.id is not None])
+        self.replayed_batches += 1
+        self.replayed_records += len(records)
+        return len(records)
@@ -4,30 +4,56 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Any, Callable, cast, Dict, Optional
+from collections import deque
+from typing import Any, Callable, cast, Deque, Dict, Optional
 import serial
 
 from app.ingestion.csv_parser import parse_geiger_csv
+from app.logging import READINGS_LOGGER
+
+reading_log = logging.getLogger(READINGS_LOGGER)
 
 
 ParsedRecord = Dict[str, Any]
 ParsedHandler = Callable[[ParsedRecord], None]
 
+# Partial lines longer than this are discarded (no newline from a noisy link)
+MAX_LINE_BYTES = 4096
+
 
 class SerialReader:
     """
     Reads raw lines from a serial device, parses them, and forwards parsed
     records to a callback set by the ingestion loop.
+
+    In chunked mode each read pulls every byte the driver has buffered
+    (in_waiting) into one reusable bytearray and splits out all complete
+    lines at once; a trailing partial line is kept for the next read.
     """
 
-    def __init__(self, device: str, baudrate: int = 9600, timeout: float = 1.0) -> None:
+    def __init__(
+        self,
+        device: str,
+        baudrate: int = 9600,
+        timeout: float = 1.0,
+        chunked: bool = False,
+    ) -> None:
         self.device = device
         self.baudrate = baudrate
         self.timeout = timeout
+        self.chunked = chunked
 
         self.ser: Optional[serial.Serial] = None
         self._handle_parsed: Optional[ParsedHandler] = None
 
+        # Chunked mode state
+        self._buf = bytearray()
+        self._lines: Deque[str] = deque()
+
+        # Counters (read-only for callers)
+        self.read_calls = 0
+        self.discarded_bytes = 0
+
     def set_handler(self, handler: ParsedHandler) -> None:
         self._handle_parsed = handler
 
@@ -38,7 +64,14 @@ class SerialReader:
                 self.baudrate,
                 timeout=self.timeout,
             )
+            # Bytes buffered from a previous port are not trustworthy
+            self._buf.clear()
+            self._lines.clear()
+
+        if self.chunked:
+            return self._read_line_chunked(self.ser)
 
+        self.read_calls += 1
         raw = self.ser.readline()
         if not raw:
             return ""
@@ -46,21 +79,70 @@ class SerialReader:
         decoded = cast(str, raw.decode("utf-8", errors="ignore"))
         return decoded.strip()
 
+    def _read_line_chunked(self, ser: serial.Serial) -> str:
+        while not self._lines:
+            # Block (up to timeout) for the first byte, then take the rest
+            waiting = ser.in_waiting
+            self.read_calls += 1
+            data = ser.read(waiting if waiting > 0 else 1)
+            if not data:
+                return ""
+            self._buf += data
+            self._split_lines()
+        return self._lines.popleft()
+
+    def _split_lines(self) -> int:
+        """
+        Move complete lines from the byte buffer to the line queue.
+        Returns the number of non-empty lines found.
+        """
+        buf = self._buf
+        found = 0
+        start = 0
+
+        with memoryview(buf) as view:
+            while True:
+                end = buf.find(b"\n", start)
+                if end < 0:
+                    break
+                # Decode straight from the buffer without a bytes copy
+                line = str(view[start:end], "utf-8", "ignore").strip()
+                if line:
+                    self._lines.append(line)
+                    found += 1
+                start = end + 1
+
+        if start:
+            del buf[:start]
+
+        if len(buf) > MAX_LINE_BYTES:
+            self.discarded_bytes += len(buf)
+            buf.clear()
+
+        return found
+
     def run(self) -> None:
         while True:
             try:
                 raw = self.read_line()
-                logging.info(f"RAW: {raw!r}")
+                if not raw:
+                    continue
+                # Lazy %-formatting: free unless DEBUG is enabled, and then
+                # rate-limited by the readings logger's filter
+                reading_log.debug("RAW: %r", raw)
 
                 parsed = parse_geiger_csv(raw)
-                logging.info(f"PARSED: {parsed}")
+                if parsed is None:
+                    reading_log.warning("parse_failed", extra={"raw": raw})
+                    continue
+                reading_log.debug("PARSED: %s", parsed)
 
-                if parsed is not None and self._handle_parsed is not None:
+                if self._handle_parsed is not None:
                     self._handle_parsed(parsed)
 
             except (KeyboardInterrupt, StopIteration):
                 break
 
             except Exception as exc:
-                logging.error(f"Error in serial loop: {exc}")
+                logging.error("Error in serial loop: %s", exc)
                 time.sleep(0.1)
@@ -5,8 +5,10 @@ import logging
 from typing import Any, Optional, Callable, Dict, Protocol
 
 from app.ingestion.csv_parser import parse_geiger_csv
+from app.logging import READINGS_LOGGER
 
 log = logging.getLogger(__name__)
+reading_log = logging.getLogger(READINGS_LOGGER)
 
 
 class SerialReaderProtocol(Protocol):
@@ -54,19 +56,26 @@ class WatchdogSerialReader:
         while True:
             try:
                 raw = self.read_line()
-                log.info(f"RAW: {raw!r}")
+                if not raw:
+                    continue
+                # Lazy %-formatting: free unless DEBUG is enabled, and then
+                # rate-limited by the readings logger's filter
+                reading_log.debug("RAW: %r", raw)
 
                 parsed = parse_geiger_csv(raw)
-                log.info(f"PARSED: {parsed}")
+                if parsed is None:
+                    reading_log.warning("parse_failed", extra={"raw": raw})
+                    continue
+                reading_log.debug("PARSED: %s", parsed)
 
-                if parsed is not None and self._handler is not None:
+                if self._handler is not None:
                     self._handler(parsed)
 
             except (KeyboardInterrupt, StopIteration):
                 break
 
             except Exception as exc:
-                log.error(f"Error in watchdog serial loop: {exc}")
+                log.error("Error in watchdog serial loop: %s", exc)
                 time.sleep(0.1)
 
     # ------------------------------------------------------------
@@ -0,0 +1,317 @@
+# filename: app/live_feed.py
+
+"""
+Shared-memory live feed between the ingestion agent and the API process.
+
+The agent publishes every stored reading into a memory-mapped ring file;
+the API maps the same file read-only and serves latest/recent readings and
+change notification straight from the mapping, without touching SQLite.
+
+File layout (little endian):
+
+    header (64 bytes): magic "PILF", version, capacity, slot size,
+                       seq (readings published), max_id (highest row id)
+    slots:             capacity x fixed-size slot
+
+Each slot starts with its own sequence number. The single writer zeroes
+it, writes the body, then stores the new sequence; readers check the
+slot sequence before and after unpacking (a seqlock), so a torn or
+overwritten slot is detected instead of returned.
+
+The writer always creates a fresh file and renames it into place, so a
+reader never sees a mapped file shrink; readers re-open when the inode
+changes (agent restart).
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models import GeigerRecord
+
+MAGIC = b"PILF"
+VERSION = 1
+DEFAULT_CAPACITY = 1024
+# Inode recheck interval inside wait(), which may block for a long time
+WAIT_REOPEN_INTERVAL = 0.5
+
+_HEADER = struct.Struct("<4sIIIQq")
+HEADER_SIZE = 64
+_SEQ_OFFSET = 16  # seq, max_id follow magic/version/capacity/slot size
+_SEQ = struct.Struct("<Qq")
+
+_SLOT_SEQ = struct.Struct("<Q")
+# id, cps, cpm, usv, mode, device_id, timestamp, raw
+_SLOT_BODY = struct.Struct("<qqqd8s32s40s64s")
+SLOT_SIZE = _SLOT_SEQ.size + _SLOT_BODY.size
+
+
+def _fixed(value: str, size: int) -> bytes:
+    return value.encode("utf-8")[:size]
+
+
+def _text(value: bytes) -> str:
+    return value.rstrip(b"\0").decode("utf-8", errors="ignore")
+
+
+def _published(mm: mmap.mmap) -> Tuple[int, int]:
+    seq, max_id = _SEQ.unpack_from(mm, _SEQ_OFFSET)
+    return int(seq), int(max_id)
+
+
+class LiveFeedWriter:
+    """
+    Publishes readings into the ring file. One writer per file.
+    """
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+
+        self.path = path
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._max_id = 0
+
+        size = HEADER_SIZE + capacity * SLOT_SIZE
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self._mm = mmap.mmap(fd, size, access=mmap.ACCESS_WRITE)
+        finally:
+            os.close(fd)
+
+        _HEADER.pack_into(self._mm, 0, MAGIC, VERSION, capacity, SLOT_SIZE, 0, 0)
+        os.replace(tmp_path, path)
+
+    def publish(self, record: GeigerRecord) -> int:
+        """
+        Append a stored record (record.id set). Returns its sequence number.
+        """
+        with self._lock:
+            seq = self._seq + 1
+            offset = HEADER_SIZE + ((seq - 1) % self.capacity) * SLOT_SIZE
+            row_id = record.id or 0
+
+            _SLOT_SEQ.pack_into(self._mm, offset, 0)
+            _SLOT_BODY.pack_into(
+                self._mm,
+                offset + _SLOT_SEQ.size,
+                row_id,
+                record.counts_per_second,
+                record.counts_per_minute,
+                record.microsieverts_per_hour,
+                _fixed(record.mode, 8),
+                _fixed(record.device_id, 32),
+                _fixed(record.timestamp.isoformat(), 40),
+                _fixed(record.raw, 64),
+            )
+            _SLOT_SEQ.pack_into(self._mm, offset, seq)
+
+            self._seq = seq
+            self._max_id = max(self._max_id, row_id)
+            _SEQ.pack_into(self._mm, _SEQ_OFFSET, seq, self._max_id)
+            return seq
+
+    def close(self) -> None:
+        with self._lock:
+            self._mm.close()
+
+
+class LiveFeedReader:
+    """
+    Read-only view of a ring file written by LiveFeedWriter.
+
+    All methods return None / empty results while no valid feed exists,
+    so callers can fall back to SQLite.
+    """
+
+    def __init__(self, path: str, reopen_interval: float = 5.0) -> None:
+        self.path = path
+        self.reopen_interval = reopen_interval
+
+        self._lock = threading.Lock()
+        self._mm: Optional[mmap.mmap] = None
+        self._inode: Optional[int] = None
+        self._capacity = 0
+        self._last_check = 0.0
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+
+    def seq(self) -> Optional[int]:
+        """
+        Readings published so far (changes on every publish).
+        """
+        mm = self._mapping()
+        if mm is None:
+            return None
+        return _published(mm)[0]
+
+    def max_id(self) -> Optional[int]:
+        """
+        Highest row id published so far.
+        """
+        mm = self._mapping()
+        if mm is None:
+            return None
+        return _published(mm)[1]
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        readings = self.recent(1)
+        return readings[0] if readings else None
+
+    def recent(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Up to `limit` readings, newest published first.
+        """
+        mm = self._mapping()
+        if mm is None:
+            return []
+
+        seq = _SEQ.unpack_from(mm, _SEQ_OFFSET)[0]
+        out: List[Dict[str, Any]] = []
+        oldest = max(seq - self._capacity, 0)
+        n = seq
+        while n > oldest and len(out) < limit:
+            reading = self._read_slot(mm, n)
+            if reading is None:
+                # Overwritten while reading: everything older is gone too
+                break
+            out.append(reading)
+            n -= 1
+        return out
+
+    def since(self, seq: int, limit: int = DEFAULT_CAPACITY) -> List[Dict[str, Any]]:
+        """
+        Readings published after sequence `seq`, oldest first.
+        """
+        mm = self._mapping()
+        if mm is None:
+            return []
+
+        current = _SEQ.unpack_from(mm, _SEQ_OFFSET)[0]
+        if current < seq:
+            # Writer restarted: start over from what is in the ring
+            seq = 0
+        start = max(seq, current - self._capacity, current - limit)
+
+        out: List[Dict[str, Any]] = []
+        for n in range(start + 1, current + 1):
+            reading = self._read_slot(mm, n)
+            if reading is not None:
+                out.append(reading)
+        return out
+
+    def wait(self, seq: int, timeout: float, poll: float = 0.05) -> Optional[int]:
+        """
+        Block until the feed moves past `seq` or timeout; returns the
+        current seq (None if no feed).
+
+        The seq is polled every `poll` seconds and the file is re-checked
+        for a new inode (agent restart) at most every
+        WAIT_REOPEN_INTERVAL seconds, so a publish is noticed within
+        `poll`, and a restarted writer within WAIT_REOPEN_INTERVAL + poll.
+        """
+        reopen = min(self.reopen_interval, WAIT_REOPEN_INTERVAL)
+        deadline = time.monotonic() + timeout
+        while True:
+            mm = self._mapping(reopen)
+            current = None if mm is None else _published(mm)[0]
+            if current is None or current != seq:
+                return current
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return current
+            time.sleep(min(poll, remaining))
+
+    # ------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------
+
+    def _read_slot(self, mm: mmap.mmap, seq: int) -> Optional[Dict[str, Any]]:
+        offset = HEADER_SIZE + ((seq - 1) % self._capacity) * SLOT_SIZE
+        if _SLOT_SEQ.unpack_from(mm, offset)[0] != seq:
+            return None
+        body = _SLOT_BODY.unpack_from(mm, offset + _SLOT_SEQ.size)
+        if _SLOT_SEQ.unpack_from(mm, offset)[0] != seq:
+            return None
+
+        row_id, cps, cpm, _usv, mode, device_id, timestamp, raw = body
+        return {
+            "id": row_id,
+            "raw": _text(raw),
+            "cps": cps,
+            "cpm": cpm,
+            "mode": _text(mode),
+            "device_id": _text(device_id),
+            "timestamp": _text(timestamp),
+        }
+
+    def _mapping(self, reopen_interval: Optional[float] = None) -> Optional[mmap.mmap]:
+        if reopen_interval is None:
+            reopen_interval = self.reopen_interval
+        with self._lock:
+            now = time.monotonic()
+            if self._last_check and now - self._last_check < reopen_interval:
+                return self._mm
+            self._last_check = now
+
+            try:
+                inode = os.stat(self.path).st_ino
+            except OSError:
+                self._drop_locked()
+                return None
+
+            if self._mm is None or inode != self._inode:
+                # Another thread may still be reading the old mapping; it
+                # is unmapped when the last reference goes away
+                self._drop_locked()
+                self._open_locked()
+            return self._mm
+
+    def _open_locked(self) -> None:
+        try:
+            with open(self.path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                inode = os.fstat(f.fileno()).st_ino
+        except (OSError, ValueError):
+            return
+
+        if len(mm) < HEADER_SIZE:
+            mm.close()
+            return
+        magic, version, capacity, slot_size, _seq, _max_id = _HEADER.unpack_from(mm, 0)
+        if (
+            magic != MAGIC
+            or version != VERSION
+            or slot_size != SLOT_SIZE
+            or len(mm) < HEADER_SIZE + capacity * SLOT_SIZE
+        ):
+            mm.close()
+            return
+
+        self._mm = mm
+        self._inode = inode
+        self._capacity = capacity
+
+    def _drop_locked(self) -> None:
+        self._mm = None
+        self._inode = None
+
+    def _close_locked(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        self._drop_locked()
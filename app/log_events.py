@@ -0,0 +1,130 @@
+# filename: app/log_events.py
+
+"""
+Structured log events shared by the JSON log file and telemetry.
+
+record_to_event() turns a LogRecord into a flat dict:
+
+    {"ts": "2025-01-01T00:00:00.123Z", "level": "info",
+     "logger": "...", "msg": "...", <extras>}
+
+- the timestamp comes from record.created (the time of the log call,
+  not of formatting on the listener thread) and is rendered in UTC;
+  the seconds part is cached, so only the milliseconds are formatted
+  per record
+- extras are every attribute not set by LogRecord itself, checked
+  against one module-level frozenset instead of a tuple literal rebuilt
+  and scanned for every key
+
+encode_event()/encode_events() serialize with orjson when installed and
+fall back to the stdlib json module. Values neither backend understands
+(datetimes, exceptions, arbitrary objects) are encoded as str().
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import logging
+import time
+from typing import Any, Dict, Sequence, cast
+
+# Typed as Any so the module checks the same with or without orjson
+orjson: Any
+try:
+    orjson = importlib.import_module("orjson")
+except ImportError:  # optional speedup
+    orjson = None
+
+# Attributes every LogRecord has (plus what formatters add); anything else
+# arrived through extra={...}
+RESERVED_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | frozenset(("message", "asctime", "taskName"))
+
+# (whole second, formatted prefix); replaced as one tuple so threads
+# never pair a second with another second's prefix
+_ts_cache = (-1, "")
+
+
+def format_timestamp(created: float) -> str:
+    """
+    ISO 8601 UTC with milliseconds, e.g. 2025-01-01T00:00:00.123Z.
+    """
+    global _ts_cache
+    second = int(created)
+    cached_second, prefix = _ts_cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _ts_cache = (second, prefix)
+    return "%s.%03dZ" % (prefix, int((created - second) * 1000))
+
+
+def record_to_event(record: logging.LogRecord) -> Dict[str, Any]:
+    event: Dict[str, Any] = {
+        "ts": format_timestamp(record.created),
+        "level": record.levelname.lower(),
+        "logger": record.name,
+        "msg": record.getMessage(),
+    }
+
+    for key, value in record.__dict__.items():
+        if key not in RESERVED_ATTRS:
+            event[key] = value
+
+    if record.exc_info and record.exc_info[0] is not None:
+        event["exc"] = logging.Formatter().formatException(record.exc_info)
+
+    return event
+
+
+# ----------------------------------------------------------------------
+# Encoding
+# ----------------------------------------------------------------------
+
+
+def _default(value: Any) -> Any:
+    # Last resort for values the backend cannot encode
+    return str(value)
+
+
+if orjson is not None:
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+
+    def _dumps(value: Any) -> bytes:
+        try:
+            return cast(
+                bytes, orjson.dumps(value, default=_default, option=_ORJSON_OPTS)
+            )
+        except TypeError:
+            # e.g. integers beyond 64 bits: let the stdlib handle it
+            return _stdlib_dumps(value)
+
+else:
+
+    def _dumps(value: Any) -> bytes:
+        return _stdlib_dumps(value)
+
+
+def _stdlib_dumps(value: Any) -> bytes:
+    return json.dumps(
+        value, default=_default, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def encode_event(event: Dict[str, Any]) -> bytes:
+    """
+    One event as compact UTF-8 JSON.
+    """
+    return _dumps(event)
+
+
+def encode_events(events: Sequence[Dict[str, Any]]) -> bytes:
+    """
+    A batch of events as one JSON array.
+    """
+    return _dumps(events if isinstance(events, list) else list(events))
+
+
+def backend() -> str:
+    return "orjson" if orjson is not None else "json"
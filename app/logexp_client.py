@@ -1,5 +1,7 @@
-import requests
 import logging
+from typing import Optional
+
+from app.http_session import PooledSession, get_session
 
 
 class LogExpClient:
@@ -7,10 +9,13 @@ class LogExpClient:
     Minimal client for pushing readings to LogExp.
     """
 
-    def __init__(self, base_url: str, token: str):
+    def __init__(
+        self, base_url: str, token: str, session: Optional[PooledSession] = None
+    ):
         self.base_url = base_url.rstrip("/")
         self.token = token
         self.log = logging.getLogger(__name__)
+        self._http = session or get_session()
 
     def push(self, record_id: int, record: dict) -> bool:
         """
@@ -19,7 +24,7 @@ class LogExpClient:
         Returns True on success, False on failure.
         """
         try:
-            resp = requests.post(
+            resp = self._http.post(
                 f"{self.base_url}/api/readings",
                 json={"id": record_id, **record},
                 headers={"X-API-Key": self.token},
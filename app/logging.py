@@ -6,17 +6,36 @@ Features:
 - Console logs (INFO+), human-readable, for systemd/journalctl.
 - Structured JSON logs (DEBUG+), rotated, durable.
 - Config-driven log directory and log level.
+- Non-blocking: the root logger only enqueues records; formatting and
+  I/O run on a QueueListener thread. The queue is bounded and overflow
+  is counted, never waited on.
+- Per-reading messages (RAW/PARSED) go to the READINGS_LOGGER at DEBUG,
+  rate-limited per message; anomalies are logged there at WARNING and
+  always pass.
 - Deterministic, future-maintainer-friendly design.
 """
 
 from __future__ import annotations
 
-import json
+import atexit
 import logging
 import logging.handlers
+import queue
+import threading
 from pathlib import Path
-from datetime import datetime
-from typing import Any, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from app.log_events import encode_event, record_to_event
+
+# Logger for per-reading messages from the serial loops
+READINGS_LOGGER = "pi_log.readings"
+
+# Default: at most one RAW and one PARSED message per 10 s at DEBUG
+DEFAULT_READINGS_INTERVAL = 10.0
+
+LOG_QUEUE_SIZE = 10000
+
+CONSOLE_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
 
 
 # ----------------------------------------------------------------------
@@ -43,49 +62,165 @@ def _level_from_string(level_str: str) -> int:
         return logging.INFO
 
 
+# ----------------------------------------------------------------------
+# Hot-path controls
+# ----------------------------------------------------------------------
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let through at most `burst` records per message template every
+    `interval` seconds. WARNING and above always pass; interval <= 0
+    disables the limit.
+
+    The next record let through for a template carries a `suppressed`
+    attribute with the number of records dropped since the last one.
+    Intended for loggers with a fixed set of templates (READINGS_LOGGER).
+    """
+
+    def __init__(
+        self, interval: float = DEFAULT_READINGS_INTERVAL, burst: int = 1
+    ) -> None:
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self._lock = threading.Lock()
+        # template -> [window start, passed in window, suppressed]
+        self._windows: Dict[str, List[float]] = {}
+        self.suppressed_total = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.interval <= 0:
+            return True
+
+        key = str(record.msg)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or record.created - window[0] >= self.interval:
+                suppressed = int(window[2]) if window is not None else 0
+                self._windows[key] = [record.created, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+
+            window[2] += 1
+            self.suppressed_total += 1
+            return False
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for a bounded queue: a full queue drops the record and
+    counts it instead of blocking or printing a traceback.
+    """
+
+    def __init__(self, q: "queue.Queue[Any]") -> None:
+        super().__init__(q)
+        # QueueHandler.queue is typed as a bare put/get protocol
+        self.bounded = q
+        self.enqueued = 0
+        self.dropped = 0
+
+    def depth(self) -> int:
+        return self.bounded.qsize()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.bounded.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+_readings_filter: Optional[RateLimitFilter] = None
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        # Drains the queue; the sinks themselves are flushed and closed by
+        # logging.shutdown() at exit, as before
+        _listener.stop()
+        _listener = None
+
+
+def shutdown_logging() -> None:
+    """
+    Flush queued records to the sinks and detach the queue from the root
+    logger. Runs at exit; safe to call more than once.
+    """
+    global _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    _stop_listener()
+
+
+atexit.register(shutdown_logging)
+
+
+def _install(
+    handlers: List[logging.Handler], level: int, readings_interval: float
+) -> None:
+    """
+    Route the root logger through a bounded queue to `handlers`.
+    """
+    global _listener, _queue_handler, _readings_filter
+
+    root = logging.getLogger()
+    root.setLevel(level)
+
+    # Clear any existing handlers (important for tests + reloads)
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    _stop_listener()
+
+    q: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _queue_handler = DroppingQueueHandler(q)
+    root.addHandler(_queue_handler)
+
+    _listener = logging.handlers.QueueListener(q, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    readings = logging.getLogger(READINGS_LOGGER)
+    if _readings_filter is not None:
+        readings.removeFilter(_readings_filter)
+    _readings_filter = RateLimitFilter(interval=readings_interval)
+    readings.addFilter(_readings_filter)
+
+
+def logging_stats() -> Dict[str, int]:
+    """
+    Counters for the logging pipeline (zero before setup).
+    """
+    return {
+        "enqueued": _queue_handler.enqueued if _queue_handler else 0,
+        "dropped": _queue_handler.dropped if _queue_handler else 0,
+        "depth": _queue_handler.depth() if _queue_handler else 0,
+        "readings_suppressed": (
+            _readings_filter.suppressed_total if _readings_filter else 0
+        ),
+    }
+
+
 # ----------------------------------------------------------------------
 # JSON Formatter
 # ----------------------------------------------------------------------
 
 
 class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per line; see app.log_events for the event shape.
+    """
+
     def format(self, record: logging.LogRecord) -> str:
-        payload = {
-            "ts": datetime.now().isoformat(),
-            "level": record.levelname.lower(),
-            "logger": record.name,
-            "msg": record.getMessage(),
-        }
-
-        # Include structured extras if present
-        for key, value in record.__dict__.items():
-            if key not in (
-                "args",
-                "asctime",
-                "created",
-                "exc_info",
-                "exc_text",
-                "filename",
-                "funcName",
-                "levelname",
-                "levelno",
-                "lineno",
-                "module",
-                "msecs",
-                "message",
-                "msg",
-                "name",
-                "pathname",
-                "process",
-                "processName",
-                "relativeCreated",
-                "stack_info",
-                "thread",
-                "threadName",
-            ):
-                payload[key] = value
-
-        return json.dumps(payload)
+        return encode_event(record_to_event(record)).decode("utf-8")
 
 
 # ----------------------------------------------------------------------
@@ -101,14 +236,19 @@ def setup_logging(config: Optional[Union[dict, object]] = None) -> None:
         config: SettingsNamespace or dict with:
             config.logging.log_dir
             config.logging.level
+            config.logging.readings_interval (seconds, 0 = every reading)
     """
 
     default_dir = "/opt/pi-log/logs"
     default_level = "INFO"
 
+    readings_interval = DEFAULT_READINGS_INTERVAL
     if config and hasattr(config, "logging"):
         log_dir_raw = getattr(config.logging, "log_dir", default_dir)
         log_level_raw = getattr(config.logging, "level", default_level)
+        readings_interval = float(
+            getattr(config.logging, "readings_interval", readings_interval)
+        )
     else:
         log_dir_raw = default_dir
         log_level_raw = default_level
@@ -120,24 +260,8 @@ def setup_logging(config: Optional[Union[dict, object]] = None) -> None:
 
     level = _level_from_string(log_level)
 
-    # Root logger
-    root = logging.getLogger()
-    root.setLevel(level)
-
-    # Clear any existing handlers (important for tests + reloads)
-    for h in list(root.handlers):
-        root.removeHandler(h)
-
     # Console Handler (INFO+)
-    console = logging.StreamHandler()
-    console.setLevel(logging.INFO)
-    console.setFormatter(
-        logging.Formatter(
-            fmt="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-            datefmt="%Y-%m-%dT%H:%M:%SZ",
-        )
-    )
-    root.addHandler(console)
+    console = _console_handler()
 
     # JSON File Handler (DEBUG+)
     json_path = log_dir / "pi-log.jsonl"
@@ -150,7 +274,35 @@ def setup_logging(config: Optional[Union[dict, object]] = None) -> None:
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(JSONFormatter())
-    root.addHandler(file_handler)
+
+    _install([console, file_handler], level, readings_interval)
+
+
+def setup_console_logging(
+    level: str = "INFO",
+    readings_interval: float = DEFAULT_READINGS_INTERVAL,
+    handlers: Sequence[logging.Handler] = (),
+) -> None:
+    """
+    Console-only variant of setup_logging() for the ingestion agent (its
+    output goes to journald), with the same queue and rate limits.
+    Extra `handlers` (e.g. a TelemetryHandler) are fed by the same
+    listener thread.
+    """
+    numeric = _level_from_string(level)
+    console = _console_handler()
+    # The agent's console is its main sink: let DEBUG through when asked
+    console.setLevel(numeric)
+    _install([console, *handlers], numeric, readings_interval)
+
+
+def _console_handler() -> logging.Handler:
+    console = logging.StreamHandler()
+    console.setLevel(logging.INFO)
+    console.setFormatter(
+        logging.Formatter(fmt=CONSOLE_FORMAT, datefmt="%Y-%m-%dT%H:%M:%SZ")
+    )
+    return console
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -10,8 +10,11 @@ Features:
 - Structured JSON events
 - Non-blocking ingestion (queue)
 - Background worker thread
-- Batching for efficiency
-- Retry with exponential backoff
+- Batching by size or age (linger), no polling while idle
+- Retry with exponential backoff; flush on close
+- Optional gzip/zstd request bodies (app/wire.py), with fallback on 415
+- Optional disk spool (app/telemetry_spool.py): during outages and on
+  queue overflow events go to disk instead of being dropped
 - Graceful failure (never blocks ingestion)
 - Config-driven enable/disable
 """
@@ -20,16 +23,36 @@ import logging
 import queue
 import threading
 import time
-from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
-import requests
+from app.http_session import PooledSession, get_session
+from app.log_events import encode_events, record_to_event
+from app.telemetry_spool import DEFAULT_SPOOL_MAX_BYTES, TelemetrySpool
+from app.wire import BodyEncoder
+
+
+# Wakes a worker blocked on an empty queue
+_STOP = object()
 
 
 class TelemetryWorker(threading.Thread):
     """
     Background worker that drains the telemetry queue and sends batches
     to the configured telemetry endpoint.
+
+    Event-driven: it blocks on the queue while idle (no periodic wakeups).
+    After the first event it lingers up to `linger` seconds for more, so
+    a batch is sent when it reaches batch_size or its oldest event
+    reaches `linger` seconds, whichever comes first. Failed batches are
+    retried with exponential backoff. stop() drains and flushes the queue
+    within a timeout.
+
+    With a spool, a failed batch is appended to it instead of being
+    retried in memory. While the spool has a backlog, new events are
+    appended behind it (keeping FIFO order) and the worker sends from
+    the spool in batches, backing off while the endpoint stays down.
+    Events still unsent at stop() are left in the spool for the next
+    start.
     """
 
     def __init__(
@@ -39,6 +62,10 @@ class TelemetryWorker(threading.Thread):
         token: str,
         batch_size: int = 20,
         max_backoff: float = 30.0,
+        session: Optional[PooledSession] = None,
+        linger: float = 1.0,
+        spool: Optional[TelemetrySpool] = None,
+        content_encoding: str = "identity",
     ):
         super().__init__(daemon=True)
         self.q = q
@@ -46,51 +73,187 @@ class TelemetryWorker(threading.Thread):
         self.token = token
         self.batch_size = batch_size
         self.max_backoff = max_backoff
-        self._stop_flag = False
+        self.linger = linger
+        self.spool = spool
+        self._http = session or get_session()
+        self._wire = BodyEncoder(content_encoding)
+        self._stop_event = threading.Event()
+        self._flush_deadline = 0.0
+        self._pending: List[Dict[str, Any]] = []
+        self._backoff = 1.0
 
-    def stop(self) -> None:
-        self._stop_flag = True
+        # Counters (read-only for callers)
+        self.sent = 0
+        self.batches = 0
+        self.retried = 0
+        self.dropped = 0
+        self.spooled = 0
 
-    def run(self) -> None:
-        backoff = 1.0
+    def stats(self) -> Dict[str, int]:
+        stats = {
+            "sent": self.sent,
+            "batches": self.batches,
+            "retried": self.retried,
+            "dropped": self.dropped,
+            "queued": self.q.qsize(),
+        }
+        if self.spool is not None:
+            spool = self.spool.stats()
+            stats["spooled"] = self.spooled
+            stats["spool_pending"] = spool["pending"]
+            stats["spool_bytes"] = spool["bytes"]
+            stats["dropped"] += spool["dropped"]
+        wire = self._wire.stats()
+        stats["bytes_raw"] = wire["bytes_raw"]
+        stats["bytes_sent"] = wire["bytes_sent"]
+        return stats
 
-        while not self._stop_flag:
-            try:
-                batch = self._drain_batch()
-                if not batch:
-                    time.sleep(0.1)
-                    continue
+    def wire_stats(self) -> Dict[str, Any]:
+        """
+        Negotiated encoding and uncompressed vs sent body bytes.
+        """
+        return self._wire.stats()
+
+    def spill(self, events: List[Dict[str, Any]]) -> bool:
+        """
+        Append events to the spool. Returns False without a spool.
+        """
+        if self.spool is None or not events:
+            return False
+        self.spool.append(events)
+        self.spooled += len(events)
+        return True
+
+    def stop(self, timeout: float = 5.0) -> bool:
+        """
+        Flush queued events and stop, waiting up to `timeout` seconds.
+        Returns True if the worker finished in time.
+        """
+        self._flush_deadline = time.monotonic() + timeout
+        self._stop_event.set()
+        try:
+            self.q.put_nowait(_STOP)  # type: ignore[arg-type]
+        except queue.Full:
+            # Not idle, so it will see the stop flag on its own
+            pass
 
-                ok = self._send_batch(batch)
-                if ok:
-                    backoff = 1.0
-                else:
-                    time.sleep(backoff)
-                    backoff = min(backoff * 2, self.max_backoff)
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+        return not self.is_alive()
 
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                if self.spool is not None and len(self.spool):
+                    self._drain_spool()
+                    continue
+                batch = self._collect_batch()
+                if batch:
+                    self._deliver(batch)
             except Exception:
                 # Never crash the worker
-                time.sleep(1.0)
+                self._stop_event.wait(1.0)
 
-    def _drain_batch(self) -> List[Dict[str, Any]]:
-        items: list[dict[str, Any]] = []
-        try:
-            while len(items) < self.batch_size:
+        self._flush()
+
+    def _collect_batch(self) -> List[Dict[str, Any]]:
+        # Idle: block without a timeout until the first event (or stop)
+        item = self.q.get()
+        if item is _STOP:
+            return []
+
+        batch = [item]
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.q.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                break
+            batch.append(item)
+        return batch
+
+    def _deliver(self, batch: List[Dict[str, Any]]) -> None:
+        backoff = 1.0
+        while not self._send_batch(batch):
+            self.retried += 1
+            if self.spill(batch):
+                # Outage: the spool holds it; _drain_spool() retries
+                return
+            if self._stop_event.wait(backoff):
+                # Stopping: the final flush makes one more attempt
+                self._pending = batch
+                return
+            backoff = min(backoff * 2, self.max_backoff)
+
+        self.sent += len(batch)
+        self.batches += 1
+
+    def _drain_queue(self) -> List[Dict[str, Any]]:
+        events: List[Dict[str, Any]] = []
+        while True:
+            try:
                 item = self.q.get_nowait()
-                items.append(item)
-        except queue.Empty:
-            pass
-        return items
+            except queue.Empty:
+                return events
+            if item is not _STOP:
+                events.append(item)
+
+    def _drain_spool(self) -> None:
+        assert self.spool is not None
+        # Newer events queue up behind the backlog on disk
+        self.spill(self._drain_queue())
+
+        events, position = self.spool.read(self.batch_size)
+        if not events or self._send_batch(events):
+            self.spool.ack(position)
+            self.sent += len(events)
+            self.batches += 1 if events else 0
+            self._backoff = 1.0
+            return
+
+        self.retried += 1
+        self._stop_event.wait(self._backoff)
+        self._backoff = min(self._backoff * 2, self.max_backoff)
+
+    def _flush(self) -> None:
+        events = self._pending + self._drain_queue()
+        self._pending = []
+
+        if self.spool is not None:
+            # Keep everything for the next start rather than racing the
+            # deadline against the network
+            self.spill(events)
+            self.spool.close()
+            return
+
+        for start in range(0, len(events), self.batch_size):
+            batch = events[start : start + self.batch_size]
+            if time.monotonic() >= self._flush_deadline or not self._send_batch(batch):
+                self.dropped += len(events) - start
+                return
+            self.sent += len(batch)
+            self.batches += 1
 
     def _send_batch(self, batch: List[Dict[str, Any]]) -> bool:
         url = f"{self.base_url}/telemetry"
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-        }
+        headers = {"Authorization": f"Bearer {self.token}"}
 
         try:
-            resp = requests.post(url, json=batch, headers=headers, timeout=2.0)
+            # Shared encoder: extras that are not JSON-native are sent as
+            # strings instead of failing the whole batch
+            body = encode_events(batch)
+            resp = self._wire.post(
+                self._http,
+                url,
+                lambda: self._wire.encode(body),
+                headers=headers,
+                timeout=(self._http.connect_timeout, 2.0),
+            )
             return resp.status_code == 200
         except Exception:
             return False
@@ -107,6 +270,12 @@ class TelemetryHandler(logging.Handler):
         token: str,
         level: int = logging.INFO,
         batch_size: int = 20,
+        session: Optional[PooledSession] = None,
+        linger: float = 1.0,
+        flush_timeout: float = 5.0,
+        spool_dir: Optional[str] = None,
+        spool_max_bytes: int = DEFAULT_SPOOL_MAX_BYTES,
+        content_encoding: str = "identity",
     ):
         super().__init__(level)
 
@@ -118,7 +287,16 @@ class TelemetryHandler(logging.Handler):
             base_url=base_url,
             token=token,
             batch_size=batch_size,
+            session=session,
+            linger=linger,
+            spool=(
+                TelemetrySpool(spool_dir, max_bytes=spool_max_bytes)
+                if spool_dir
+                else None
+            ),
+            content_encoding=content_encoding,
         )
+        self.flush_timeout = flush_timeout
         self.worker.start()
 
     def emit(self, record: logging.LogRecord) -> None:
@@ -126,53 +304,29 @@ class TelemetryHandler(logging.Handler):
             event = self._record_to_event(record)
             self.q.put_nowait(event)
         except queue.Full:
-            # Drop telemetry if queue is full
-            pass
+            # Overflow to disk if spooling, else drop
+            try:
+                spilled = self.worker.spill([event])
+            except Exception:
+                spilled = False
+            if not spilled:
+                self.worker.dropped += 1
         except Exception:
             # Never break logging
             pass
 
     def _record_to_event(self, record: logging.LogRecord) -> Dict[str, Any]:
-        event: dict[str, Any] = {
-            "ts": datetime.utcnow().isoformat() + "Z",
-            "level": record.levelname.lower(),
-            "logger": record.name,
-            "msg": record.getMessage(),
-        }
+        return record_to_event(record)
+
+    def stats(self) -> Dict[str, int]:
+        return self.worker.stats()
 
-        # Include structured extras
-        for key, value in record.__dict__.items():
-            if key not in (
-                "args",
-                "asctime",
-                "created",
-                "exc_info",
-                "exc_text",
-                "filename",
-                "funcName",
-                "levelname",
-                "levelno",
-                "lineno",
-                "module",
-                "msecs",
-                "message",
-                "msg",
-                "name",
-                "pathname",
-                "process",
-                "processName",
-                "relativeCreated",
-                "stack_info",
-                "thread",
-                "threadName",
-            ):
-                event[key] = value
-
-        return event
+    def wire_stats(self) -> Dict[str, Any]:
+        return self.worker.wire_stats()
 
     def close(self) -> None:
         try:
-            self.worker.stop()
+            self.worker.stop(self.flush_timeout)
         except Exception:
             pass
         super().close()
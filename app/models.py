@@ -2,12 +2,33 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+# Column order of GeigerRecord.to_db_tuple() (geiger_readings insert)
+DB_INSERT_COLUMNS = (
+    "raw",
+    "counts_per_second",
+    "counts_per_minute",
+    "microsieverts_per_hour",
+    "mode",
+    "device_id",
+    "timestamp",
+    "pushed",
+)
 
-@dataclass
+# Column order of GeigerRecord.to_logexp_tuple()
+LOGEXP_FIELDS = (
+    "counts_per_second",
+    "counts_per_minute",
+    "microsieverts_per_hour",
+    "mode",
+    "device_id",
+)
+
+
+@dataclass(slots=True)
 class GeigerRecord:
     """
     Canonical local representation of a single Geiger reading in Pi-log.
@@ -27,6 +48,10 @@ class GeigerRecord:
         device_id: Logical identifier for this Pi-log node (e.g. "pi-log").
         timestamp: UTC timestamp recorded locally when the reading was created.
         pushed: Whether this reading has been successfully pushed to LogExp.
+
+    Slotted (no per-instance __dict__): millions of these are built when
+    replaying a backlog, so the serializers below build tuples/dicts
+    directly instead of going through dataclasses.asdict().
     """
 
     id: Optional[int]
@@ -43,9 +68,17 @@ class GeigerRecord:
     # Generic dict serializer (used by PushClient)
     # ------------------------------------------------------------
     def to_dict(self) -> Dict[str, Any]:
-        d = asdict(self)
-        d["timestamp"] = self.timestamp.isoformat()
-        return d
+        return {
+            "id": self.id,
+            "raw": self.raw,
+            "counts_per_second": self.counts_per_second,
+            "counts_per_minute": self.counts_per_minute,
+            "microsieverts_per_hour": self.microsieverts_per_hour,
+            "mode": self.mode,
+            "device_id": self.device_id,
+            "timestamp": self.timestamp.isoformat(),
+            "pushed": self.pushed,
+        }
 
     # ------------------------------------------------------------
     # Construct from parsed CSV
@@ -84,6 +117,18 @@ class GeigerRecord:
             "device_id": self.device_id,
         }
 
+    def to_logexp_tuple(self) -> Tuple[Any, ...]:
+        """
+        to_logexp_payload() values in LOGEXP_FIELDS order.
+        """
+        return (
+            self.counts_per_second,
+            self.counts_per_minute,
+            self.microsieverts_per_hour,
+            self.mode.upper(),
+            self.device_id,
+        )
+
     # ------------------------------------------------------------
     # SQLite row mapping
     # ------------------------------------------------------------
@@ -100,6 +145,47 @@ class GeigerRecord:
             "pushed": 1 if self.pushed else 0,
         }
 
+    def to_db_tuple(self) -> Tuple[Any, ...]:
+        """
+        Insert parameters in DB_INSERT_COLUMNS order.
+        """
+        return (
+            self.raw,
+            self.counts_per_second,
+            self.counts_per_minute,
+            self.microsieverts_per_hour,
+            self.mode,
+            self.device_id,
+            self.timestamp.isoformat(),
+            1 if self.pushed else 0,
+        )
+
+    @classmethod
+    def from_db_tuple(cls, row: Tuple[Any, ...]) -> GeigerRecord:
+        """
+        Build from a (id, raw, cps, cpm, usv, mode, device_id, timestamp,
+        pushed) row tuple, as selected by sqlite_store.
+        """
+        id_, raw, cps, cpm, usv, mode, device_id, ts_raw, pushed = row
+
+        timestamp = (
+            datetime.fromisoformat(ts_raw)
+            if isinstance(ts_raw, str)
+            else datetime.now(timezone.utc)
+        )
+
+        return cls(
+            id_,
+            raw,
+            int(cps),
+            int(cpm),
+            float(usv),
+            mode,
+            device_id,
+            timestamp,
+            bool(pushed),
+        )
+
     @classmethod
     def from_db_row(cls, row: dict[str, Any]) -> GeigerRecord:
         ts_raw = row.get("timestamp")
@@ -0,0 +1,276 @@
+# filename: app/recent_readings.py
+
+"""
+Columnar in-memory ring buffer of the most recent readings, for the API.
+
+Dashboards poll /readings/latest and /readings every second, and the
+answer is almost always the last few rows. RecentReadingsCache keeps the
+last `capacity` rows in fixed-size parallel columns (array for numbers,
+preallocated lists for strings) and serves those queries from memory.
+
+New rows are written by the ingestion process, so the cache polls
+PRAGMA data_version on its own read-only connection. The pragma only
+reads the WAL index in shared memory. When it changes, rows above the
+cached high-water id are appended. Between writes a request costs one
+pragma and no page reads.
+
+With the agent's live feed, the pragma is skipped while the feed says no
+newer row exists. The feed is only trusted while it is moving (its max
+id changed within feed_max_age seconds) and SQLite was checked within
+the same window, so a leftover feed file or a writer that does not
+publish (a backfill, a second agent) is seen within feed_max_age.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, List, Optional
+
+from app.sqlite_store import connect
+
+# 6 hours at the MightyOhm's 1 Hz output
+DEFAULT_CAPACITY = 6 * 3600
+
+# Seconds a live feed hint is trusted without confirming against SQLite
+FEED_MAX_AGE = 2.0
+
+_SELECT_AFTER_SQL = """
+SELECT id, raw, counts_per_second, counts_per_minute,
+       microsieverts_per_hour, mode, device_id, timestamp
+FROM geiger_readings
+WHERE id > ?
+ORDER BY id DESC
+LIMIT ?
+"""
+
+
+class RecentReadingsCache:
+    """
+    Fixed-capacity ring of the newest readings, oldest evicted first.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        capacity: int = DEFAULT_CAPACITY,
+        refresh_interval: float = 0.0,
+        published_max_id: Optional[Callable[[], Optional[int]]] = None,
+        feed_max_age: float = FEED_MAX_AGE,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+
+        self.db_path = db_path
+        self.capacity = capacity
+        self.refresh_interval = refresh_interval
+        # Highest row id announced by the agent's live feed, if available
+        self.published_max_id = published_max_id
+        self.feed_max_age = feed_max_age
+
+        # Numeric columns
+        self._ids = array("q", bytes(8 * capacity))
+        self._cps = array("q", bytes(8 * capacity))
+        self._cpm = array("q", bytes(8 * capacity))
+        self._usv = array("d", bytes(8 * capacity))
+        self._mode = array("H", bytes(2 * capacity))
+        # 1 where a row's timestamp is older than its predecessor's
+        self._inverted = array("B", bytes(capacity))
+
+        # String columns (preallocated, overwritten in place)
+        self._timestamps: List[Optional[str]] = [None] * capacity
+        self._raws: List[Optional[str]] = [None] * capacity
+        self._devices: List[Optional[str]] = [None] * capacity
+
+        # Mode dictionary encoding: code -> mode string
+        self._mode_names: List[str] = []
+        self._mode_codes: Dict[str, int] = {}
+
+        self._head = 0  # next slot to write
+        self._size = 0
+        self._high_water = 0
+
+        # Inverted rows in the ring; while > 0, id order differs from the
+        # API's (timestamp, id) order and recent() defers to SQLite
+        self._inversions = 0
+        self._last_timestamp = ""
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self._last_check = 0.0
+        # Last feed value seen, when it last changed, last SQLite check
+        self._published: Optional[int] = None
+        self._published_at = float("-inf")
+        self._verified_at = float("-inf")
+
+        # Counters (read-only for callers)
+        self.refreshes = 0
+        self.rows_loaded = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._refresh_locked()
+            if self._size == 0:
+                return None
+            return self._reading((self._head - 1) % self.capacity)
+
+    def high_water_id(self) -> int:
+        """
+        Highest row id committed so far (0 when empty).
+        """
+        with self._lock:
+            self._refresh_locked()
+            return self._high_water
+
+    def recent(self, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Newest `limit` readings, newest first, in the same order as the
+        SQLite query (timestamp DESC, id DESC).
+
+        Returns None when the cache cannot answer exactly: more rows
+        requested than cached, or out-of-order timestamps in the window.
+        """
+        with self._lock:
+            self._refresh_locked()
+            if self._inversions:
+                return None
+            if limit > self._size and self._size == self.capacity:
+                return None
+
+            n = min(limit, self._size)
+            cap = self.capacity
+            head = self._head
+            return [self._reading((head - 1 - i) % cap) for i in range(n)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": self._size,
+                "capacity": self.capacity,
+                "high_water_id": self._high_water,
+                "refreshes": self.refreshes,
+                "rows_loaded": self.rows_loaded,
+            }
+
+    # ------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------
+
+    def _reading(self, slot: int) -> Dict[str, Any]:
+        return {
+            "id": self._ids[slot],
+            "raw": self._raws[slot],
+            "cps": self._cps[slot],
+            "cpm": self._cpm[slot],
+            "mode": self._mode_names[self._mode[slot]],
+            "device_id": self._devices[slot],
+            "timestamp": self._timestamps[slot],
+        }
+
+    def _refresh_locked(self) -> None:
+        now = time.monotonic()
+        if self.refresh_interval and now - self._last_check < self.refresh_interval:
+            return
+        self._last_check = now
+
+        if self._feed_says_current(now):
+            # Live feed says nothing newer exists: skip SQLite entirely
+            return
+
+        if self._conn is None:
+            self._conn = connect(self.db_path, read_only=True)
+
+        (version,) = self._conn.execute("PRAGMA data_version").fetchone()
+        self._verified_at = now
+        if version == self._data_version:
+            return
+        self._data_version = version
+
+        rows = self._conn.execute(
+            _SELECT_AFTER_SQL, (self._high_water, self.capacity)
+        ).fetchall()
+        if not rows:
+            return
+
+        if len(rows) >= self.capacity:
+            # Fell a whole ring behind: rows below would leave a gap
+            self._reset_locked()
+
+        for row in reversed(rows):
+            self._append_locked(row)
+
+        self.refreshes += 1
+        self.rows_loaded += len(rows)
+
+    def _feed_says_current(self, now: float) -> bool:
+        published_max_id = self.published_max_id
+        if published_max_id is None:
+            return False
+
+        published = published_max_id()
+        if published != self._published:
+            if self._published is not None:
+                # Moved since we last looked: a live agent is publishing
+                self._published_at = now
+            self._published = published
+
+        return (
+            published is not None
+            and published <= self._high_water
+            and now - self._published_at < self.feed_max_age
+            and now - self._verified_at < self.feed_max_age
+        )
+
+    def _reset_locked(self) -> None:
+        self._head = 0
+        self._size = 0
+        self._inversions = 0
+        self._last_timestamp = ""
+        self._inverted = array("B", bytes(self.capacity))
+
+    def _append_locked(self, row: tuple) -> None:
+        id_, raw, cps, cpm, usv, mode, device_id, timestamp = row
+        slot = self._head
+
+        code = self._mode_codes.get(mode)
+        if code is None:
+            code = self._mode_codes[mode] = len(self._mode_names)
+            self._mode_names.append(mode)
+
+        self._ids[slot] = id_
+        self._cps[slot] = int(cps)
+        self._cpm[slot] = int(cpm)
+        self._usv[slot] = float(usv)
+        self._mode[slot] = code
+        self._timestamps[slot] = timestamp
+        self._raws[slot] = raw
+        self._devices[slot] = device_id
+
+        inverted = 1 if timestamp < self._last_timestamp else 0
+        if self._size == self.capacity:
+            # Overwriting the oldest row
+            self._inversions -= self._inverted[slot]
+        self._inverted[slot] = inverted
+        self._inversions += inverted
+        self._last_timestamp = timestamp
+
+        self._head = (slot + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        self._high_water = id_
@@ -2,12 +2,30 @@
 
 from __future__ import annotations
 
+import logging
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import List
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from app.models import GeigerRecord
 
+log = logging.getLogger(__name__)
+
 
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS geiger_readings (
@@ -23,131 +41,827 @@ CREATE TABLE IF NOT EXISTS geiger_readings (
 );
 """
 
+# Commit deadline used with commit_max_rows > 1 unless one is given
+DEFAULT_COMMIT_MAX_DELAY_MS = 1000.0
+
+# Rollup resolutions: name -> bucket width in seconds
+ROLLUP_BUCKETS: Dict[str, int] = {"1m": 60, "1h": 3600, "1d": 86400}
+
+# Unix seconds for a stored ISO timestamp (falls back to "now" like
+# GeigerRecord.from_db_tuple does for unparseable values)
+_EPOCH_SQL = (
+    "COALESCE(CAST(strftime('%s', {}) AS INTEGER), "
+    "CAST(strftime('%s', 'now') AS INTEGER))"
+)
+
+# Versioned schema migrations, tracked in PRAGMA user_version.
+# Each entry is (version, statements); append new versions, never edit old.
+MIGRATIONS: Sequence[Tuple[int, Sequence[str]]] = (
+    (
+        1,
+        (
+            # Partial index: only unpushed rows are indexed, so finding
+            # pending work costs O(log backlog) instead of a table scan.
+            """
+            CREATE INDEX IF NOT EXISTS idx_geiger_readings_unpushed
+            ON geiger_readings (id)
+            WHERE pushed = 0
+            """,
+        ),
+    ),
+    (
+        2,
+        (
+            # Time-window and cursor queries on /readings. The implicit
+            # rowid suffix gives (timestamp, id) order without a sort step.
+            """
+            CREATE INDEX IF NOT EXISTS idx_geiger_readings_timestamp
+            ON geiger_readings (timestamp)
+            """,
+        ),
+    ),
+    (
+        3,
+        (
+            # Per-bucket CPM / uSv/h aggregates, maintained on insert
+            """
+            CREATE TABLE IF NOT EXISTS geiger_rollups (
+                bucket_seconds INTEGER NOT NULL,
+                bucket_start INTEGER NOT NULL,
+                device_id TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                cpm_sum REAL NOT NULL,
+                cpm_min REAL NOT NULL,
+                cpm_max REAL NOT NULL,
+                usv_sum REAL NOT NULL,
+                usv_min REAL NOT NULL,
+                usv_max REAL NOT NULL,
+                PRIMARY KEY (bucket_seconds, bucket_start, device_id)
+            ) WITHOUT ROWID
+            """,
+            # Rows that existed before rollups are backfilled afterwards in
+            # id-range chunks (see backfill_rollups); newer rows are rolled
+            # up on insert
+            """
+            CREATE TABLE IF NOT EXISTS geiger_rollups_backfill (
+                next_id INTEGER NOT NULL,
+                upper_id INTEGER NOT NULL
+            )
+            """,
+            """
+            INSERT INTO geiger_rollups_backfill (next_id, upper_id)
+            SELECT 0, COALESCE(MAX(id), 0) FROM geiger_readings
+            """,
+        ),
+    ),
+)
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# Rows rolled up per backfill transaction: bounds both how long the write
+# lock is held and the size of the GROUP BY sorter (temp_store=MEMORY)
+ROLLUP_BACKFILL_CHUNK = 20000
+
+_ROLLUP_BACKFILL_SQL = tuple(
+    f"""
+    INSERT INTO geiger_rollups
+    SELECT
+        {width},
+        ({_EPOCH_SQL.format("timestamp")} / {width}) * {width},
+        device_id,
+        COUNT(*),
+        SUM(counts_per_minute),
+        MIN(counts_per_minute),
+        MAX(counts_per_minute),
+        SUM(microsieverts_per_hour),
+        MIN(microsieverts_per_hour),
+        MAX(microsieverts_per_hour)
+    FROM geiger_readings
+    WHERE id > ? AND id <= ?
+    GROUP BY 2, device_id
+    ON CONFLICT (bucket_seconds, bucket_start, device_id) DO UPDATE SET
+        count = count + excluded.count,
+        cpm_sum = cpm_sum + excluded.cpm_sum,
+        cpm_min = MIN(cpm_min, excluded.cpm_min),
+        cpm_max = MAX(cpm_max, excluded.cpm_max),
+        usv_sum = usv_sum + excluded.usv_sum,
+        usv_min = MIN(usv_min, excluded.usv_min),
+        usv_max = MAX(usv_max, excluded.usv_max)
+    """
+    for width in ROLLUP_BUCKETS.values()
+)
+
+# Largest SQLite INTEGER PRIMARY KEY
+_MAX_ROW_ID = (1 << 63) - 1
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+    return int(version)
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Bring an existing database up to SCHEMA_VERSION.
+
+    Each pending migration runs in its own write transaction together with
+    the user_version bump, so a crash mid-migration leaves the database at
+    the previous version. A pending rollup backfill is then run (or
+    resumed). Returns the resulting schema version.
+    """
+    for version, statements in MIGRATIONS:
+        if get_schema_version(conn) >= version:
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the lock
+            if get_schema_version(conn) < version:
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    backfill_rollups(conn)
+    return get_schema_version(conn)
+
+
+def backfill_rollups(
+    conn: sqlite3.Connection, chunk_rows: int = ROLLUP_BACKFILL_CHUNK
+) -> int:
+    """
+    Roll up rows stored before geiger_rollups existed, one id range of
+    chunk_rows per write transaction.
+
+    Progress is kept in geiger_rollups_backfill and advanced in the same
+    transaction as each chunk, so the write lock is only held briefly
+    and an interrupted backfill resumes where it stopped. Returns the
+    number of chunks committed.
+    """
+    chunks = 0
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Read inside the transaction: another process may be
+            # backfilling too
+            progress = conn.execute(
+                "SELECT next_id, upper_id FROM geiger_rollups_backfill"
+            ).fetchone()
+            if progress is None:
+                conn.commit()
+                return chunks
+
+            next_id, upper_id = progress
+            if next_id >= upper_id:
+                conn.execute("DELETE FROM geiger_rollups_backfill")
+                conn.commit()
+                return chunks
+
+            end_id = min(next_id + chunk_rows, upper_id)
+            for statement in _ROLLUP_BACKFILL_SQL:
+                conn.execute(statement, (next_id, end_id))
+            conn.execute("UPDATE geiger_rollups_backfill SET next_id = ?", (end_id,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        chunks += 1
+
+
+# Connection tuning applied to every connection we open.
+# cache_size is negative => KiB; mmap_size is bytes.
+CONNECTION_PRAGMAS: Sequence[Tuple[str, Any]] = (
+    ("synchronous", "NORMAL"),
+    ("cache_size", -8192),
+    ("mmap_size", 32 * 1024 * 1024),
+    ("temp_store", "MEMORY"),
+    ("busy_timeout", 5000),
+)
+
+# sqlite3 caches compiled statements per connection, keyed by SQL text
+STATEMENT_CACHE_SIZE = 256
+
+_INSERT_SQL = """
+INSERT INTO geiger_readings (
+    raw,
+    counts_per_second,
+    counts_per_minute,
+    microsieverts_per_hour,
+    mode,
+    device_id,
+    timestamp,
+    pushed
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SELECT_COLUMNS = """
+SELECT
+    id,
+    raw,
+    counts_per_second,
+    counts_per_minute,
+    microsieverts_per_hour,
+    mode,
+    device_id,
+    timestamp,
+    pushed
+FROM geiger_readings
+"""
+
+_SELECT_UNPUSHED_SQL = (
+    _SELECT_COLUMNS
+    + """
+WHERE pushed = 0
+ORDER BY id ASC
+"""
+)
+
+_SELECT_UNPUSHED_PAGE_SQL = (
+    _SELECT_COLUMNS
+    + """
+WHERE pushed = 0
+  AND id > ?
+  AND id <= ?
+ORDER BY id ASC
+LIMIT ?
+"""
+)
+
+_MARK_PUSHED_SQL = "UPDATE geiger_readings SET pushed = 1 WHERE id = ?"
+
+_ROLLUP_UPSERT_SQL = f"""
+INSERT INTO geiger_rollups (
+    bucket_seconds, bucket_start, device_id, count,
+    cpm_sum, cpm_min, cpm_max, usv_sum, usv_min, usv_max
+) VALUES (?, ({_EPOCH_SQL.format("?")} / ?) * ?, ?, 1, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (bucket_seconds, bucket_start, device_id) DO UPDATE SET
+    count = count + 1,
+    cpm_sum = cpm_sum + excluded.cpm_sum,
+    cpm_min = MIN(cpm_min, excluded.cpm_min),
+    cpm_max = MAX(cpm_max, excluded.cpm_max),
+    usv_sum = usv_sum + excluded.usv_sum,
+    usv_min = MIN(usv_min, excluded.usv_min),
+    usv_max = MAX(usv_max, excluded.usv_max)
+"""
+
+
+def connect(
+    db_path: str, read_only: bool = False, wal: bool = True
+) -> sqlite3.Connection:
+    """
+    Open a connection with the canonical pragmas applied.
+
+    Read-only connections use a `mode=ro` URI and never change the
+    journal mode (which would require a write).
+    """
+    if read_only:
+        conn = sqlite3.connect(
+            f"file:{db_path}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+    else:
+        conn = sqlite3.connect(
+            db_path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        if wal:
+            conn.execute("PRAGMA journal_mode=WAL")
+
+    for name, value in CONNECTION_PRAGMAS:
+        conn.execute(f"PRAGMA {name}={value}")
+
+    return conn
+
 
 def initialize_db(db_path: str) -> None:
     """
-    Initialize the SQLite database with the canonical schema only.
+    Initialize the SQLite database with the canonical schema and apply
+    any pending migrations.
     """
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
     try:
         conn.execute(SCHEMA)
         conn.commit()
+        migrate(conn)
     finally:
         conn.close()
 
 
-def insert_record(db_path: str, record: GeigerRecord) -> None:
+def as_utc(value: datetime) -> datetime:
     """
-    Insert a new GeigerRecord into the canonical geiger_readings table.
+    Convert to an aware UTC datetime; naive values are taken to be UTC.
     """
-    conn = sqlite3.connect(db_path)
-    try:
-        conn.execute(
-            """
-            INSERT INTO geiger_readings (
-                raw,
-                counts_per_second,
-                counts_per_minute,
-                microsieverts_per_hour,
-                mode,
-                device_id,
-                timestamp,
-                pushed
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                record.raw,
-                record.counts_per_second,
-                record.counts_per_minute,
-                record.microsieverts_per_hour,
-                record.mode,
-                record.device_id,
-                record.timestamp.isoformat(),
-                1 if record.pushed else 0,
-            ),
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def utc_isoformat(value: datetime) -> str:
+    """
+    Normalise a datetime to the stored timestamp format (UTC ISO 8601),
+    so it compares correctly against the timestamp column.
+    """
+    return as_utc(value).isoformat()
+
+
+# ----------------------------------------------------------------------
+# Group commit
+# ----------------------------------------------------------------------
+
+
+class GroupCommitWriter:
+    """
+    Group-commit wrapper around a single SQLite write connection.
+
+    Inserts and pushed-flag updates execute immediately inside one open
+    transaction, but the COMMIT (and its fsync) is deferred until either
+    `max_rows` rows are pending or the oldest pending write is
+    `max_delay_ms` old. A background flusher enforces the time bound even
+    when no new writes arrive.
+
+    Durability trade-off: at most `max_rows` inserted rows (and never more
+    than `max_delay_ms` worth of readings) can be lost on power failure.
+    `pending_rows` reports the current exposure. max_rows=1 restores
+    commit-per-write behaviour; max_rows > 1 requires a max_delay_ms
+    bound.
+
+    after_commit() callbacks run (on whichever thread commits, with the
+    writer lock held) once the writes before them are durable, so data
+    is only published outside SQLite after it has been committed.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        max_rows: int = 1,
+        max_delay_ms: float = 0.0,
+    ) -> None:
+        if max_rows < 1:
+            raise ValueError("max_rows must be >= 1")
+        if max_rows > 1 and max_delay_ms <= 0:
+            # Without a time bound the transaction (and the write lock)
+            # stays open until max_rows arrive, however long that takes
+            raise ValueError("max_rows > 1 requires max_delay_ms > 0")
+
+        self._conn = conn
+        self.max_rows = max_rows
+        self.max_delay = max(max_delay_ms, 0.0) / 1000.0
+
+        self.lock = threading.RLock()
+        self._cond = threading.Condition(self.lock)
+        self._pending_rows = 0
+        self._pending_updates = 0
+        self._pending_since: Optional[float] = None
+        self._deferred = 0
+        self._closed = False
+        self._on_commit: List[Callable[[], None]] = []
+
+        # Counters (read-only for callers)
+        self.commits = 0
+        self.rows_committed = 0
+
+        self._flusher: Optional[threading.Thread] = None
+        if self.max_rows > 1 and self.max_delay > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, daemon=True, name="sqlite-group-commit"
+            )
+            self._flusher.start()
+
+    # ------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------
+
+    def insert(self, sql: str, params: Sequence[Any]) -> int:
+        """
+        Execute an INSERT in the open transaction and return its row id.
+        """
+        with self._cond:
+            cur = self._conn.execute(sql, params)
+            rowid = cur.lastrowid
+            assert rowid is not None
+            self._pending_rows += 1
+            self._after_write()
+            return rowid
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> None:
+        """
+        Execute a non-insert write (e.g. pushed-flag update) in the open
+        transaction.
+        """
+        with self._cond:
+            self._conn.execute(sql, params)
+            self._pending_updates += 1
+            self._after_write()
+
+    def executemany(self, sql: str, seq: Sequence[Sequence[Any]]) -> None:
+        if not seq:
+            return
+        with self._cond:
+            self._conn.executemany(sql, seq)
+            self._pending_updates += len(seq)
+            self._after_write()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Run callback once the open transaction commits; right away if
+        nothing is pending.
+        """
+        with self._cond:
+            if self._pending_since is not None:
+                self._on_commit.append(callback)
+                return
+        self._run_callbacks([callback])
+
+    @contextmanager
+    def deferred(self) -> Iterator[None]:
+        """
+        Hold the writer and postpone the commit decision until the block
+        exits, so several statements land in the same transaction.
+        Statements run directly on the connection inside the block are
+        committed with the rest but do not count towards max_rows.
+        """
+        with self._cond:
+            self._deferred += 1
+            try:
+                yield
+            finally:
+                self._deferred -= 1
+            if self._deferred == 0 and self._pending_since is not None:
+                self._after_write()
+
+    def flush(self) -> None:
+        """
+        Commit everything pending now.
+        """
+        with self._cond:
+            self._commit_locked()
+
+    def close(self) -> None:
+        with self._cond:
+            self._commit_locked()
+            self._closed = True
+            self._cond.notify_all()
+        if self._flusher is not None:
+            self._flusher.join(timeout=5.0)
+
+    # ------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------
+
+    @property
+    def pending_rows(self) -> int:
+        """
+        Inserted rows not yet committed, i.e. rows lost on power failure now.
+        """
+        with self._cond:
+            return self._pending_rows
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "commits": self.commits,
+                "rows_committed": self.rows_committed,
+                "pending_rows": self._pending_rows,
+                "pending_updates": self._pending_updates,
+                "max_rows_at_risk": self.max_rows,
+                "max_delay_ms": self.max_delay * 1000.0,
+            }
+
+    # ------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------
+
+    def _after_write(self) -> None:
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+            self._cond.notify_all()
+
+        if self._deferred:
+            return
+
+        due = self._pending_rows + self._pending_updates >= self.max_rows
+        if self.max_delay > 0 and (
+            time.monotonic() - self._pending_since >= self.max_delay
+        ):
+            due = True
+
+        if due:
+            self._commit_locked()
+
+    def _commit_locked(self) -> None:
+        if self._pending_since is None:
+            return
+        self._conn.commit()
+        self.commits += 1
+        self.rows_committed += self._pending_rows
+        self._pending_rows = 0
+        self._pending_updates = 0
+        self._pending_since = None
+
+        callbacks, self._on_commit = self._on_commit, []
+        self._run_callbacks(callbacks)
+
+    def _run_callbacks(self, callbacks: List[Callable[[], None]]) -> None:
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as exc:
+                # A failing subscriber must not undo or stall the commit
+                log.warning("after_commit_failed", extra={"error": repr(exc)})
+
+    def _flush_loop(self) -> None:
+        with self._cond:
+            while not self._closed:
+                if self._pending_since is None:
+                    self._cond.wait()
+                    continue
+
+                remaining = self._pending_since + self.max_delay - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+
+                try:
+                    self._commit_locked()
+                except Exception:
+                    # Retry on the next deadline; never kill the flusher
+                    self._cond.wait(self.max_delay)
+
+
+# ----------------------------------------------------------------------
+# Store object
+# ----------------------------------------------------------------------
+
+
+class SQLiteStore:
+    """
+    Owns one long-lived, tuned connection to the readings database.
+
+    All writes go through a GroupCommitWriter (commit-per-write unless
+    commit_max_rows / commit_max_delay_ms say otherwise), which also
+    serialises access from multiple threads. Statements are module-level
+    constants so sqlite3's per-connection statement cache reuses them.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        commit_max_rows: int = 1,
+        commit_max_delay_ms: float = DEFAULT_COMMIT_MAX_DELAY_MS,
+    ) -> None:
+        self.db_path = db_path
+        initialize_db(db_path)
+
+        self.conn = connect(db_path)
+        self.writer = GroupCommitWriter(
+            self.conn,
+            max_rows=commit_max_rows,
+            max_delay_ms=commit_max_delay_ms,
         )
-        conn.commit()
-    finally:
-        conn.close()
+        self._lock = self.writer.lock
+
+    # ------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------
+
+    def insert_row(
+        self,
+        row: Sequence[Any],
+        on_commit: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Insert a row tuple in _INSERT_SQL column order; returns its id.
+
+        The geiger_rollups buckets for the row are updated in the same
+        transaction, so aggregates never disagree with committed rows.
+        on_commit(row_id) runs once the row is committed (see
+        GroupCommitWriter.after_commit).
+        """
+        _raw, _cps, cpm, usv, _mode, device_id, timestamp, _pushed = row
+        rollup_params = [
+            (width, timestamp, width, width, device_id, cpm, cpm, cpm, usv, usv, usv)
+            for width in ROLLUP_BUCKETS.values()
+        ]
+        with self.writer.deferred():
+            row_id = self.writer.insert(_INSERT_SQL, row)
+            self.conn.executemany(_ROLLUP_UPSERT_SQL, rollup_params)
+            if on_commit is not None:
+                self.writer.after_commit(partial(on_commit, row_id))
+        return row_id
+
+    def insert_record(self, record: GeigerRecord) -> int:
+        return self.insert_row(record.to_db_tuple())
+
+    def mark_records_pushed(self, ids: List[int]) -> None:
+        if not ids:
+            return
+        self.writer.executemany(_MARK_PUSHED_SQL, [(i,) for i in ids])
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+    # ------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------
+
+    def max_id(self) -> int:
+        with self._lock:
+            (max_id,) = self.conn.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM geiger_readings"
+            ).fetchone()
+        return int(max_id)
+
+    def get_unpushed_records(self) -> List[GeigerRecord]:
+        with self._lock:
+            rows = self.conn.execute(_SELECT_UNPUSHED_SQL).fetchall()
+        return [GeigerRecord.from_db_tuple(row) for row in rows]
+
+    def iter_unpushed_pages(
+        self,
+        page_size: int = 500,
+        after_id: int = 0,
+        max_id: Optional[int] = None,
+    ) -> Generator[List[GeigerRecord], None, None]:
+        """
+        Stream unpushed records in id order, one page at a time.
+
+        Uses keyset pagination (`id > last_seen_id`) rather than OFFSET, so
+        each page is a fresh bounded query and memory stays at one page no
+        matter how large the backlog is. Rows with id > max_id are ignored.
+        The store lock is only held while a page is fetched.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be >= 1")
+
+        upper = max_id if max_id is not None else _MAX_ROW_ID
+        last_id = after_id
+
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    _SELECT_UNPUSHED_PAGE_SQL, (last_id, upper, page_size)
+                ).fetchall()
+
+            if not rows:
+                return
+
+            last_id = rows[-1][0]
+            yield [GeigerRecord.from_db_tuple(row) for row in rows]
+
+            if len(rows) < page_size:
+                return
+
+    # ------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        return self.writer.stats()
+
+    def close(self) -> None:
+        self.writer.close()
+        self.conn.close()
+
 
+class ReadOnlyPool:
+    """
+    Small pool of read-only (`mode=ro`) connections for concurrent readers.
+
+    WAL lets these readers run alongside the ingestion writer without
+    blocking it, and a read-only connection can never write to the file.
+    Connections are opened lazily up to `size`; callers beyond that wait
+    up to `timeout` seconds for one to be returned.
+    """
+
+    def __init__(self, db_path: str, size: int = 4, timeout: float = 5.0) -> None:
+        if size < 1:
+            raise ValueError("size must be >= 1")
+
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._acquire()
+        try:
+            yield conn
+        except sqlite3.DatabaseError:
+            # Don't hand a possibly broken connection to the next caller
+            self._discard(conn)
+            raise
+        else:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+
+        if can_open:
+            try:
+                return connect(self.db_path, read_only=True)
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("read pool exhausted") from None
 
-def _row_to_record(row: tuple) -> GeigerRecord:
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        finally:
+            with self._lock:
+                self._opened -= 1
+
+
+_stores: Dict[str, SQLiteStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(db_path: str) -> SQLiteStore:
     """
-    Convert a SQLite row tuple into a GeigerRecord.
+    Return the shared, commit-per-write SQLiteStore for db_path.
     """
-    (
-        id_,
-        raw,
-        cps,
-        cpm,
-        usv,
-        mode,
-        device_id,
-        ts_raw,
-        pushed,
-    ) = row
-
-    timestamp = (
-        datetime.fromisoformat(ts_raw)
-        if isinstance(ts_raw, str)
-        else datetime.now(timezone.utc)
-    )
-
-    return GeigerRecord(
-        id=id_,
-        raw=raw,
-        counts_per_second=int(cps),
-        counts_per_minute=int(cpm),
-        microsieverts_per_hour=float(usv),
-        mode=mode,
-        device_id=device_id,
-        timestamp=timestamp,
-        pushed=bool(pushed),
-    )
+    with _stores_lock:
+        store = _stores.get(db_path)
+        if store is None:
+            store = SQLiteStore(db_path)
+            _stores[db_path] = store
+        return store
+
+
+def close_stores() -> None:
+    """
+    Close every shared store (tests, shutdown).
+    """
+    with _stores_lock:
+        for store in _stores.values():
+            store.close()
+        _stores.clear()
+
+
+# ----------------------------------------------------------------------
+# Module-level API (thin wrappers over the shared store)
+# ----------------------------------------------------------------------
+
+
+def insert_record(db_path: str, record: GeigerRecord) -> None:
+    """
+    Insert a new GeigerRecord into the canonical geiger_readings table.
+    """
+    get_store(db_path).insert_record(record)
 
 
 def get_unpushed_records(db_path: str) -> List[GeigerRecord]:
     """
     Return all canonical records where pushed == 0.
     """
-    conn = sqlite3.connect(db_path)
-    try:
-        cursor = conn.execute(
-            """
-            SELECT
-                id,
-                raw,
-                counts_per_second,
-                counts_per_minute,
-                microsieverts_per_hour,
-                mode,
-                device_id,
-                timestamp,
-                pushed
-            FROM geiger_readings
-            WHERE pushed = 0
-            ORDER BY id ASC
-            """
-        )
-        rows = cursor.fetchall()
-        return [_row_to_record(row) for row in rows]
-    finally:
-        conn.close()
+    return get_store(db_path).get_unpushed_records()
+
+
+def iter_unpushed_pages(
+    db_path: str,
+    page_size: int = 500,
+    after_id: int = 0,
+    max_id: Optional[int] = None,
+) -> Generator[List[GeigerRecord], None, None]:
+    """
+    Stream unpushed records in id-ordered pages (see SQLiteStore).
+    """
+    return get_store(db_path).iter_unpushed_pages(page_size, after_id, max_id)
 
 
 def mark_records_pushed(db_path: str, ids: List[int]) -> None:
     """
     Mark the given canonical record IDs as pushed.
     """
-    if not ids:
-        return
-
-    conn = sqlite3.connect(db_path)
-    try:
-        conn.executemany(
-            "UPDATE geiger_readings SET pushed = 1 WHERE id = ?",
-            [(i,) for i in ids],
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    get_store(db_path).mark_records_pushed(ids)
@@ -0,0 +1,303 @@
+# filename: app/telemetry_spool.py
+
+"""
+Disk-backed spool for telemetry events.
+
+When the telemetry endpoint is unreachable, or the in-memory queue is
+full, events are appended here instead of being dropped. The worker
+drains the spool in batches once the endpoint is back.
+
+Layout (one directory per spool):
+
+    0000000001.seg   one JSON event per line, append-only
+    0000000002.seg   a new segment starts once the tail reaches
+                     segment_bytes
+    cursor           "<segment> <offset>" of the first unsent event
+
+- read() returns up to n events from the cursor without moving it;
+  ack() moves it once the batch was delivered, so a crash or failed
+  send resends rather than loses events
+- compaction: segments behind the cursor are deleted on ack(), and a
+  fully drained spool is reset to a single empty segment
+- disk use is capped at max_bytes: past it, the oldest segment is
+  deleted and its events are counted as dropped
+- a torn last line (crash mid-write) is truncated on open; lines that
+  do not decode are skipped and counted as corrupt
+
+Only a bounded batch is ever held in memory.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Tuple
+
+from app.log_events import encode_event
+
+SEGMENT_SUFFIX = ".seg"
+CURSOR_FILE = "cursor"
+
+# 64 MiB: several hundred thousand events
+DEFAULT_SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+# (segment number, byte offset)
+Position = Tuple[int, int]
+
+
+def _segment_name(number: int) -> str:
+    return f"{number:010d}{SEGMENT_SUFFIX}"
+
+
+def _count_lines(path: str, offset: int = 0) -> int:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return sum(1 for _ in f)
+
+
+class TelemetrySpool:
+    """
+    Append-only, segmented on-disk queue of telemetry events.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 1024 * 1024,
+        max_bytes: int = DEFAULT_SPOOL_MAX_BYTES,
+    ) -> None:
+        if segment_bytes < 1:
+            raise ValueError("segment_bytes must be >= 1")
+        if max_bytes < segment_bytes:
+            raise ValueError("max_bytes must be >= segment_bytes")
+
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._segments: List[int] = []
+        self._sizes: Dict[int, int] = {}
+        self._tail: Optional[BinaryIO] = None
+        self._cursor: Position = (0, 0)
+        self._pending = 0
+
+        # Counters (read-only for callers)
+        self.appended = 0
+        self.acked = 0
+        self.dropped = 0
+        self.corrupt = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._open()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._pending
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "segments": len(self._segments),
+                "bytes": sum(self._sizes.values()),
+                "appended": self.appended,
+                "acked": self.acked,
+                "dropped": self.dropped,
+                "corrupt": self.corrupt,
+            }
+
+    # ------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------
+
+    def append(self, events: Sequence[Dict[str, Any]]) -> None:
+        if not events:
+            return
+        data = b"".join(encode_event(e) + b"\n" for e in events)
+
+        with self._lock:
+            if self._sizes[self._segments[-1]] >= self.segment_bytes:
+                self._roll()
+            assert self._tail is not None
+            self._tail.write(data)
+            self._tail.flush()
+            self._sizes[self._segments[-1]] += len(data)
+            self._pending += len(events)
+            self.appended += len(events)
+            self._enforce_limit()
+
+    # ------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------
+
+    def read(self, n: int) -> Tuple[List[Dict[str, Any]], Position]:
+        """
+        Up to n events from the cursor, and the position just past them.
+        """
+        events: List[Dict[str, Any]] = []
+        with self._lock:
+            segment, offset = self._cursor
+            while len(events) < n:
+                if offset >= self._sizes.get(segment, 0):
+                    later = [s for s in self._segments if s > segment]
+                    if not later:
+                        if not events and (segment, offset) == self._cursor:
+                            # Nothing left on disk whatever the count says
+                            self._pending = 0
+                        break
+                    segment, offset = later[0], 0
+                    continue
+
+                with open(self._path(segment), "rb") as f:
+                    f.seek(offset)
+                    while len(events) < n:
+                        line = f.readline()
+                        if not line:
+                            break
+                        offset += len(line)
+                        try:
+                            events.append(json.loads(line))
+                        except ValueError:
+                            self.corrupt += 1
+
+        return events, (segment, offset)
+
+    def ack(self, position: Position) -> None:
+        """
+        Mark everything before position as delivered.
+        """
+        with self._lock:
+            segment, offset = position
+            if segment not in self._sizes or position <= self._cursor:
+                # Stale: that data was dropped by the size limit meanwhile
+                return
+
+            delivered = self._lines_between(self._cursor, position)
+            self._pending = max(0, self._pending - delivered)
+            self.acked += delivered
+            self._cursor = position
+
+            # Compaction: segments behind the cursor are done
+            for old in [s for s in self._segments if s < segment]:
+                self._remove(old)
+
+            if self._pending == 0:
+                # Fully drained: start over with an empty segment
+                self._roll()
+                for old in self._segments[:-1]:
+                    self._remove(old)
+                self._cursor = (self._segments[-1], 0)
+
+            self._write_cursor()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._tail is not None:
+                self._tail.close()
+                self._tail = None
+
+    # ------------------------------------------------------------
+    # Internals (called with the lock held)
+    # ------------------------------------------------------------
+
+    def _path(self, segment: int) -> str:
+        return os.path.join(self.directory, _segment_name(segment))
+
+    def _open(self) -> None:
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith(SEGMENT_SUFFIX):
+                try:
+                    self._segments.append(int(name[: -len(SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+
+        if not self._segments:
+            self._segments.append(1)
+            open(self._path(1), "ab").close()
+
+        self._repair_tail()
+        for segment in self._segments:
+            self._sizes[segment] = os.path.getsize(self._path(segment))
+
+        self._cursor = self._read_cursor()
+        segment, offset = self._cursor
+        self._pending = _count_lines(self._path(segment), offset) + sum(
+            _count_lines(self._path(s)) for s in self._segments if s > segment
+        )
+        self._tail = open(self._path(self._segments[-1]), "ab")
+
+    def _repair_tail(self) -> None:
+        path = self._path(self._segments[-1])
+        with open(path, "rb") as f:
+            data = f.read()
+        if data and not data.endswith(b"\n"):
+            # Torn write from a crash: drop the partial last line
+            os.truncate(path, data.rfind(b"\n") + 1)
+
+    def _read_cursor(self) -> Position:
+        first = (self._segments[0], 0)
+        try:
+            with open(os.path.join(self.directory, CURSOR_FILE)) as f:
+                segment, offset = (int(v) for v in f.read().split())
+        except (OSError, ValueError):
+            return first
+
+        if segment not in self._sizes:
+            # Its segment is gone (dropped by the size limit)
+            return first
+        return (segment, min(offset, self._sizes[segment]))
+
+    def _write_cursor(self) -> None:
+        path = os.path.join(self.directory, CURSOR_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write("%d %d\n" % self._cursor)
+        os.replace(tmp, path)
+
+    def _lines_between(self, start: Position, end: Position) -> int:
+        count = 0
+        for segment in self._segments:
+            if segment < start[0] or segment > end[0]:
+                continue
+            begin = start[1] if segment == start[0] else 0
+            stop = end[1] if segment == end[0] else self._sizes[segment]
+            with open(self._path(segment), "rb") as f:
+                f.seek(begin)
+                count += f.read(stop - begin).count(b"\n")
+        return count
+
+    def _roll(self) -> None:
+        if self._tail is not None:
+            self._tail.close()
+        segment = self._segments[-1] + 1
+        self._segments.append(segment)
+        self._sizes[segment] = 0
+        self._tail = open(self._path(segment), "ab")
+
+    def _remove(self, segment: int) -> None:
+        self._segments.remove(segment)
+        del self._sizes[segment]
+        try:
+            os.remove(self._path(segment))
+        except FileNotFoundError:
+            pass
+
+    def _enforce_limit(self) -> None:
+        while sum(self._sizes.values()) > self.max_bytes and len(self._segments) > 1:
+            oldest = self._segments[0]
+            if self._cursor[0] == oldest:
+                lost = _count_lines(self._path(oldest), self._cursor[1])
+            else:
+                lost = _count_lines(self._path(oldest))
+            self._remove(oldest)
+            self._pending = max(0, self._pending - lost)
+            self.dropped += lost
+            self._cursor = (self._segments[0], 0)
+            self._write_cursor()
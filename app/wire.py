@@ -0,0 +1,230 @@
+# filename: app/wire.py
+
+"""
+Request bodies for outbound uploads (reading pushes and telemetry).
+
+Two independent, opt-in savings for metered links:
+
+Batch format (reading pushes):
+- "rows": a JSON array of to_logexp_payload() dicts; every record
+  repeats every key (the default, understood by every LogExp version)
+- "columnar": one JSON object with an array per LOGEXP_FIELDS column,
+  sent as COLUMNAR_CONTENT_TYPE:
+
+      {"count": 2,
+       "counts_per_second": [17, 18],
+       "counts_per_minute": [1020, 1080],
+       "microsieverts_per_hour": [0.09, 0.1],
+       "mode": ["SLOW", "SLOW"],
+       "device_id": ["pi-log", "pi-log"]}
+
+Content-Encoding: "identity", "gzip" or "zstd" (zstd needs the optional
+`zstandard` package and falls back to gzip without it). Bodies smaller
+than min_size bytes are sent as-is; the header overhead would outweigh
+the saving.
+
+Negotiation: a server that cannot handle what was sent answers 415
+Unsupported Media Type, optionally listing the codings it accepts in an
+Accept-Encoding response header (RFC 7694). BodyEncoder then steps down
+(zstd -> gzip -> identity, then columnar -> rows), re-sends the same
+batch and remembers the downgrade for later requests.
+"""
+
+from __future__ import annotations
+
+import gzip
+import importlib
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, cast
+
+import requests
+
+from app.http_session import PooledSession
+from app.models import LOGEXP_FIELDS, GeigerRecord
+
+# Typed as Any so the module checks the same with or without zstandard
+zstandard: Any
+try:
+    zstandard = importlib.import_module("zstandard")
+except ImportError:  # optional
+    zstandard = None
+
+ENCODINGS = ("identity", "gzip", "zstd")
+BATCH_FORMATS = ("rows", "columnar")
+
+JSON_CONTENT_TYPE = "application/json"
+COLUMNAR_CONTENT_TYPE = "application/vnd.pi-log.columnar+json"
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+DEFAULT_MIN_SIZE = 256
+
+# What to try next when the server rejects an encoding
+_FALLBACK = {"zstd": "gzip", "gzip": "identity"}
+
+# (body, headers) ready to POST
+Encoded = Tuple[bytes, Dict[str, str]]
+
+
+def available_encodings() -> Tuple[str, ...]:
+    if zstandard is None:
+        return ("identity", "gzip")
+    return ENCODINGS
+
+
+def dumps(payload: Any) -> bytes:
+    """
+    Compact JSON (requests' json= adds a space after every , and :).
+    """
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def to_columnar(records: Sequence[GeigerRecord]) -> Dict[str, Any]:
+    """
+    A batch as one array per LOGEXP_FIELDS column.
+    """
+    columns: Dict[str, Any] = {"count": len(records)}
+    if records:
+        rows = zip(*(r.to_logexp_tuple() for r in records))
+        for field, values in zip(LOGEXP_FIELDS, rows):
+            columns[field] = list(values)
+    else:
+        for field in LOGEXP_FIELDS:
+            columns[field] = []
+    return columns
+
+
+def from_columnar(columns: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Inverse of to_columnar(): the equivalent to_logexp_payload() dicts.
+    """
+    values = [columns[field] for field in LOGEXP_FIELDS]
+    return [dict(zip(LOGEXP_FIELDS, row)) for row in zip(*values)]
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        # mtime=0: identical batches compress to identical bytes
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd encoding requires the zstandard package")
+        return cast(bytes, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body))
+    if encoding == "identity":
+        return body
+    raise ValueError(f"Unknown content encoding: {encoding!r}")
+
+
+def _accepted(resp: requests.Response) -> Optional[List[str]]:
+    header = resp.headers.get("Accept-Encoding")
+    if header is None:
+        return None
+    return [part.split(";")[0].strip().lower() for part in header.split(",") if part]
+
+
+class BodyEncoder:
+    """
+    Encodes upload bodies and downgrades on 415 responses.
+
+    One instance per endpoint; the negotiated encoding and format are
+    shared by every thread posting through it.
+    """
+
+    def __init__(
+        self,
+        encoding: str = "identity",
+        batch_format: str = "rows",
+        min_size: int = DEFAULT_MIN_SIZE,
+    ) -> None:
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown content encoding: {encoding!r}")
+        if batch_format not in BATCH_FORMATS:
+            raise ValueError(f"Unknown batch format: {batch_format!r}")
+        if encoding == "zstd" and zstandard is None:
+            encoding = "gzip"
+
+        self.encoding = encoding
+        self.batch_format = batch_format
+        self.min_size = min_size
+        self._lock = threading.Lock()
+
+        # Counters (read-only for callers), per attempt
+        self.bytes_raw = 0
+        self.bytes_sent = 0
+        self.downgrades = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "encoding": self.encoding,
+            "batch_format": self.batch_format,
+            "bytes_raw": self.bytes_raw,
+            "bytes_sent": self.bytes_sent,
+            "downgrades": self.downgrades,
+        }
+
+    def encode(self, body: bytes, content_type: str = JSON_CONTENT_TYPE) -> Encoded:
+        """
+        (data, headers) for an already serialized body.
+        """
+        headers = {"Content-Type": content_type}
+        encoding = self.encoding
+        if encoding == "identity" or len(body) < self.min_size:
+            data = body
+        else:
+            headers["Content-Encoding"] = encoding
+            data = compress(body, encoding)
+
+        with self._lock:
+            self.bytes_raw += len(body)
+            self.bytes_sent += len(data)
+        return data, headers
+
+    def encode_records(self, records: Sequence[GeigerRecord]) -> Encoded:
+        if self.batch_format == "columnar":
+            return self.encode(dumps(to_columnar(records)), COLUMNAR_CONTENT_TYPE)
+        return self.encode(dumps([r.to_logexp_payload() for r in records]))
+
+    def post(
+        self,
+        http: PooledSession,
+        url: str,
+        build: Callable[[], Encoded],
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        POST build()'s body; on 415, downgrade, re-encode and re-send.
+        """
+        while True:
+            data, body_headers = build()
+            resp = http.post(
+                url, data=data, headers={**(headers or {}), **body_headers}, **kwargs
+            )
+            if resp.status_code != 415 or not self._downgrade(resp, body_headers):
+                return resp
+
+    def _downgrade(self, resp: requests.Response, sent: Dict[str, str]) -> bool:
+        with self._lock:
+            encoding = sent.get("Content-Encoding", "identity")
+            accepted = _accepted(resp)
+
+            if encoding != "identity" and (
+                accepted is None or encoding not in accepted
+            ):
+                options = [encoding]
+                while options[-1] in _FALLBACK:
+                    options.append(_FALLBACK[options[-1]])
+                options = options[1:]
+                if accepted is not None:
+                    options = [o for o in options if o in accepted or o == "identity"]
+                self.encoding = options[0]
+                self.downgrades += 1
+                return True
+
+            if sent.get("Content-Type") == COLUMNAR_CONTENT_TYPE:
+                self.batch_format = "rows"
+                self.downgrades += 1
+                return True
+
+            return False
@@ -0,0 +1,91 @@
+# filename: benchmarks/bench_csv_parser.py
+
+"""
+CSV parsing throughput: legacy split-based parser vs. the precompiled
+matcher, per line and in columnar batch mode.
+
+The "legacy" baseline reproduces the old parse_geiger_csv: strip, split,
+list comprehension, broad except, one dict per line.
+
+Usage:
+    python -m benchmarks.bench_csv_parser [--lines 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from app.ingestion.csv_parser import parse_geiger_bytes, parse_geiger_csv, parse_many
+
+
+def _legacy_parse(line: Any) -> Optional[Dict[str, Any]]:
+    if not isinstance(line, str):
+        return None
+    raw = line.strip()
+    if not raw:
+        return None
+    parts = [p.strip() for p in raw.split(",")]
+    if len(parts) != 7:
+        return None
+    try:
+        cps = int(parts[1])
+        cpm = int(parts[3])
+        usv = float(parts[5])
+        mode = parts[6]
+    except Exception:
+        return None
+    return {"raw": raw, "cps": cps, "cpm": cpm, "usv": usv, "mode": mode}
+
+
+def _lines(n: int) -> List[str]:
+    modes = ("SLOW", "FAST", "INST")
+    return [
+        f"CPS, {i % 50}, CPM, {i % 3000}, uSv/hr, {(i % 300) / 100:.2f}, "
+        f"{modes[i % 3]}"
+        for i in range(n)
+    ]
+
+
+def _timed(label: str, n: int, fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    rate = n / elapsed if elapsed else float("inf")
+    print(f"{label:<40} {n:>8} lines  {elapsed:8.3f}s  {rate:12.0f} lines/s")
+    return rate
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=200_000)
+    args = parser.parse_args()
+
+    lines = _lines(args.lines)
+    byte_lines = [line.encode("ascii") for line in lines]
+    block = b"\n".join(byte_lines)
+
+    base = _timed(
+        "legacy split parser (per line)",
+        args.lines,
+        lambda: [_legacy_parse(line) for line in lines],
+    )
+    _timed(
+        "parse_geiger_csv (per line)",
+        args.lines,
+        lambda: [parse_geiger_csv(line) for line in lines],
+    )
+    _timed(
+        "parse_geiger_bytes (per line)",
+        args.lines,
+        lambda: [parse_geiger_bytes(line) for line in byte_lines],
+    )
+    batch = _timed("parse_many (columnar block)", args.lines, lambda: parse_many(block))
+
+    print(f"batch speed-up vs legacy: {batch / base:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
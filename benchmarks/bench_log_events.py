@@ -0,0 +1,119 @@
+# filename: benchmarks/bench_log_events.py
+
+"""
+Structured log event encoding: LogRecord -> JSON line.
+
+"legacy" reproduces the old JSONFormatter / TelemetryHandler code: a
+tuple literal scanned for every attribute, datetime.now().isoformat()
+and stdlib json.dumps. The shared encoder (app.log_events) is measured
+with the stdlib backend and, when installed, with orjson.
+
+Usage:
+    python -m benchmarks.bench_log_events [--records 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from app import log_events
+from app.log_events import _stdlib_dumps, record_to_event
+
+
+def _legacy_format(record: logging.LogRecord) -> str:
+    payload = {
+        "ts": datetime.now().isoformat(),
+        "level": record.levelname.lower(),
+        "logger": record.name,
+        "msg": record.getMessage(),
+    }
+    for key, value in record.__dict__.items():
+        if key not in (
+            "args",
+            "asctime",
+            "created",
+            "exc_info",
+            "exc_text",
+            "filename",
+            "funcName",
+            "levelname",
+            "levelno",
+            "lineno",
+            "module",
+            "msecs",
+            "message",
+            "msg",
+            "name",
+            "pathname",
+            "process",
+            "processName",
+            "relativeCreated",
+            "stack_info",
+            "thread",
+            "threadName",
+        ):
+            payload[key] = value
+    return json.dumps(payload)
+
+
+def _records(n: int) -> List[logging.LogRecord]:
+    logger = logging.getLogger("pi_log.bench")
+    extra: Dict[str, Any] = {"device_id": "bench", "row_id": 0, "cps": 17}
+    records = []
+    for i in range(n):
+        extra["row_id"] = i
+        records.append(
+            logger.makeRecord(
+                logger.name,
+                logging.INFO,
+                __file__,
+                1,
+                "push_ok",
+                (),
+                None,
+                extra=extra,
+            )
+        )
+    return records
+
+
+def _timed(label: str, n: int, fn: Callable[[], Any]) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    rate = n / elapsed if elapsed else float("inf")
+    print(f"{label:<40} {n:>8} records  {elapsed:8.3f}s  {rate:12.0f} records/s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args()
+
+    n = args.records
+    records = _records(n)
+
+    _timed("legacy formatter", n, lambda: [_legacy_format(r) for r in records])
+    _timed(
+        "shared encoder (stdlib json)",
+        n,
+        lambda: [_stdlib_dumps(record_to_event(r)) for r in records],
+    )
+    if log_events.orjson is not None:
+        _timed(
+            "shared encoder (orjson)",
+            n,
+            lambda: [log_events.encode_event(record_to_event(r)) for r in records],
+        )
+    else:
+        print("orjson not installed: skipping")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,132 @@
+# filename: benchmarks/bench_logging.py
+
+"""
+Per-reading logging cost on the serial loop's thread.
+
+"legacy" reproduces the old setup: console + rotating JSON file handlers
+on the root logger, written synchronously, with two eager f-string INFO
+records (RAW, PARSED) per reading. The other rows use setup_logging()'s
+queue pipeline with the loops' lazy DEBUG calls on READINGS_LOGGER.
+
+stderr (the console sink) is redirected to /dev/null for every run so
+the terminal does not dominate.
+
+Usage:
+    python -m benchmarks.bench_logging [--readings 50000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import logging.handlers
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict
+
+from app.logging import (
+    JSONFormatter,
+    READINGS_LOGGER,
+    logging_stats,
+    setup_logging,
+    shutdown_logging,
+)
+
+RAW = "CPS, 17, CPM, 1020, uSv/hr, 0.09, SLOW"
+PARSED: Dict[str, Any] = {
+    "raw": RAW,
+    "cps": 17,
+    "cpm": 1020,
+    "usv": 0.09,
+    "mode": "SLOW",
+}
+
+
+def _timed(label: str, n: int, fn: Callable[[], Any]) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    per_call = elapsed / n * 1e6
+    print(f"{label:<44} {n:>8} readings  {elapsed:7.3f}s  {per_call:7.2f} us/reading")
+
+
+def _legacy(log_dir: str, n: int) -> None:
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.setLevel(logging.INFO)
+
+    console = logging.StreamHandler()
+    console.setFormatter(
+        logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    )
+    file_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(log_dir, "legacy.jsonl"),
+        maxBytes=5 * 1024 * 1024,
+        backupCount=1,
+    )
+    file_handler.setFormatter(JSONFormatter())
+    root.addHandler(console)
+    root.addHandler(file_handler)
+
+    def run() -> None:
+        raw, parsed = RAW, PARSED
+        for _ in range(n):
+            logging.info(f"RAW: {raw!r}")
+            logging.info(f"PARSED: {parsed}")
+
+    _timed("legacy: sync handlers, eager f-strings", n, run)
+    for h in (console, file_handler):
+        root.removeHandler(h)
+        h.close()
+
+
+def _queued(label: str, log_dir: str, level: str, interval: float, n: int) -> None:
+    config = SimpleNamespace(
+        logging=SimpleNamespace(
+            log_dir=log_dir, level=level, readings_interval=interval
+        )
+    )
+    setup_logging(config)
+    log = logging.getLogger(READINGS_LOGGER)
+
+    def run() -> None:
+        raw, parsed = RAW, PARSED
+        for _ in range(n):
+            log.debug("RAW: %r", raw)
+            log.debug("PARSED: %s", parsed)
+
+    _timed(label, n, run)
+    stats = logging_stats()
+    shutdown_logging()
+    print(
+        f"{'':<44} enqueued={stats['enqueued']} dropped={stats['dropped']} "
+        f"suppressed={stats['readings_suppressed']}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readings", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as null:
+        # setup_logging()'s console handler writes to sys.stderr
+        stderr = os.dup(2)
+        os.dup2(null.fileno(), 2)
+        try:
+            n = args.readings
+            _legacy(log_dir, n)
+            _queued("queue: INFO (per-reading DEBUG off)", log_dir, "INFO", 10.0, n)
+            _queued("queue: DEBUG, rate-limited (10 s)", log_dir, "DEBUG", 10.0, n)
+            _queued("queue: DEBUG, every reading", log_dir, "DEBUG", 0.0, n)
+        finally:
+            os.dup2(stderr, 2)
+            os.close(stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,141 @@
+# filename: benchmarks/bench_records.py
+
+"""
+Backlog replay hot path: row tuple -> GeigerRecord -> LogExp payload.
+
+The "legacy" baseline reproduces the old GeigerRecord: a plain dataclass
+with a per-instance __dict__, keyword construction from the row tuple and
+to_dict() via dataclasses.asdict().
+
+Usage:
+    python -m benchmarks.bench_records [--rows 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.models import GeigerRecord
+
+
+@dataclass
+class LegacyRecord:
+    id: Optional[int]
+    raw: str
+    counts_per_second: int
+    counts_per_minute: int
+    microsieverts_per_hour: float
+    mode: str
+    device_id: str
+    timestamp: datetime
+    pushed: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["timestamp"] = self.timestamp.isoformat()
+        return d
+
+    def to_logexp_payload(self) -> Dict[str, Any]:
+        return {
+            "counts_per_second": self.counts_per_second,
+            "counts_per_minute": self.counts_per_minute,
+            "microsieverts_per_hour": self.microsieverts_per_hour,
+            "mode": self.mode.upper(),
+            "device_id": self.device_id,
+        }
+
+
+def _legacy_from_row(row: Tuple[Any, ...]) -> LegacyRecord:
+    id_, raw, cps, cpm, usv, mode, device_id, ts_raw, pushed = row
+    return LegacyRecord(
+        id=id_,
+        raw=raw,
+        counts_per_second=int(cps),
+        counts_per_minute=int(cpm),
+        microsieverts_per_hour=float(usv),
+        mode=mode,
+        device_id=device_id,
+        timestamp=datetime.fromisoformat(ts_raw),
+        pushed=bool(pushed),
+    )
+
+
+def _rows(n: int) -> List[Tuple[Any, ...]]:
+    return [
+        (
+            i,
+            f"CPS, {i % 50}, CPM, {i % 3000}, uSv/hr, 0.10, SLOW",
+            i % 50,
+            i % 3000,
+            0.10,
+            "SLOW",
+            "bench",
+            "2025-01-01T00:00:00+00:00",
+            0,
+        )
+        for i in range(n)
+    ]
+
+
+def _timed(label: str, n: int, fn: Callable[[], Any]) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    rate = n / elapsed if elapsed else float("inf")
+    print(f"{label:<40} {n:>8} rows  {elapsed:8.3f}s  {rate:12.0f} rows/s")
+
+
+def _footprint(label: str, build: Callable[[], List[Any]]) -> None:
+    tracemalloc.start()
+    records = build()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40} {current / len(records):8.0f} bytes/record (incl. fields)")
+
+
+def _bench_to_dict(rows: List[Tuple[Any, ...]]) -> None:
+    print("to_dict")
+    legacy = [_legacy_from_row(r) for r in rows]
+    slotted = [GeigerRecord.from_db_tuple(r) for r in rows]
+    _timed("legacy asdict()", len(rows), lambda: [r.to_dict() for r in legacy])
+    _timed("slotted to_dict()", len(rows), lambda: [r.to_dict() for r in slotted])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rows = _rows(args.rows)
+
+    print("replay: row -> record -> payload")
+    _timed(
+        "legacy dataclass",
+        args.rows,
+        lambda: [_legacy_from_row(r).to_logexp_payload() for r in rows],
+    )
+    _timed(
+        "slotted GeigerRecord",
+        args.rows,
+        lambda: [GeigerRecord.from_db_tuple(r).to_logexp_payload() for r in rows],
+    )
+
+    # In its own frame, so both record lists are freed before measuring
+    _bench_to_dict(rows)
+
+    print("memory (one 10k-row replay page)")
+    page = rows[:10_000]
+    _footprint("legacy dataclass", lambda: [_legacy_from_row(r) for r in page])
+    _footprint(
+        "slotted GeigerRecord", lambda: [GeigerRecord.from_db_tuple(r) for r in page]
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,139 @@
+# filename: benchmarks/bench_sqlite_store.py
+
+"""
+Insert/query throughput: per-call connections vs. the long-lived SQLiteStore.
+
+The "per-call" baseline reproduces the old sqlite_store behaviour: open a
+connection, run one statement, commit, close.
+
+Usage:
+    python -m benchmarks.bench_sqlite_store [--rows 5000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from app.models import GeigerRecord
+from app.sqlite_store import SQLiteStore, initialize_db
+
+LATEST_SQL = "SELECT * FROM geiger_readings ORDER BY id DESC LIMIT 1"
+
+INSERT_SQL = """
+INSERT INTO geiger_readings (
+    raw, counts_per_second, counts_per_minute, microsieverts_per_hour,
+    mode, device_id, timestamp, pushed
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _record(i: int) -> GeigerRecord:
+    return GeigerRecord(
+        id=None,
+        raw=f"CPS, {i % 50}, CPM, {i % 3000}, uSv/hr, 0.10, SLOW",
+        counts_per_second=i % 50,
+        counts_per_minute=i % 3000,
+        microsieverts_per_hour=0.10,
+        mode="SLOW",
+        device_id="bench",
+        timestamp=datetime.now(timezone.utc),
+    )
+
+
+def _per_call_insert(db_path: str, record: GeigerRecord) -> None:
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(
+            INSERT_SQL,
+            (
+                record.raw,
+                record.counts_per_second,
+                record.counts_per_minute,
+                record.microsieverts_per_hour,
+                record.mode,
+                record.device_id,
+                record.timestamp.isoformat(),
+                0,
+            ),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _per_call_latest(db_path: str) -> None:
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(LATEST_SQL).fetchone()
+    finally:
+        conn.close()
+
+
+def _timed(label: str, n: int, fn: Callable[[int], None]) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    rate = n / elapsed if elapsed else float("inf")
+    print(f"{label:<40} {n:>7} ops  {elapsed:8.3f}s  {rate:10.0f} ops/s")
+    return rate
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = str(Path(tmp) / "before.db")
+        after = str(Path(tmp) / "after.db")
+        grouped = str(Path(tmp) / "grouped.db")
+        for path in (before, after, grouped):
+            initialize_db(path)
+
+        records = [_record(i) for i in range(args.rows)]
+
+        print("inserts")
+        _timed(
+            "per-call connection",
+            args.rows,
+            lambda i: _per_call_insert(before, records[i]),
+        )
+
+        store = SQLiteStore(after)
+        _timed(
+            "SQLiteStore (commit per row)",
+            args.rows,
+            lambda i: store.insert_record(records[i]),
+        )
+
+        grouped_store = SQLiteStore(
+            grouped, commit_max_rows=100, commit_max_delay_ms=1000
+        )
+        _timed(
+            "SQLiteStore (group commit 100)",
+            args.rows,
+            lambda i: grouped_store.insert_record(records[i]),
+        )
+        grouped_store.close()
+
+        print("latest-row queries")
+        _timed("per-call connection", args.rows, lambda i: _per_call_latest(before))
+        _timed(
+            "SQLiteStore",
+            args.rows,
+            lambda i: store.conn.execute(LATEST_SQL).fetchone(),
+        )
+        store.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+# filename: benchmarks/bench_wire.py
+
+"""
+Upload body size per reading for each batch format and content encoding.
+
+"legacy" is what PushClient sent before app/wire.py: requests' json=
+(stdlib json.dumps with ", " / ": " separators) of a list of
+to_logexp_payload() dicts. The other rows are the BodyEncoder formats
+("rows", "columnar") with identity, gzip and, when the optional
+zstandard package is installed, zstd. A telemetry batch of log events
+is measured the same way.
+
+Bytes are request body bytes only (no HTTP/TLS framing).
+
+Usage:
+    python -m benchmarks.bench_wire [--batch-sizes 1,50,200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from app.log_events import encode_events, record_to_event
+from app.models import GeigerRecord
+from app.wire import available_encodings, compress, dumps, to_columnar
+
+
+def _records(n: int, seed: int = 1) -> List[GeigerRecord]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    records = []
+    for i in range(n):
+        cps = rng.randint(10, 30)
+        cpm = cps * 60 + rng.randint(-20, 20)
+        usv = round(cpm * 0.0057 / 60 * 10, 2)
+        raw = f"CPS, {cps}, CPM, {cpm}, uSv/hr, {usv:.2f}, SLOW"
+        records.append(GeigerRecord(i, raw, cps, cpm, usv, "SLOW", "pi-log", now))
+    return records
+
+
+def _events(n: int) -> List[Dict[str, Any]]:
+    logger = logging.getLogger("pi_log.bench")
+    events = []
+    for i in range(n):
+        record = logger.makeRecord(
+            logger.name,
+            logging.INFO,
+            __file__,
+            1,
+            "push_ok",
+            (),
+            None,
+            extra={"device_id": "pi-log", "row_id": i, "batch_size": 50},
+        )
+        events.append(record_to_event(record))
+    return events
+
+
+def _row(label: str, n: int, body: bytes) -> None:
+    for encoding in available_encodings():
+        data = compress(body, encoding)
+        start = time.perf_counter()
+        for _ in range(20):
+            compress(body, encoding)
+        per_call = (time.perf_counter() - start) / 20 * 1e6
+        print(
+            f"{label:<24} {encoding:<9} {n:>6} {len(data):>9} "
+            f"{len(data) / n:>10.1f} {per_call:>10.1f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-sizes", default="1,50,200", type=str)
+    args = parser.parse_args()
+
+    formats: Dict[str, Callable[[List[GeigerRecord]], bytes]] = {
+        "legacy (requests json=)": lambda rs: json.dumps(
+            [r.to_logexp_payload() for r in rs]
+        ).encode("utf-8"),
+        "rows": lambda rs: dumps([r.to_logexp_payload() for r in rs]),
+        "columnar": lambda rs: dumps(to_columnar(rs)),
+    }
+
+    print(
+        f"{'format':<24} {'encoding':<9} {'batch':>6} {'bytes':>9} "
+        f"{'bytes/rec':>10} {'us/encode':>10}"
+    )
+    for n in (int(v) for v in args.batch_sizes.split(",")):
+        records = _records(n)
+        for label, build in formats.items():
+            _row(label, n, build(records))
+        _row("telemetry events", n, encode_events(_events(n)))
+        print()
+
+    if "zstd" not in available_encodings():
+        print("zstandard not installed: zstd rows skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+# pytest fixtures "client" and "api_db" are provided by conftest
+
+from datetime import datetime, timedelta, timezone
+
+from app.models import GeigerRecord
+from app.sqlite_store import insert_record
+
+
+def _insert(db_path, at, cpm, usv, device_id="pi-log"):
+    insert_record(
+        db_path,
+        GeigerRecord(
+            id=None,
+            raw="RAW",
+            counts_per_second=cpm // 60,
+            counts_per_minute=cpm,
+            microsieverts_per_hour=usv,
+            mode="SLOW",
+            device_id=device_id,
+            timestamp=at,
+        ),
+    )
+
+
+def test_aggregate_minute_buckets(client, api_db):
+    start = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    _insert(api_db, start, 60, 0.10)
+    _insert(api_db, start + timedelta(seconds=30), 120, 0.30)
+    _insert(api_db, start + timedelta(minutes=1), 90, 0.20)
+
+    response = client.get("/readings/aggregate?bucket=1m")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert [b["count"] for b in data] == [2, 1]
+
+    first = data[0]
+    assert first["bucket_start"] == "2025-01-01T12:00:00+00:00"
+    assert first["cpm_min"] == 60
+    assert first["cpm_max"] == 120
+    assert first["cpm_mean"] == 90
+    assert abs(first["usv_mean"] - 0.20) < 1e-9
+
+
+def test_aggregate_merges_devices_unless_filtered(client, api_db):
+    start = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+    _insert(api_db, start, 60, 0.1, device_id="a")
+    _insert(api_db, start + timedelta(minutes=5), 180, 0.3, device_id="b")
+
+    merged = client.get("/readings/aggregate?bucket=1h").json()
+    assert len(merged) == 1
+    assert merged[0]["count"] == 2
+    assert merged[0]["cpm_max"] == 180
+
+    only_a = client.get("/readings/aggregate?bucket=1h&device_id=a").json()
+    assert only_a[0]["count"] == 1
+    assert only_a[0]["cpm_max"] == 60
+
+
+def test_aggregate_time_window(client, api_db):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for day in range(3):
+        _insert(api_db, start + timedelta(days=day), 60, 0.1)
+
+    response = client.get(
+        "/readings/aggregate",
+        params={
+            "bucket": "1d",
+            "since": "2025-01-02T00:00:00Z",
+            "until": "2025-01-03T00:00:00Z",
+        },
+    )
+    assert [b["bucket_start"] for b in response.json()] == ["2025-01-02T00:00:00+00:00"]
+
+
+def test_aggregate_rejects_unknown_bucket(client):
+    assert client.get("/readings/aggregate?bucket=5m").status_code == 422
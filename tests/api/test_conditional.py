@@ -0,0 +1,140 @@
+# filename: tests/api/test_conditional.py
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from app.models import GeigerRecord
+from app.sqlite_store import get_store
+
+BASE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _insert(db_path, cps):
+    get_store(db_path).insert_record(
+        GeigerRecord(
+            id=None,
+            raw=f"CPS, {cps}, CPM, {cps * 60}, uSv/hr, 0.10, SLOW",
+            counts_per_second=cps,
+            counts_per_minute=cps * 60,
+            microsieverts_per_hour=0.10,
+            mode="SLOW",
+            device_id="test",
+            timestamp=BASE + timedelta(seconds=cps),
+        )
+    )
+
+
+def test_latest_sets_validators_and_revalidates(client, api_db):
+    _insert(api_db, 1)
+
+    first = client.get("/readings/latest")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag == 'W/"1"'
+    assert "last-modified" in first.headers
+    assert "max-age=1" in first.headers["cache-control"]
+
+    cached = client.get("/readings/latest", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    _insert(api_db, 2)
+    fresh = client.get("/readings/latest", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["cps"] == 2
+    assert fresh.headers["etag"] == 'W/"2"'
+
+
+def test_readings_etag_and_if_modified_since(client, api_db):
+    _insert(api_db, 1)
+
+    first = client.get("/readings?limit=5")
+    etag = first.headers["etag"]
+
+    assert (
+        client.get(
+            "/readings?limit=5", headers={"If-None-Match": f'"x", {etag}'}
+        ).status_code
+        == 304
+    )
+    assert (
+        client.get(
+            "/readings?limit=5",
+            headers={"If-Modified-Since": first.headers["last-modified"]},
+        ).status_code
+        == 304
+    )
+    # If-None-Match wins over a matching If-Modified-Since
+    assert (
+        client.get(
+            "/readings?limit=5",
+            headers={
+                "If-None-Match": 'W/"0"',
+                "If-Modified-Since": first.headers["last-modified"],
+            },
+        ).status_code
+        == 200
+    )
+
+
+def test_last_modified_comes_from_stored_readings(client, api_db):
+    _insert(api_db, 1)
+    first = client.get("/readings/latest")
+    assert first.headers["last-modified"] == "Wed, 01 Jan 2025 00:00:01 GMT"
+
+    stale_ims = {"If-Modified-Since": first.headers["last-modified"]}
+    assert client.get("/readings/latest", headers=stale_ims).status_code == 304
+
+    _insert(api_db, 2)
+    fresh = client.get("/readings/latest", headers=stale_ims)
+    assert fresh.status_code == 200
+    assert fresh.headers["last-modified"] == "Wed, 01 Jan 2025 00:00:02 GMT"
+
+    # A matching If-None-Match decides even with an older If-Modified-Since
+    assert (
+        client.get(
+            "/readings/latest",
+            headers={"If-None-Match": fresh.headers["etag"], **stale_ims},
+        ).status_code
+        == 304
+    )
+
+
+def test_unparseable_timestamp_omits_last_modified(client, api_db):
+    conn = sqlite3.connect(api_db)
+    conn.execute(
+        """
+        INSERT INTO geiger_readings (
+            raw, counts_per_second, counts_per_minute,
+            microsieverts_per_hour, mode, device_id, timestamp, pushed
+        ) VALUES ('RAW', 1, 60, 0.1, 'SLOW', 'test', 'not a time', 0)
+        """
+    )
+    conn.commit()
+    conn.close()
+
+    response = client.get(
+        "/readings?limit=5",
+        headers={"If-Modified-Since": "Wed, 01 Jan 2025 00:00:01 GMT"},
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] == 'W/"1"'
+    assert "last-modified" not in response.headers
+
+
+def test_empty_store_has_no_validators(client):
+    response = client.get("/readings/latest")
+    assert response.status_code == 404
+    assert "etag" not in response.headers
+
+
+def test_metrics_count_is_incremental(client, api_db):
+    _insert(api_db, 1)
+    _insert(api_db, 2)
+    response = client.get("/metrics")
+    assert response.json()["ingested_count"] == 2
+    assert response.headers["cache-control"] == "no-cache"
+
+    _insert(api_db, 3)
+    assert client.get("/metrics").json()["ingested_count"] == 3
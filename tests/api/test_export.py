@@ -0,0 +1,56 @@
+# pytest fixtures "client" and "api_db" are provided by conftest
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+from app.models import GeigerRecord
+from app.sqlite_store import insert_record
+
+
+def _seed(db_path, count):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        insert_record(
+            db_path,
+            GeigerRecord(
+                id=None,
+                raw=f"CPS, {i}, CPM, {i * 60}, uSv/hr, 0.10, SLOW",
+                counts_per_second=i,
+                counts_per_minute=i * 60,
+                microsieverts_per_hour=0.1,
+                mode="SLOW",
+                device_id="pi-log",
+                timestamp=start + timedelta(hours=i),
+            ),
+        )
+
+
+def test_export_ndjson_streams_all_rows(client, api_db):
+    _seed(api_db, 3)
+
+    response = client.get("/readings/export?format=ndjson")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["cps"] for r in rows] == [0, 1, 2]
+    assert rows[0]["raw"] == "CPS, 0, CPM, 0, uSv/hr, 0.10, SLOW"
+
+
+def test_export_csv_with_time_window(client, api_db):
+    _seed(api_db, 4)
+
+    response = client.get(
+        "/readings/export",
+        params={
+            "format": "csv",
+            "since": "2025-01-01T01:00:00Z",
+            "until": "2025-01-01T03:00:00Z",
+        },
+    )
+    assert response.status_code == 200
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [r["cps"] for r in rows] == ["1", "2"]
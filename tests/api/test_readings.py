@@ -1,4 +1,9 @@
-# no import — pytest fixture "client" is provided automatically
+# pytest fixtures "client" and "api_db" are provided by conftest
+
+from datetime import datetime, timedelta, timezone
+
+from app.models import GeigerRecord
+from app.sqlite_store import insert_record
 
 
 def test_readings_empty_list_when_none(client):
@@ -8,3 +13,63 @@ def test_readings_empty_list_when_none(client):
     data = response.json()
     assert isinstance(data, list)
     assert data == []
+
+
+def _seed_readings(db_path, count, device_id="pi-log"):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        insert_record(
+            db_path,
+            GeigerRecord(
+                id=None,
+                raw="RAW",
+                counts_per_second=i,
+                counts_per_minute=i * 60,
+                microsieverts_per_hour=0.1,
+                mode="SLOW" if i % 2 == 0 else "FAST",
+                device_id=device_id,
+                timestamp=start + timedelta(minutes=i),
+            ),
+        )
+
+
+def test_readings_cursor_pages_cover_all_rows(client, api_db):
+    _seed_readings(api_db, 5)
+
+    seen = []
+    cursor = None
+    while True:
+        url = "/readings?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url)
+        assert response.status_code == 200
+        seen.extend(r["cps"] for r in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert seen == [4, 3, 2, 1, 0]
+
+
+def test_readings_time_window_and_filters(client, api_db):
+    _seed_readings(api_db, 6)
+    _seed_readings(api_db, 2, device_id="other")
+
+    response = client.get(
+        "/readings",
+        params={
+            "since": "2025-01-01T00:01:00Z",
+            "until": "2025-01-01T00:05:00Z",
+            "device_id": "pi-log",
+            "order": "asc",
+        },
+    )
+    assert response.status_code == 200
+    assert [r["cps"] for r in response.json()] == [1, 2, 3, 4]
+
+    response = client.get("/readings", params={"mode": "FAST", "device_id": "pi-log"})
+    assert [r["cps"] for r in response.json()] == [5, 3, 1]
+
+
+def test_readings_rejects_invalid_cursor(client):
+    response = client.get("/readings?cursor=not-a-cursor")
+    assert response.status_code == 400
@@ -0,0 +1,122 @@
+# filename: tests/api/test_recent_readings.py
+
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.api import Store
+from app.models import GeigerRecord
+from app.recent_readings import RecentReadingsCache
+from app.sqlite_store import get_store
+
+BASE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _insert(db_path, cps, offset_seconds=None):
+    ts = BASE + timedelta(seconds=cps if offset_seconds is None else offset_seconds)
+    get_store(db_path).insert_record(
+        GeigerRecord(
+            id=None,
+            raw=f"CPS, {cps}, CPM, {cps * 60}, uSv/hr, 0.10, SLOW",
+            counts_per_second=cps,
+            counts_per_minute=cps * 60,
+            microsieverts_per_hour=0.10,
+            mode="SLOW",
+            device_id="test",
+            timestamp=ts,
+        )
+    )
+
+
+def test_cache_follows_new_commits(temp_db):
+    cache = RecentReadingsCache(temp_db, capacity=10)
+    try:
+        assert cache.latest() is None
+
+        _insert(temp_db, 1)
+        _insert(temp_db, 2)
+        assert cache.latest()["cps"] == 2
+
+        _insert(temp_db, 3)
+        assert [r["cps"] for r in cache.recent(5)] == [3, 2, 1]
+        assert cache.stats()["rows_loaded"] == 3
+    finally:
+        cache.close()
+
+
+def test_cache_does_not_query_rows_without_new_commits(temp_db):
+    _insert(temp_db, 1)
+    cache = RecentReadingsCache(temp_db, capacity=10)
+    try:
+        cache.latest()
+        refreshes = cache.refreshes
+        for _ in range(5):
+            cache.latest()
+        assert cache.refreshes == refreshes
+    finally:
+        cache.close()
+
+
+def test_ring_evicts_oldest_and_defers_when_window_exceeded(temp_db):
+    cache = RecentReadingsCache(temp_db, capacity=3)
+    try:
+        for cps in range(1, 6):
+            _insert(temp_db, cps)
+            cache.latest()
+
+        assert [r["cps"] for r in cache.recent(3)] == [5, 4, 3]
+        assert cache.recent(4) is None
+    finally:
+        cache.close()
+
+
+def test_out_of_order_timestamps_defer_to_sqlite(temp_db):
+    cache = RecentReadingsCache(temp_db, capacity=10)
+    try:
+        _insert(temp_db, 1, offset_seconds=10)
+        _insert(temp_db, 2, offset_seconds=5)
+        assert cache.recent(2) is None
+    finally:
+        cache.close()
+
+
+def test_store_serves_same_rows_with_and_without_cache(temp_db):
+    for cps in range(1, 8):
+        _insert(temp_db, cps)
+
+    cached = Store(temp_db)
+    uncached = Store(temp_db, cache_rows=0)
+    try:
+        assert cached.get_latest_reading() == uncached.get_latest_reading()
+        assert cached.get_recent_readings(3) == uncached.get_recent_readings(3)
+        assert cached.query_readings(limit=4) == uncached.query_readings(limit=4)
+        assert cached.recent is not None and len(cached.recent) == 7
+    finally:
+        cached.close()
+        uncached.close()
+
+
+def test_stale_feed_does_not_hide_unpublished_rows(temp_db):
+    published = {"max_id": 0}
+    cache = RecentReadingsCache(
+        temp_db, capacity=10, published_max_id=lambda: published["max_id"]
+    )
+    try:
+        _insert(temp_db, 1)
+        published["max_id"] = 1
+        assert cache.latest()["cps"] == 1
+
+        # Leftover feed that never moves again: a writer that does not
+        # publish is still seen
+        _insert(temp_db, 2)
+        assert cache.latest()["cps"] == 2
+
+        # A moving feed is trusted, but only for feed_max_age seconds
+        cache.feed_max_age = 0.05
+        published["max_id"] = 2
+        assert cache.latest()["cps"] == 2
+        _insert(temp_db, 3)
+        assert cache.latest()["cps"] == 2
+        time.sleep(0.06)
+        assert cache.latest()["cps"] == 3
+    finally:
+        cache.close()
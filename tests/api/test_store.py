@@ -0,0 +1,51 @@
+# filename: tests/api/test_store.py
+
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+import app.api as api
+from app.api import Store
+from app.models import GeigerRecord
+from app.sqlite_store import insert_record
+
+
+def _seed(db_path):
+    insert_record(
+        db_path,
+        GeigerRecord(
+            id=None,
+            raw="CPS, 9, CPM, 90, uSv/hr, 0.09, FAST",
+            counts_per_second=9,
+            counts_per_minute=90,
+            microsieverts_per_hour=0.09,
+            mode="FAST",
+            device_id="test",
+            timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        ),
+    )
+
+
+def test_store_reads_through_read_only_pool(temp_db):
+    _seed(temp_db)
+    store = Store(temp_db, pool_size=2)
+    try:
+        latest = store.get_latest_reading()
+        assert latest["cps"] == 9
+        assert store.count_readings() == 1
+
+        with store.pool.connection() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM geiger_readings")
+    finally:
+        store.close()
+
+
+def test_get_store_returns_process_wide_store(temp_db, monkeypatch):
+    monkeypatch.setattr(api, "DB_PATH", temp_db)
+    api.close_store()
+    try:
+        assert api.get_store() is api.get_store()
+    finally:
+        api.close_store()
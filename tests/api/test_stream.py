@@ -0,0 +1,180 @@
+# filename: tests/api/test_stream.py
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.api import Store, _event_stream, app, get_store
+from app.broadcast import ReadingBroadcaster
+from app.models import GeigerRecord
+from app.sqlite_store import get_store as get_sqlite_store
+
+BASE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeSource:
+    def __init__(self):
+        self.readings = []
+
+    def add(self, n):
+        for _ in range(n):
+            row_id = len(self.readings) + 1
+            self.readings.append({"id": row_id, "cps": row_id})
+
+    def max_reading_id(self):
+        return len(self.readings)
+
+    def readings_after(self, after_id, limit):
+        return self.readings[after_id : after_id + limit]
+
+    def change_token(self):
+        return len(self.readings)
+
+    def wait_for_change(self, token, timeout):
+        time.sleep(0.01)
+
+
+async def _collect(sub, n, timeout=2.0):
+    out = []
+    while len(out) < n:
+        out.append(await asyncio.wait_for(sub.get(), timeout))
+    return out
+
+
+def test_broadcaster_fans_out_to_all_subscribers():
+    source = FakeSource()
+    source.add(3)  # history is not replayed to new subscribers
+    broadcaster = ReadingBroadcaster(source, queue_size=8, poll_interval=0.01)
+
+    async def scenario():
+        a = broadcaster.subscribe()
+        b = broadcaster.subscribe()
+        await asyncio.sleep(0.05)
+        source.add(2)
+        got_a = await _collect(a, 2)
+        got_b = await _collect(b, 2)
+        return got_a, got_b
+
+    try:
+        got_a, got_b = asyncio.run(scenario())
+    finally:
+        broadcaster.close()
+
+    assert [row_id for row_id, _ in got_a] == [4, 5]
+    # Frames are encoded once and shared
+    assert got_a[0][1] is got_b[0][1]
+    assert got_a[0][1].startswith(b"id: 4\nevent: reading\ndata: ")
+
+
+def test_slow_subscriber_is_disconnected():
+    source = FakeSource()
+    broadcaster = ReadingBroadcaster(source, queue_size=2, poll_interval=0.01)
+
+    async def run():
+        slow = broadcaster.subscribe()
+        fast = broadcaster.subscribe()
+        await asyncio.sleep(0.05)
+
+        # The fast client keeps draining; the slow one never reads
+        source.add(2)
+        await _collect(fast, 2)
+        source.add(2)
+        await _collect(fast, 2)
+
+        # Overflow discards pending frames and ends the stream
+        assert await asyncio.wait_for(slow.get(), 2.0) is None
+        assert slow.overflowed
+        broadcaster.unsubscribe(slow)
+
+    try:
+        asyncio.run(run())
+        assert broadcaster.stats()["slow_disconnects"] == 1
+        assert len(broadcaster) == 1
+    finally:
+        broadcaster.close()
+
+
+def test_idle_broadcaster_parks_without_subscribers():
+    source = FakeSource()
+    calls = []
+    source.readings_after = lambda after_id, limit: calls.append(after_id) or []
+    broadcaster = ReadingBroadcaster(source, poll_interval=0.01)
+
+    async def scenario():
+        sub = broadcaster.subscribe()
+        await asyncio.sleep(0.05)
+        broadcaster.unsubscribe(sub)
+
+    try:
+        asyncio.run(scenario())
+        time.sleep(0.05)
+        polled = len(calls)
+        assert polled > 0
+        time.sleep(0.1)
+        assert len(calls) == polled
+    finally:
+        broadcaster.close()
+
+
+def _insert(db_path, cps):
+    get_sqlite_store(db_path).insert_record(
+        GeigerRecord(
+            id=None,
+            raw=f"CPS, {cps}, CPM, {cps * 60}, uSv/hr, 0.10, SLOW",
+            counts_per_second=cps,
+            counts_per_minute=cps * 60,
+            microsieverts_per_hour=0.10,
+            mode="SLOW",
+            device_id="test",
+            timestamp=BASE + timedelta(seconds=cps),
+        )
+    )
+
+
+def test_stream_endpoint_pushes_new_readings(client, api_db):
+    store = app.dependency_overrides[get_store]()
+    store.broadcaster.poll_interval = 0.01
+    _insert(api_db, 1)
+
+    def produce():
+        while not len(store.broadcaster):
+            time.sleep(0.01)
+        time.sleep(0.05)
+        _insert(api_db, 2)
+        time.sleep(0.2)
+        store.broadcaster.close()
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    response = client.get("/readings/stream")
+    producer.join()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    body = response.text
+    assert "id: 2\nevent: reading\n" in body
+    assert '"cps":2' in body
+    assert "id: 1\n" not in body
+
+
+def test_event_stream_replays_after_last_event_id(api_db):
+    store = Store(api_db)
+    for cps in (1, 2, 3):
+        _insert(api_db, cps)
+
+    async def scenario():
+        sub = store.broadcaster.subscribe()
+        backlog = store.readings_after(1, 10)
+        stream = _event_stream(store, sub, backlog)
+        frames = [await stream.__anext__(), await stream.__anext__()]
+        await stream.aclose()
+        return frames
+
+    try:
+        frames = asyncio.run(scenario())
+    finally:
+        store.close()
+
+    assert [f.split(b"\n")[0] for f in frames] == [b"id: 2", b"id: 3"]
+    assert len(store.broadcaster) == 0
@@ -1,14 +1,13 @@
 # filename: tests/conftest.py
 
 import os  # noqa: F401
-import sqlite3
 import pytest
 from unittest.mock import MagicMock, patch
 from fastapi.testclient import TestClient
 
-from app.api import app, get_store
+from app.api import Store, app, get_store
 from app.settings import Settings
-from app.sqlite_store import initialize_db, insert_record
+from app.sqlite_store import close_stores, initialize_db, insert_record
 from app.ingestion.api_client import PushClient
 from app.models import GeigerRecord
 
@@ -53,7 +52,8 @@ def fake_settings(tmp_path):
 def temp_db(tmp_path):
     db_path = tmp_path / "test.db"
     initialize_db(str(db_path))
-    return str(db_path)
+    yield str(db_path)
+    close_stores()
 
 
 @pytest.fixture
@@ -104,85 +104,24 @@ def geiger_record():
 
 
 # ---------------------------------------------------------------------------
-# API TEST STORE + CLIENT FIXTURE
+# API CLIENT FIXTURE (real Store on a temp database)
 # ---------------------------------------------------------------------------
 
 
-class _TestStore:
-    """A minimal store wrapper for API tests."""
-
-    def __init__(self, db_path):
-        self.db_path = db_path
-        initialize_db(db_path)
-
-    def get_latest_reading(self):
-        conn = sqlite3.connect(self.db_path)
-        try:
-            row = conn.execute(
-                """
-                SELECT id, raw, counts_per_second, counts_per_minute,
-                       microsieverts_per_hour, mode, device_id,
-                       timestamp, pushed
-                FROM geiger_readings
-                ORDER BY id DESC LIMIT 1
-                """
-            ).fetchone()
-            if row is None:
-                return None
-            return {
-                "id": row[0],
-                "raw": row[1],
-                "cps": row[2],
-                "cpm": row[3],
-                "mode": row[5],
-                "timestamp": row[7],
-            }
-        finally:
-            conn.close()
-
-    def get_recent_readings(self, limit=10):
-        conn = sqlite3.connect(self.db_path)
-        try:
-            rows = conn.execute(
-                """
-                SELECT id, raw, counts_per_second, counts_per_minute,
-                       microsieverts_per_hour, mode, device_id,
-                       timestamp, pushed
-                FROM geiger_readings
-                ORDER BY id DESC LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
-            return [
-                {
-                    "id": r[0],
-                    "raw": r[1],
-                    "cps": r[2],
-                    "cpm": r[3],
-                    "mode": r[5],
-                    "timestamp": r[7],
-                }
-                for r in rows
-            ]
-        finally:
-            conn.close()
-
-    def count_readings(self):
-        conn = sqlite3.connect(self.db_path)
-        try:
-            (count,) = conn.execute("SELECT COUNT(*) FROM geiger_readings").fetchone()
-            return count
-        finally:
-            conn.close()
+@pytest.fixture
+def api_db(tmp_path):
+    return str(tmp_path / "api_test.db")
 
 
 @pytest.fixture
-def client(tmp_path, monkeypatch):
-    db_path = str(tmp_path / "api_test.db")
-    store = _TestStore(db_path)
+def client(api_db, monkeypatch):
+    store = Store(api_db)
 
     def override_get_store():
         return store
 
     app.dependency_overrides[get_store] = override_get_store
-    return TestClient(app)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    store.close()
+    close_stores()
@@ -0,0 +1,122 @@
+# filename: tests/unit/test_async_agent.py
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app import api
+from app.ingestion.api_client import PushClient
+from app.ingestion.async_agent import AsyncIngestionAgent, api_app
+
+LINE = "CPS, {0}, CPM, {1}, uSv/hr, 0.10, SLOW"
+
+
+class FakeReader:
+    def __init__(self, lines):
+        self._lines = list(lines)
+        self._lock = threading.Lock()
+
+    def read_line(self):
+        with self._lock:
+            if self._lines:
+                return self._lines.pop(0)
+        time.sleep(0.01)
+        return ""
+
+
+async def _run_until(agent, predicate, timeout=2.0):
+    task = asyncio.create_task(agent.run())
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    agent.stop()
+    await task
+    return predicate()
+
+
+def test_agent_parses_and_handles_lines():
+    handled = []
+    agent = AsyncIngestionAgent(
+        readers=[FakeReader([LINE.format(1, 60), "junk", LINE.format(2, 120)])],
+        handler=handled.append,
+    )
+
+    assert asyncio.run(_run_until(agent, lambda: len(handled) == 2))
+    assert [p["cps"] for p in handled] == [1, 2]
+    assert agent.stats()["parse_failures"] == 1
+
+
+def test_agent_reads_from_multiple_sources():
+    handled = []
+    agent = AsyncIngestionAgent(
+        readers=[
+            FakeReader([LINE.format(1, 60)]),
+            FakeReader([LINE.format(2, 120)]),
+        ],
+        handler=handled.append,
+    )
+
+    assert asyncio.run(_run_until(agent, lambda: len(handled) == 2))
+    assert sorted(p["cps"] for p in handled) == [1, 2]
+
+
+def test_full_queue_applies_backpressure():
+    release = threading.Event()
+    handled = []
+
+    def slow_handler(parsed):
+        release.wait(2.0)
+        handled.append(parsed)
+
+    agent = AsyncIngestionAgent(
+        readers=[FakeReader([LINE.format(i, i * 60) for i in range(6)])],
+        handler=slow_handler,
+        queue_size=2,
+    )
+
+    async def scenario():
+        task = asyncio.create_task(agent.run())
+        # One record in the handler, two queued, reader suspended on put()
+        while agent.lines_read < 4:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        assert agent.lines_read == 4
+        assert agent.backpressure_waits == 1
+
+        release.set()
+        while len(handled) < 6:
+            await asyncio.sleep(0.01)
+        agent.stop()
+        await task
+
+    asyncio.run(scenario())
+    assert [p["cps"] for p in handled] == list(range(6))
+
+
+def test_in_process_api_serves_the_agent_database(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "agent.db")
+    client = PushClient(
+        api_url="http://example.com", api_token="", device_id="agent", db_path=db_path
+    )
+    monkeypatch.setattr(api, "DB_PATH", api.DB_PATH)
+    monkeypatch.setattr(api, "LIVE_FEED_PATH", api.LIVE_FEED_PATH)
+    try:
+        with patch.object(PushClient, "_push_single", return_value=True):
+            client.handle_record(
+                {"raw": "RAW", "cps": 42, "cpm": 2520, "usv": 0.2, "mode": "SLOW"}
+            )
+        client.store.flush()
+
+        served = TestClient(api_app(db_path, None))
+        response = served.get("/readings/latest")
+
+        assert api.DB_PATH == db_path
+        assert response.status_code == 200
+        assert response.json()["cps"] == 42
+        assert response.json()["device_id"] == "agent"
+    finally:
+        api.close_store()
+        client.close()
@@ -0,0 +1,157 @@
+# filename: tests/unit/test_backlog_replay.py
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from app.ingestion.api_client import PushClient
+from app.ingestion.batch_sender import BatchRejected
+from app.ingestion.replay import BacklogReplayer
+from app.models import GeigerRecord
+from app.sqlite_store import get_unpushed_records, insert_record, iter_unpushed_pages
+
+
+def _seed(db_path, count, pushed_ids=()):
+    for i in range(1, count + 1):
+        insert_record(
+            db_path,
+            GeigerRecord(
+                id=None,
+                raw="RAW",
+                counts_per_second=i,
+                counts_per_minute=i * 60,
+                microsieverts_per_hour=0.1,
+                mode="SLOW",
+                device_id="test",
+                timestamp=datetime.now(timezone.utc),
+                pushed=i in pushed_ids,
+            ),
+        )
+
+
+def test_iter_unpushed_pages_uses_id_ordered_pages(temp_db):
+    _seed(temp_db, 7, pushed_ids={2, 5})
+
+    pages = list(iter_unpushed_pages(temp_db, page_size=2))
+
+    assert [[r.id for r in page] for page in pages] == [[1, 3], [4, 6], [7]]
+
+
+def test_iter_unpushed_pages_respects_max_id(temp_db):
+    _seed(temp_db, 5)
+
+    pages = list(iter_unpushed_pages(temp_db, page_size=10, max_id=3))
+
+    assert [r.id for r in pages[0]] == [1, 2, 3]
+
+
+def test_replay_once_pushes_and_marks_batches(temp_db):
+    _seed(temp_db, 5)
+    batches = []
+
+    replayer = BacklogReplayer(
+        db_path=temp_db,
+        push_batch=lambda b: batches.append([r.id for r in b]) or True,
+        batch_size=2,
+        max_records_per_second=1e6,
+    )
+
+    assert replayer.replay_once() == 5
+    assert batches == [[1, 2], [3, 4], [5]]
+    assert get_unpushed_records(temp_db) == []
+
+
+def test_replay_once_stops_on_first_failed_batch(temp_db):
+    _seed(temp_db, 4)
+    calls = {"n": 0}
+
+    def push(batch):
+        calls["n"] += 1
+        return calls["n"] == 1
+
+    replayer = BacklogReplayer(
+        db_path=temp_db,
+        push_batch=push,
+        batch_size=2,
+        max_records_per_second=1e6,
+    )
+
+    assert replayer.replay_once() == 2
+    assert replayer.failed_batches == 1
+    assert [r.id for r in get_unpushed_records(temp_db)] == [3, 4]
+
+
+def test_replay_once_skips_rows_above_horizon(temp_db):
+    _seed(temp_db, 4)
+
+    replayer = BacklogReplayer(
+        db_path=temp_db,
+        push_batch=lambda b: True,
+        horizon=lambda: 2,
+        max_records_per_second=1e6,
+    )
+
+    assert replayer.replay_once() == 2
+    assert [r.id for r in get_unpushed_records(temp_db)] == [3, 4]
+
+
+def test_replay_shares_group_commit_store(tmp_path):
+    db_path = str(tmp_path / "replay.db")
+    client = PushClient(
+        api_url="http://example.com",
+        api_token="",
+        device_id="test",
+        db_path=db_path,
+        commit_max_rows=5,
+        commit_max_delay_ms=60_000,
+    )
+    try:
+        # Live pushes fail; the sixth row leaves a write transaction open
+        with patch.object(PushClient, "_push_single", return_value=False):
+            for i in range(6):
+                client.handle_record(
+                    {"raw": "RAW", "cps": i, "cpm": i * 60, "usv": 0.1, "mode": "SLOW"}
+                )
+        assert client.store.writer.pending_rows == 1
+
+        batches = []
+        replayer = BacklogReplayer(
+            db_path=db_path,
+            push_batch=lambda b: batches.append([r.id for r in b]) or True,
+            horizon=client.replay_horizon,
+            max_records_per_second=1e6,
+            store=client.store,
+        )
+
+        assert replayer.replay_once() == 6
+        assert replayer.replay_once() == 0
+        assert batches == [[1, 2, 3, 4, 5, 6]]
+    finally:
+        client.close()
+
+    assert get_unpushed_records(db_path) == []
+
+
+def test_replay_once_pushes_around_a_rejected_row(temp_db):
+    _seed(temp_db, 6)
+    pushed = []
+
+    def push(batch):
+        if any(r.id == 2 for r in batch):
+            raise BatchRejected(422)
+        pushed.extend(r.id for r in batch)
+        return True
+
+    replayer = BacklogReplayer(
+        db_path=temp_db,
+        push_batch=push,
+        batch_size=4,
+        max_records_per_second=1e6,
+    )
+
+    assert replayer.replay_once() == 5
+    assert sorted(pushed) == [1, 3, 4, 5, 6]
+    assert replayer.rejected_records == 1
+    assert replayer.failed_batches == 0
+    # Left for the next pass, which no longer stalls on it
+    assert [r.id for r in get_unpushed_records(temp_db)] == [2]
+    assert replayer.replay_once() == 0
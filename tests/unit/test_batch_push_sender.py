@@ -0,0 +1,218 @@
+# filename: tests/unit/test_batch_push_sender.py
+
+import sqlite3
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from app.ingestion.api_client import PushClient
+from app.ingestion.batch_sender import BatchPushSender, BatchRejected
+from app.models import GeigerRecord
+from app.sqlite_store import initialize_db
+
+
+def _record(i):
+    return GeigerRecord(
+        id=i,
+        raw=f"CPS, {i}, CPM, {i * 60}, uSv/hr, 0.10, SLOW",
+        counts_per_second=i,
+        counts_per_minute=i * 60,
+        microsieverts_per_hour=0.10,
+        mode="SLOW",
+        device_id="test",
+        timestamp=datetime.now(timezone.utc),
+    )
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_sender_flushes_full_batches():
+    batches = []
+    pushed = []
+
+    sender = BatchPushSender(
+        push_batch=lambda b: batches.append(list(b)) or True,
+        on_pushed=pushed.extend,
+        batch_size=3,
+        max_batch_age=10.0,
+    )
+    for i in range(1, 7):
+        sender.enqueue(_record(i))
+    sender.start()
+
+    assert _wait_for(lambda: len(pushed) == 6)
+    sender.stop()
+
+    assert [len(b) for b in batches] == [3, 3]
+    assert pushed == [1, 2, 3, 4, 5, 6]
+
+
+def test_sender_flushes_partial_batch_after_max_age():
+    pushed = []
+
+    sender = BatchPushSender(
+        push_batch=lambda b: True,
+        on_pushed=pushed.extend,
+        batch_size=100,
+        max_batch_age=0.05,
+    )
+    sender.start()
+    sender.enqueue(_record(1))
+
+    assert _wait_for(lambda: pushed == [1])
+    sender.stop()
+
+
+def test_sender_retries_failed_batch():
+    attempts = {"n": 0}
+    pushed = []
+
+    def flaky(batch):
+        attempts["n"] += 1
+        return attempts["n"] > 1
+
+    sender = BatchPushSender(
+        push_batch=flaky,
+        on_pushed=pushed.extend,
+        batch_size=1,
+        max_batch_age=0.01,
+        max_backoff=0.01,
+    )
+
+    with patch.object(sender._stop_event, "wait", return_value=False):
+        sender.start()
+        sender.enqueue(_record(7))
+        assert _wait_for(lambda: pushed == [7])
+
+    sender.stop()
+    assert sender.failed_batches == 1
+    assert sender.sent_batches == 1
+
+
+def test_sender_gives_up_on_rejected_batch():
+    pushed = []
+
+    def reject_seven(batch):
+        if batch[0].id == 7:
+            raise BatchRejected(400)
+        return True
+
+    sender = BatchPushSender(
+        push_batch=reject_seven,
+        on_pushed=pushed.extend,
+        batch_size=1,
+        max_batch_age=0.01,
+    )
+    sender.start()
+    sender.enqueue(_record(7))
+    sender.enqueue(_record(8))
+
+    # The rejected batch does not block the next one, nor the replay horizon
+    assert _wait_for(lambda: pushed == [8])
+    sender.stop()
+    assert sender.rejected_batches == 1
+    assert sender.failed_batches == 0
+    assert sender.pending_floor() is None
+
+
+@pytest.mark.parametrize(
+    "status, rejected", [(400, True), (422, True), (429, False), (503, False)]
+)
+def test_push_batch_rejects_only_permanent_client_errors(tmp_path, status, rejected):
+    client = PushClient(
+        api_url="http://example.com",
+        api_token="",
+        device_id="test",
+        db_path=str(tmp_path / "push.db"),
+    )
+    response = requests.Response()
+    response.status_code = status
+    try:
+        with patch.object(client._wire, "post", return_value=response):
+            if rejected:
+                with pytest.raises(BatchRejected):
+                    client.push_batch([_record(1)])
+            else:
+                assert client.push_batch([_record(1)]) is False
+    finally:
+        client.close()
+
+
+def test_sender_reports_full_queue():
+    sender = BatchPushSender(
+        push_batch=lambda b: True,
+        on_pushed=lambda ids: None,
+        max_queue=1,
+    )
+
+    assert sender.enqueue(_record(1)) is True
+    assert sender.enqueue(_record(2)) is False
+    assert sender.dropped_records == 1
+
+
+def test_pending_floor_tracks_out_of_order_ids():
+    sender = BatchPushSender(
+        push_batch=lambda b: True, on_pushed=lambda ids: None, batch_size=2
+    )
+    assert sender.pending_floor() is None
+
+    # Two devices: row 5 is enqueued after row 6
+    for i in (6, 5, 7, 8):
+        sender.enqueue(_record(i))
+    assert sender.pending_floor() == 5
+
+    assert sender._send_once(sender._drain_nowait())  # rows 6, 5
+    assert sender.pending_floor() == 7
+    assert sender._send_once(sender._drain_nowait())
+    assert sender.pending_floor() is None
+
+
+def test_push_client_batch_mode_marks_rows_pushed(tmp_path):
+    db_path = str(tmp_path / "batch.db")
+    initialize_db(db_path)
+
+    with patch.object(PushClient, "push_batch", return_value=True) as push:
+        client = PushClient(
+            api_url="http://example.com",
+            api_token="",
+            device_id="test",
+            db_path=db_path,
+            push_mode="batch",
+            batch_size=2,
+            batch_max_age=0.05,
+        )
+        for cps in (1, 2, 3):
+            client.handle_record(
+                {
+                    "raw": "RAW",
+                    "cps": cps,
+                    "cpm": cps * 60,
+                    "usv": 0.1,
+                    "mode": "SLOW",
+                }
+            )
+
+        def all_pushed():
+            conn = sqlite3.connect(db_path)
+            try:
+                (n,) = conn.execute(
+                    "SELECT COUNT(*) FROM geiger_readings WHERE pushed = 1"
+                ).fetchone()
+                return n == 3
+            finally:
+                conn.close()
+
+        assert _wait_for(all_pushed)
+        client.close()
+
+    assert push.call_count == 2
@@ -0,0 +1,43 @@
+# filename: tests/unit/test_export_cli.py
+
+import json
+from datetime import datetime, timezone
+
+from app.export import iter_rows, main
+from app.models import GeigerRecord
+from app.sqlite_store import insert_record
+
+
+def _seed(db_path, count):
+    for i in range(count):
+        insert_record(
+            db_path,
+            GeigerRecord(
+                id=None,
+                raw="RAW",
+                counts_per_second=i,
+                counts_per_minute=i * 60,
+                microsieverts_per_hour=0.1,
+                mode="SLOW",
+                device_id="pi-log",
+                timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            ),
+        )
+
+
+def test_iter_rows_yields_bounded_chunks(temp_db):
+    _seed(temp_db, 5)
+
+    chunks = list(iter_rows(temp_db, chunk_rows=2))
+
+    assert [len(c) for c in chunks] == [2, 2, 1]
+
+
+def test_cli_writes_ndjson_file(temp_db, tmp_path):
+    _seed(temp_db, 3)
+    out = tmp_path / "export.ndjson"
+
+    assert main(["--db", temp_db, "--format", "ndjson", "--output", str(out)]) == 0
+
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["cps"] for r in rows] == [0, 1, 2]
@@ -0,0 +1,124 @@
+# filename: tests/unit/test_group_commit_writer.py
+
+import sqlite3
+import time
+
+import pytest
+
+from app.sqlite_store import DEFAULT_COMMIT_MAX_DELAY_MS, GroupCommitWriter, SQLiteStore
+
+INSERT_SQL = """
+INSERT INTO geiger_readings (
+    raw, counts_per_second, counts_per_minute,
+    microsieverts_per_hour, mode, device_id, timestamp, pushed
+) VALUES ('RAW', ?, 60, 0.1, 'SLOW', 'test', '2025-01-01T00:00:00', 0)
+"""
+
+
+def _committed_count(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        (n,) = conn.execute("SELECT COUNT(*) FROM geiger_readings").fetchone()
+        return n
+    finally:
+        conn.close()
+
+
+def test_writer_commits_every_write_by_default(temp_db):
+    conn = sqlite3.connect(temp_db, check_same_thread=False)
+    writer = GroupCommitWriter(conn)
+
+    writer.insert(INSERT_SQL, (1,))
+
+    assert _committed_count(temp_db) == 1
+    assert writer.pending_rows == 0
+    writer.close()
+    conn.close()
+
+
+def test_writer_groups_rows_until_max_rows(temp_db):
+    conn = sqlite3.connect(temp_db, check_same_thread=False)
+    writer = GroupCommitWriter(conn, max_rows=3, max_delay_ms=60_000)
+
+    ids = [writer.insert(INSERT_SQL, (i,)) for i in range(2)]
+    assert ids == [1, 2]
+    assert writer.pending_rows == 2
+    assert _committed_count(temp_db) == 0
+
+    writer.insert(INSERT_SQL, (3,))
+    assert writer.pending_rows == 0
+    assert _committed_count(temp_db) == 3
+    assert writer.commits == 1
+
+    writer.close()
+    conn.close()
+
+
+def test_writer_flushes_after_max_delay_without_new_writes(temp_db):
+    conn = sqlite3.connect(temp_db, check_same_thread=False)
+    writer = GroupCommitWriter(conn, max_rows=100, max_delay_ms=20)
+
+    writer.insert(INSERT_SQL, (1,))
+
+    deadline = time.time() + 2.0
+    while writer.pending_rows and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert writer.pending_rows == 0
+    assert _committed_count(temp_db) == 1
+    writer.close()
+    conn.close()
+
+
+def test_writer_close_commits_pending_updates(temp_db):
+    conn = sqlite3.connect(temp_db, check_same_thread=False)
+    writer = GroupCommitWriter(conn, max_rows=100, max_delay_ms=60_000)
+
+    row_id = writer.insert(INSERT_SQL, (1,))
+    writer.execute("UPDATE geiger_readings SET pushed = 1 WHERE id = ?", (row_id,))
+    writer.close()
+
+    check = sqlite3.connect(temp_db)
+    (pushed,) = check.execute(
+        "SELECT pushed FROM geiger_readings WHERE id = ?", (row_id,)
+    ).fetchone()
+    check.close()
+    conn.close()
+
+    assert pushed == 1
+
+
+def test_writer_requires_delay_bound_for_grouping(temp_db):
+    conn = sqlite3.connect(temp_db, check_same_thread=False)
+    try:
+        with pytest.raises(ValueError):
+            GroupCommitWriter(conn, max_rows=5, max_delay_ms=0)
+    finally:
+        conn.close()
+
+    # The store supplies a default deadline, so its flusher runs
+    store = SQLiteStore(temp_db, commit_max_rows=5)
+    try:
+        assert store.writer.max_delay == DEFAULT_COMMIT_MAX_DELAY_MS / 1000.0
+        assert store.writer._flusher is not None
+    finally:
+        store.close()
+
+
+def test_after_commit_waits_for_pending_rows(temp_db):
+    conn = sqlite3.connect(temp_db, check_same_thread=False)
+    writer = GroupCommitWriter(conn, max_rows=2, max_delay_ms=60_000)
+    seen = []
+
+    writer.insert(INSERT_SQL, (1,))
+    writer.after_commit(lambda: seen.append(_committed_count(temp_db)))
+    assert seen == []
+
+    writer.insert(INSERT_SQL, (2,))
+    assert seen == [2]
+
+    # Nothing pending: runs right away
+    writer.after_commit(lambda: seen.append("now"))
+    assert seen == [2, "now"]
+    writer.close()
+    conn.close()
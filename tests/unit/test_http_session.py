@@ -0,0 +1,69 @@
+# filename: tests/unit/test_http_session.py
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from app.http_session import PooledSession, configure_session, get_session
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pooled_session_reuses_connections(local_server):
+    http = PooledSession()
+    try:
+        for _ in range(5):
+            resp = http.post(f"{local_server}/ingest", json={"cps": 1})
+            assert resp.status_code == 200
+
+        stats = http.stats()
+    finally:
+        http.close()
+
+    assert stats["requests"] == 5
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 4
+
+
+def test_pooled_session_applies_default_timeouts():
+    http = PooledSession(connect_timeout=1.5, read_timeout=4.0)
+
+    with patch.object(http.session, "request") as request:
+        http.post("http://example.invalid/ingest", json={})
+
+    assert request.call_args.kwargs["timeout"] == (1.5, 4.0)
+
+
+def test_configure_session_replaces_shared_session():
+    first = get_session()
+    second = configure_session(pool_maxsize=2)
+
+    assert second is not first
+    assert get_session() is second
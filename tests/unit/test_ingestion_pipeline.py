@@ -0,0 +1,148 @@
+# filename: tests/unit/test_ingestion_pipeline.py
+
+import threading
+import time
+
+import pytest
+
+from app.ingestion.pipeline import IngestionPipeline, LineBuffer
+
+LINE = "CPS, {0}, CPM, {1}, uSv/hr, 0.10, SLOW"
+
+
+class FakeReader:
+    def __init__(self, lines):
+        self._lines = list(lines)
+
+    def read_line(self):
+        if self._lines:
+            return self._lines.pop(0)
+        time.sleep(0.01)
+        return ""
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _drain(buf):
+    out = []
+    while True:
+        item = buf.get(timeout=0)
+        if item is None:
+            return out
+        out.append(item[0])
+
+
+def test_drop_oldest_discards_and_counts():
+    buf = LineBuffer(capacity=2, overflow="drop_oldest")
+    for line in ("a", "b", "c", "d"):
+        buf.put(line)
+
+    assert _drain(buf) == ["c", "d"]
+    assert buf.dropped == 2
+
+
+def test_spill_preserves_fifo_order(tmp_path):
+    spill = tmp_path / "spill.txt"
+    buf = LineBuffer(capacity=2, overflow="spill", spill_path=str(spill))
+    for line in ("a", "b", "c", "d"):
+        buf.put(line)
+
+    assert len(buf) == 4
+    assert buf.spilled == 2
+
+    # A line arriving while the spill is pending queues behind it
+    assert buf.get(timeout=0)[0] == "a"
+    buf.put("e")
+
+    assert _drain(buf) == ["b", "c", "d", "e"]
+    assert spill.read_text() == ""
+
+
+def test_spill_resumes_after_restart_without_replaying(tmp_path):
+    spill = tmp_path / "spill.txt"
+    buf = LineBuffer(capacity=1, overflow="spill", spill_path=str(spill))
+    for line in ("a", "b", "c", "d"):
+        buf.put(line)
+
+    # "a" from memory, "b" from the spill file, then a crash
+    assert [buf.get(timeout=0)[0] for _ in range(2)] == ["a", "b"]
+    with open(spill, "ab") as f:
+        f.write(b"tor")
+
+    restarted = LineBuffer(capacity=1, overflow="spill", spill_path=str(spill))
+    assert len(restarted) == 2
+    restarted.put("e")
+    assert _drain(restarted) == ["c", "d", "e"]
+    assert spill.read_text() == ""
+    assert not (tmp_path / "spill.txt.offset").exists()
+
+
+def test_block_waits_for_space():
+    buf = LineBuffer(capacity=1, overflow="block")
+    buf.put("a")
+
+    t = threading.Thread(target=buf.put, args=("b",), daemon=True)
+    t.start()
+    time.sleep(0.05)
+    assert t.is_alive()
+
+    assert buf.get(timeout=0)[0] == "a"
+    t.join(1.0)
+    assert not t.is_alive()
+    assert buf.get(timeout=0)[0] == "b"
+
+
+def test_spill_requires_path():
+    with pytest.raises(ValueError):
+        LineBuffer(overflow="spill")
+
+
+def test_pipeline_parses_and_handles_lines():
+    handled = []
+    reader = FakeReader([LINE.format(1, 60), "garbage", LINE.format(2, 120)])
+
+    pipeline = IngestionPipeline(reader=reader, handler=handled.append)
+    pipeline.start()
+    assert _wait_for(lambda: len(handled) == 2)
+    pipeline.stop()
+
+    assert [p["cps"] for p in handled] == [1, 2]
+
+    stats = pipeline.stats()
+    assert stats["lines_read"] == 3
+    assert stats["parse_failures"] == 1
+    assert stats["latency"]["handle"]["count"] == 2
+
+
+def test_slow_handler_does_not_stall_reader():
+    release = threading.Event()
+    handled = []
+
+    def slow_handler(parsed):
+        release.wait(2.0)
+        handled.append(parsed)
+
+    lines = [LINE.format(i, i * 60) for i in range(10)]
+    pipeline = IngestionPipeline(
+        reader=FakeReader(lines),
+        handler=slow_handler,
+        buffer=LineBuffer(capacity=4, overflow="drop_oldest"),
+    )
+    pipeline.start()
+
+    # All lines are read while the consumer is stuck on the first one
+    assert _wait_for(lambda: pipeline.lines_read == 10)
+    release.set()
+    pipeline.stop()
+
+    # Every line was either handled or counted as dropped; newest survive
+    assert pipeline.buffer.dropped >= 5
+    assert len(handled) + pipeline.buffer.dropped == 10
+    assert handled[-1]["cps"] == 9
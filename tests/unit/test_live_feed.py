@@ -0,0 +1,270 @@
+# filename: tests/unit/test_live_feed.py
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.api import Store
+from app.ingestion.api_client import PushClient
+from app.live_feed import WAIT_REOPEN_INTERVAL, LiveFeedReader, LiveFeedWriter
+from app.models import GeigerRecord
+from app.sqlite_store import get_store, initialize_db
+
+BASE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _record(row_id, cps):
+    return GeigerRecord(
+        id=row_id,
+        raw=f"CPS, {cps}, CPM, {cps * 60}, uSv/hr, 0.10, SLOW",
+        counts_per_second=cps,
+        counts_per_minute=cps * 60,
+        microsieverts_per_hour=0.10,
+        mode="SLOW",
+        device_id="test",
+        timestamp=BASE + timedelta(seconds=cps),
+    )
+
+
+def test_publish_and_read(tmp_path):
+    path = str(tmp_path / "live.feed")
+    writer = LiveFeedWriter(path, capacity=8)
+    reader = LiveFeedReader(path, reopen_interval=0)
+    try:
+        assert reader.latest() is None
+        assert reader.seq() == 0
+
+        writer.publish(_record(1, 5))
+        writer.publish(_record(2, 6))
+
+        latest = reader.latest()
+        assert latest == {
+            "id": 2,
+            "raw": "CPS, 6, CPM, 360, uSv/hr, 0.10, SLOW",
+            "cps": 6,
+            "cpm": 360,
+            "mode": "SLOW",
+            "device_id": "test",
+            "timestamp": (BASE + timedelta(seconds=6)).isoformat(),
+        }
+        assert reader.seq() == 2
+        assert reader.max_id() == 2
+        assert [r["id"] for r in reader.since(1)] == [2]
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_ring_wraps_and_keeps_newest(tmp_path):
+    path = str(tmp_path / "live.feed")
+    writer = LiveFeedWriter(path, capacity=4)
+    reader = LiveFeedReader(path, reopen_interval=0)
+    try:
+        for i in range(1, 11):
+            writer.publish(_record(i, i))
+
+        assert [r["id"] for r in reader.recent(10)] == [10, 9, 8, 7]
+        # Readings older than the ring are gone; since() returns what is left
+        assert [r["id"] for r in reader.since(2)] == [7, 8, 9, 10]
+        assert [r["id"] for r in reader.since(0, limit=2)] == [9, 10]
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_reader_follows_writer_restart(tmp_path):
+    path = str(tmp_path / "live.feed")
+    reader = LiveFeedReader(path, reopen_interval=0)
+
+    # No feed yet: callers fall back to SQLite
+    assert reader.latest() is None
+    assert reader.max_id() is None
+
+    first = LiveFeedWriter(path, capacity=4)
+    for i in range(1, 4):
+        first.publish(_record(i, i))
+    assert reader.seq() == 3
+    first.close()
+
+    second = LiveFeedWriter(path, capacity=4)
+    second.publish(_record(4, 40))
+    try:
+        assert reader.latest()["cps"] == 40
+        # seq went backwards: since() starts over from the new ring
+        assert [r["id"] for r in reader.since(3)] == [4]
+    finally:
+        reader.close()
+        second.close()
+
+
+def test_rejects_foreign_file(tmp_path):
+    path = tmp_path / "live.feed"
+    path.write_bytes(b"not a feed" * 100)
+
+    reader = LiveFeedReader(str(path), reopen_interval=0)
+    assert reader.latest() is None
+    assert reader.seq() is None
+
+
+def test_wait_wakes_on_publish(tmp_path):
+    path = str(tmp_path / "live.feed")
+    writer = LiveFeedWriter(path, capacity=4)
+    reader = LiveFeedReader(path, reopen_interval=0)
+    try:
+        assert reader.wait(0, timeout=0.05, poll=0.01) == 0
+
+        timer = threading.Timer(0.05, writer.publish, args=(_record(1, 1),))
+        timer.start()
+        assert reader.wait(0, timeout=2.0, poll=0.01) == 1
+        timer.join()
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_long_wait_follows_writer_restart(tmp_path):
+    path = str(tmp_path / "live.feed")
+    first = LiveFeedWriter(path, capacity=4)
+    first.publish(_record(1, 1))
+    # Default reopen_interval: wait() must still recheck the inode sooner
+    reader = LiveFeedReader(path)
+    assert reader.seq() == 1
+    writers = [first]
+
+    def restart():
+        first.close()
+        second = LiveFeedWriter(path, capacity=4)
+        writers.append(second)
+        second.publish(_record(2, 2))
+        second.publish(_record(3, 3))
+
+    timer = threading.Timer(0.05, restart)
+    timer.start()
+    try:
+        started = time.monotonic()
+        assert reader.wait(1, timeout=3.0, poll=0.01) == 2
+        assert time.monotonic() - started < WAIT_REOPEN_INTERVAL + 1.0
+    finally:
+        timer.join()
+        reader.close()
+        for writer in writers:
+            writer.close()
+
+
+def test_store_prefers_live_feed(temp_db, tmp_path):
+    path = str(tmp_path / "live.feed")
+    writer = LiveFeedWriter(path, capacity=4)
+    store = Store(temp_db, live_feed_path=path)
+    try:
+        record = _record(None, 7)
+        record.id = get_store(temp_db).insert_record(record)
+        writer.publish(record)
+
+        latest = store.get_latest_reading()
+        assert latest["id"] == record.id
+        assert latest["cps"] == 7
+
+        assert [r["cps"] for r in store.get_recent_readings(5)] == [7]
+
+        # The feed has not moved since it was first seen: SQLite decides
+        unpublished = _record(None, 8)
+        unpublished.id = get_store(temp_db).insert_record(unpublished)
+        assert [r["cps"] for r in store.get_recent_readings(5)] == [8, 7]
+
+        # Once the feed moves, rows it has not announced are not looked up
+        writer.publish(unpublished)
+        assert [r["cps"] for r in store.get_recent_readings(5)] == [8, 7]
+        unannounced = _record(None, 9)
+        unannounced.id = get_store(temp_db).insert_record(unannounced)
+        assert [r["cps"] for r in store.get_recent_readings(5)] == [8, 7]
+
+        writer.publish(unannounced)
+        assert [r["cps"] for r in store.get_recent_readings(5)] == [9, 8, 7]
+    finally:
+        store.close()
+        writer.close()
+
+
+def test_push_client_publishes_stored_rows(tmp_path):
+    db_path = str(tmp_path / "feed.db")
+    initialize_db(db_path)
+    path = str(tmp_path / "live.feed")
+    writer = LiveFeedWriter(path, capacity=4)
+    reader = LiveFeedReader(path, reopen_interval=0)
+
+    with patch.object(PushClient, "_push_single", return_value=True):
+        client = PushClient(
+            api_url="http://example.com",
+            api_token="",
+            device_id="garage",
+            db_path=db_path,
+            live_feed=writer,
+        )
+        client.handle_record(
+            {"raw": "RAW", "cps": 3, "cpm": 180, "usv": 0.1, "mode": "SLOW"}
+        )
+        client.close()
+
+    try:
+        latest = reader.latest()
+        assert latest["id"] == 1
+        assert latest["device_id"] == "garage"
+        assert reader.max_id() == 1
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_push_client_publishes_only_after_group_commit(tmp_path):
+    db_path = str(tmp_path / "feed.db")
+    initialize_db(db_path)
+    path = str(tmp_path / "live.feed")
+    writer = LiveFeedWriter(path, capacity=4)
+    reader = LiveFeedReader(path, reopen_interval=0)
+
+    with patch.object(PushClient, "_push_single", return_value=True):
+        client = PushClient(
+            api_url="http://example.com",
+            api_token="",
+            device_id="garage",
+            db_path=db_path,
+            commit_max_rows=10,
+            commit_max_delay_ms=60_000,
+            live_feed=writer,
+        )
+        try:
+            client.handle_record(
+                {"raw": "RAW", "cps": 3, "cpm": 180, "usv": 0.1, "mode": "SLOW"}
+            )
+            assert client.store.writer.pending_rows == 1
+            assert reader.latest() is None
+
+            client.store.flush()
+            assert reader.latest()["id"] == 1
+        finally:
+            client.close()
+            reader.close()
+            writer.close()
+
+
+@pytest.mark.parametrize("cache_rows", [0, 10])
+def test_stale_feed_does_not_hide_newer_rows(temp_db, tmp_path, cache_rows):
+    path = str(tmp_path / "live.feed")
+    writer = LiveFeedWriter(path, capacity=4)
+    published = _record(None, 7)
+    published.id = get_store(temp_db).insert_record(published)
+    writer.publish(published)
+    # Agent gone, feed file left behind; another writer adds a row
+    writer.close()
+    get_store(temp_db).insert_record(_record(None, 8))
+
+    store = Store(temp_db, cache_rows=cache_rows, live_feed_path=path)
+    try:
+        latest = store.get_latest_reading()
+        assert latest["cps"] == 8
+        assert latest == store.get_recent_readings(1)[0]
+    finally:
+        store.close()
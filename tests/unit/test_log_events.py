@@ -0,0 +1,80 @@
+# filename: tests/unit/test_log_events.py
+
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+
+from app.log_events import (
+    _stdlib_dumps,
+    encode_event,
+    encode_events,
+    format_timestamp,
+    record_to_event,
+)
+from app.logging import JSONFormatter
+
+
+def _record(msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord("pi-log", logging.WARNING, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_event_uses_record_created_and_extras_only():
+    record = _record(device_id="garage", row_id=7)
+    record.created = datetime(2025, 1, 2, 3, 4, 5, 500000, timezone.utc).timestamp()
+
+    event = record_to_event(record)
+    assert event == {
+        "ts": "2025-01-02T03:04:05.500Z",
+        "level": "warning",
+        "logger": "pi-log",
+        "msg": "hello world",
+        "device_id": "garage",
+        "row_id": 7,
+    }
+
+
+def test_timestamp_cache_rolls_over_seconds():
+    assert format_timestamp(0.5) == "1970-01-01T00:00:00.500Z"
+    assert format_timestamp(1.25) == "1970-01-01T00:00:01.250Z"
+    assert format_timestamp(0.0) == "1970-01-01T00:00:00.000Z"
+
+
+def test_non_serializable_extras_are_stringified():
+    when = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    event = record_to_event(
+        _record(when=when, error=ValueError("bad"), counts={1: 2}, big=2**70)
+    )
+
+    for encoded in (encode_event(event), _stdlib_dumps(event)):
+        decoded = json.loads(encoded)
+        assert decoded["when"] == str(when)
+        assert decoded["error"] == "bad"
+        assert decoded["counts"] == {"1": 2}
+        assert decoded["big"] == 2**70
+
+
+def test_batch_encoding_and_formatter():
+    events = [record_to_event(_record()), record_to_event(_record(n=1))]
+    assert [e["msg"] for e in json.loads(encode_events(events))] == [
+        "hello world",
+        "hello world",
+    ]
+
+    line = JSONFormatter().format(_record(device_id="attic"))
+    assert json.loads(line)["device_id"] == "attic"
+
+
+def test_exception_text_is_included():
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        record = logging.LogRecord(
+            "pi-log", logging.ERROR, __file__, 1, "failed", (), sys.exc_info()
+        )
+
+    event = record_to_event(record)
+    assert "RuntimeError: boom" in event["exc"]
+    json.loads(encode_event(event))
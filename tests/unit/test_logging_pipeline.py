@@ -0,0 +1,103 @@
+# filename: tests/unit/test_logging_pipeline.py
+
+import json
+import logging
+from types import SimpleNamespace
+
+from app.ingestion.watchdog import WatchdogSerialReader
+from app.logging import (
+    READINGS_LOGGER,
+    DroppingQueueHandler,
+    RateLimitFilter,
+    logging_stats,
+    setup_logging,
+    shutdown_logging,
+)
+
+VALID = "CPS, 17, CPM, 1020, uSv/hr, 0.09, SLOW"
+
+
+def _record(msg, level=logging.DEBUG, created=0.0):
+    record = logging.LogRecord(READINGS_LOGGER, level, __file__, 1, msg, (), None)
+    record.created = created
+    return record
+
+
+def test_rate_limit_filter_per_template():
+    f = RateLimitFilter(interval=10.0)
+
+    assert f.filter(_record("RAW: %r", created=0.0))
+    assert f.filter(_record("PARSED: %s", created=0.0))
+    assert not f.filter(_record("RAW: %r", created=1.0))
+    assert not f.filter(_record("RAW: %r", created=2.0))
+
+    # Anomalies are never rate-limited
+    assert f.filter(_record("parse_failed", logging.WARNING, created=3.0))
+
+    # Next window: passes and reports what was suppressed
+    record = _record("RAW: %r", created=10.0)
+    assert f.filter(record)
+    assert record.suppressed == 2
+    assert f.suppressed_total == 2
+
+
+def test_rate_limit_disabled_with_zero_interval():
+    f = RateLimitFilter(interval=0)
+    assert all(f.filter(_record("RAW: %r", created=0.0)) for _ in range(5))
+
+
+def test_setup_logging_writes_through_queue(tmp_path):
+    config = SimpleNamespace(
+        logging=SimpleNamespace(
+            log_dir=str(tmp_path), level="DEBUG", readings_interval=60.0
+        )
+    )
+    setup_logging(config)
+    try:
+        root = logging.getLogger()
+        assert [type(h) for h in root.handlers] == [DroppingQueueHandler]
+
+        readings = logging.getLogger(READINGS_LOGGER)
+        for _ in range(5):
+            readings.debug("RAW: %r", VALID)
+        logging.getLogger("test").info("hello", extra={"device_id": "garage"})
+
+        stats = logging_stats()
+        assert stats["readings_suppressed"] == 4
+        assert stats["dropped"] == 0
+    finally:
+        shutdown_logging()
+
+    lines = (tmp_path / "pi-log.jsonl").read_text().splitlines()
+    events = [json.loads(line) for line in lines]
+    assert [e["msg"] for e in events] == [f"RAW: {VALID!r}", "hello"]
+    assert events[1]["device_id"] == "garage"
+
+
+class ScriptedReader:
+    def __init__(self, lines):
+        self.lines = list(lines)
+        self.ser = None
+
+    def set_handler(self, handler):
+        pass
+
+    def read_line(self):
+        if not self.lines:
+            raise KeyboardInterrupt
+        return self.lines.pop(0)
+
+
+def test_serial_loop_keeps_anomalies_at_warning(caplog):
+    handled = []
+    wd = WatchdogSerialReader(ScriptedReader(["", "garbage", VALID]))
+    wd.set_handler(handled.append)
+
+    with caplog.at_level(logging.INFO):
+        wd.run()
+
+    assert [p["cps"] for p in handled] == [17]
+    warnings = [r for r in caplog.records if r.levelno >= logging.WARNING]
+    assert [(r.getMessage(), r.raw) for r in warnings] == [("parse_failed", "garbage")]
+    # Per-reading messages stay at DEBUG
+    assert not [r for r in caplog.records if r.getMessage().startswith("RAW")]
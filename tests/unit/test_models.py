@@ -0,0 +1,50 @@
+# filename: tests/unit/test_models.py
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models import DB_INSERT_COLUMNS, LOGEXP_FIELDS, GeigerRecord
+
+
+def _record():
+    return GeigerRecord(
+        id=7,
+        raw="CPS, 2, CPM, 120, uSv/hr, 0.20, slow",
+        counts_per_second=2,
+        counts_per_minute=120,
+        microsieverts_per_hour=0.20,
+        mode="slow",
+        device_id="test",
+        timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def test_record_is_slotted():
+    record = _record()
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+
+def test_to_dict_serialises_timestamp():
+    d = _record().to_dict()
+    assert d["timestamp"] == "2025-01-01T00:00:00+00:00"
+    assert d["id"] == 7
+    assert d["pushed"] is False
+
+
+def test_db_tuple_round_trip():
+    record = _record()
+    row = record.to_db_tuple()
+
+    assert len(row) == len(DB_INSERT_COLUMNS)
+    assert GeigerRecord.from_db_tuple((record.id,) + row) == record
+
+
+def test_logexp_tuple_matches_payload():
+    record = _record()
+    payload = record.to_logexp_payload()
+
+    assert record.to_logexp_tuple() == tuple(payload[f] for f in LOGEXP_FIELDS)
+    assert payload["mode"] == "SLOW"
@@ -0,0 +1,151 @@
+# filename: tests/unit/test_multi_device.py
+
+import asyncio
+import sqlite3
+import textwrap
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.config_loader import load_config
+from app.ingestion.api_client import PushClient
+from app.ingestion.async_agent import AsyncIngestionAgent
+from app.ingestion.devices import (
+    SerialDevice,
+    devices_from_config,
+    parse_device_arg,
+    tag_device,
+)
+from app.ingestion.geiger_reader import build_parser, resolve_devices
+from app.sqlite_store import initialize_db
+
+LINE = "CPS, {0}, CPM, {1}, uSv/hr, 0.10, SLOW"
+
+
+def test_parse_device_arg_with_and_without_id():
+    assert parse_device_arg("/dev/ttyUSB1=attic", "pi", 9600) == SerialDevice(
+        "/dev/ttyUSB1", "attic", 9600
+    )
+    assert parse_device_arg("/dev/ttyUSB0", "pi", 9600).device_id == "pi"
+
+
+def test_devices_from_config_file(tmp_path):
+    path = tmp_path / "config.toml"
+    path.write_text(
+        textwrap.dedent("""
+        [serial]
+        baudrate = 9600
+
+        [[serial.devices]]
+        port = "/dev/ttyUSB0"
+        device_id = "garage"
+
+        [[serial.devices]]
+        port = "/dev/ttyUSB1"
+        device_id = "attic"
+        baudrate = 19200
+    """)
+    )
+
+    devices = devices_from_config(load_config(path).serial, "pi")
+
+    assert devices == [
+        SerialDevice("/dev/ttyUSB0", "garage", 9600),
+        SerialDevice("/dev/ttyUSB1", "attic", 19200),
+    ]
+
+
+def test_devices_from_config_single_device_fallback():
+    devices = devices_from_config({"device": "/dev/ttyUSB0"}, "pi")
+    assert devices == [SerialDevice("/dev/ttyUSB0", "pi", 9600)]
+
+
+def _args(*argv):
+    base = [
+        "--device-type",
+        "mightyohm",
+        "--db",
+        "x.db",
+        "--api-url",
+        "http://example.com",
+        "--device-id",
+        "pi",
+    ]
+    parser = build_parser()
+    return parser, parser.parse_args(base + list(argv))
+
+
+def test_resolve_devices_from_repeated_flags():
+    parser, args = _args("--device", "/dev/a=one", "--device", "/dev/b=two")
+    devices = resolve_devices(args, parser)
+    assert [d.device_id for d in devices] == ["one", "two"]
+
+
+def test_resolve_devices_rejects_duplicate_ports():
+    parser, args = _args("--device", "/dev/a=one", "--device", "/dev/a=two")
+    with pytest.raises(SystemExit):
+        resolve_devices(args, parser)
+
+
+def test_tag_device_injects_device_id():
+    seen = []
+    tag_device(seen.append, "attic")({"cps": 1})
+    assert seen == [{"cps": 1, "device_id": "attic"}]
+
+
+def test_push_client_stores_per_record_device_id(tmp_path):
+    db_path = str(tmp_path / "multi.db")
+    initialize_db(db_path)
+
+    with patch.object(PushClient, "_push_single", return_value=True):
+        client = PushClient(
+            api_url="http://example.com",
+            api_token="",
+            device_id="default",
+            db_path=db_path,
+        )
+        for device_id in ("garage", None):
+            parsed = {"raw": "RAW", "cps": 1, "cpm": 60, "usv": 0.1, "mode": "SLOW"}
+            if device_id:
+                parsed["device_id"] = device_id
+            client.handle_record(parsed)
+        client.close()
+
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT device_id FROM geiger_readings ORDER BY id").fetchall()
+    conn.close()
+    assert rows == [("garage",), ("default",)]
+
+
+class FakeReader:
+    def __init__(self, lines):
+        self._lines = list(lines)
+
+    def read_line(self):
+        if self._lines:
+            return self._lines.pop(0)
+        time.sleep(0.01)
+        return ""
+
+
+def test_async_agent_tags_records_per_reader():
+    handled = []
+    agent = AsyncIngestionAgent(
+        readers=[FakeReader([LINE.format(1, 60)]), FakeReader([LINE.format(2, 120)])],
+        handler=handled.append,
+        device_ids=["garage", "attic"],
+    )
+
+    async def scenario():
+        task = asyncio.create_task(agent.run())
+        while len(handled) < 2:
+            await asyncio.sleep(0.01)
+        agent.stop()
+        await task
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=2.0))
+    assert {(p["cps"], p["device_id"]) for p in handled} == {
+        (1, "garage"),
+        (2, "attic"),
+    }
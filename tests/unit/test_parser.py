@@ -1,6 +1,13 @@
+import random
+
 import pytest
 
-from app.ingestion.csv_parser import parse_geiger_csv
+from app.ingestion.csv_parser import (
+    parse_file,
+    parse_geiger_bytes,
+    parse_geiger_csv,
+    parse_many,
+)
 
 
 def test_parse_valid_line():
@@ -27,3 +34,96 @@ def test_malformed_line_returns_none():
 def test_partial_line_returns_none():
     line = "CPS, 9, CPM, 90"
     assert parse_geiger_csv(line) is None
+
+
+def test_parse_rejects_wrong_tokens():
+    assert parse_geiger_csv("CPX, 9, CPM, 90, uSv/hr, 0.09, FAST") is None
+    assert parse_geiger_csv("CPS, 9, CPM, x, uSv/hr, 0.09, FAST") is None
+
+
+def test_parse_geiger_bytes_matches_str_parser():
+    line = "CPS, 12, CPM, 720, uSv/hr, 4.10, SLOW"
+    assert parse_geiger_bytes(line.encode() + b"\r\n") == parse_geiger_csv(line)
+    assert parse_geiger_bytes(b"garbage") is None
+    assert parse_geiger_bytes(line) is None
+
+
+def test_parse_many_returns_columns_and_counts_rejects():
+    block = (
+        b"CPS, 1, CPM, 60, uSv/hr, 0.01, SLOW\r\n"
+        b"garbage\n"
+        b"\n"
+        b"  CPS, 2, CPM, 120, uSv/hr, 0.02, FAST\n"
+        b"CPS, 3, CPM, 180"
+    )
+
+    cols = parse_many(block, keep_raw=True)
+
+    assert len(cols) == 2
+    assert list(cols.cps) == [1, 2]
+    assert list(cols.cpm) == [60, 120]
+    assert list(cols.usv) == [0.01, 0.02]
+    assert cols.mode == ["SLOW", "FAST"]
+    assert cols.raw == [
+        "CPS, 1, CPM, 60, uSv/hr, 0.01, SLOW",
+        "CPS, 2, CPM, 120, uSv/hr, 0.02, FAST",
+    ]
+    assert cols.rejected == 2
+
+
+def test_parse_many_accepts_iterable_of_lines():
+    lines = [
+        "CPS, 5, CPM, 300, uSv/hr, 0.05, INST",
+        b"CPS, 6, CPM, 360, uSv/hr, 0.06, INST",
+    ]
+    assert list(parse_many(lines).cps) == [5, 6]
+
+
+def test_parse_file_handles_lines_across_chunks(tmp_path):
+    path = tmp_path / "raw.log"
+    lines = [f"CPS, {i}, CPM, {i * 60}, uSv/hr, 0.10, SLOW" for i in range(50)]
+    path.write_text("\n".join(lines))
+
+    cols = parse_file(str(path), chunk_bytes=64)
+
+    assert list(cols.cps) == list(range(50))
+    assert cols.rejected == 0
+
+
+def test_parse_many_rejects_line_torn_across_newline():
+    cols = parse_many(b"CPS, 1, CPM\n60, uSv/hr, 0.01, SLOW")
+    assert len(cols) == 0
+    assert cols.rejected == 2
+
+
+@pytest.mark.parametrize("usv", ["1.", ".5", "1.2.3", "", ".", "1..2", "0.10", "7"])
+def test_parse_many_fast_path_agrees_with_line_parser_on_usv(usv):
+    lines = [
+        "CPS, 1, CPM, 60, uSv/hr, 0.01, SLOW",
+        f"CPS, 2, CPM, 120, uSv/hr, {usv}, SLOW",
+        "CPS, 3, CPM, 180, uSv/hr, 0.03, SLOW",
+    ]
+    expected = [p for p in map(parse_geiger_csv, lines) if p is not None]
+
+    cols = parse_many("\n".join(lines))
+
+    assert list(cols.cps) == [p["cps"] for p in expected]
+    assert list(cols.usv) == [p["usv"] for p in expected]
+    assert cols.rejected == len(lines) - len(expected)
+
+
+def test_parse_many_agrees_with_line_parser_fuzz():
+    rng = random.Random(15)
+    pieces = ["0", "1", "12", ".", "", "5"]
+    for _ in range(500):
+        lines = []
+        for i in range(rng.randint(1, 6)):
+            usv = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 4)))
+            lines.append(f"CPS, {i}, CPM, {i * 60}, uSv/hr, {usv}, SLOW")
+        expected = [p for p in map(parse_geiger_csv, lines) if p is not None]
+
+        cols = parse_many("\n".join(lines))
+
+        assert list(cols.cps) == [p["cps"] for p in expected], lines
+        assert list(cols.usv) == [p["usv"] for p in expected], lines
+        assert cols.rejected == len(lines) - len(expected), lines
@@ -61,3 +61,67 @@ def test_serial_reader_skips_malformed_lines(mock_serial, mock_parse):
     # Only the valid line should be handled
     assert mock_handler.call_count == 1
     assert mock_handler.call_args.args[0]["cps"] == 5
+
+
+class ChunkedPort:
+    """
+    Fake serial port that delivers pre-defined byte chunks via in_waiting.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+        self.reads = 0
+
+    @property
+    def in_waiting(self):
+        return len(self._chunks[0]) if self._chunks else 0
+
+    def read(self, size):
+        self.reads += 1
+        if not self._chunks:
+            return b""
+        chunk = self._chunks.pop(0)
+        if size < len(chunk):
+            self._chunks.insert(0, chunk[size:])
+            chunk = chunk[:size]
+        return chunk
+
+
+@patch("app.ingestion.serial_reader.serial.Serial")
+def test_chunked_reader_splits_multiple_lines_per_read(mock_serial):
+    port = ChunkedPort(
+        [
+            b"CPS, 1, CPM, 60, uSv/hr, 0.01, SLOW\r\n"
+            b"CPS, 2, CPM, 120, uSv/hr, 0.02, SLOW\n"
+        ]
+    )
+    mock_serial.return_value = port
+
+    reader = SerialReader("/dev/ttyUSB0", chunked=True)
+
+    assert reader.read_line().startswith("CPS, 1,")
+    assert reader.read_line().startswith("CPS, 2,")
+    assert port.reads == 1
+    assert reader.read_line() == ""
+
+
+@patch("app.ingestion.serial_reader.serial.Serial")
+def test_chunked_reader_keeps_partial_lines_across_reads(mock_serial):
+    port = ChunkedPort([b"CPS, 3, CPM, 1", b"80, uSv/hr, 0.03, FAST\nCPS, 4"])
+    mock_serial.return_value = port
+
+    reader = SerialReader("/dev/ttyUSB0", chunked=True)
+
+    assert reader.read_line() == "CPS, 3, CPM, 180, uSv/hr, 0.03, FAST"
+    assert bytes(reader._buf) == b"CPS, 4"
+
+
+@patch("app.ingestion.serial_reader.serial.Serial")
+def test_chunked_reader_discards_runaway_partial_line(mock_serial):
+    port = ChunkedPort([b"x" * 5000, b"CPS, 5, CPM, 300, uSv/hr, 0.05, INST\n"])
+    mock_serial.return_value = port
+
+    reader = SerialReader("/dev/ttyUSB0", chunked=True)
+
+    assert reader.read_line() == "CPS, 5, CPM, 300, uSv/hr, 0.05, INST"
+    assert reader.discarded_bytes == 5000
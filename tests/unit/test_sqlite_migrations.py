@@ -0,0 +1,162 @@
+# filename: tests/unit/test_sqlite_migrations.py
+
+import sqlite3
+
+from app import sqlite_store
+from app.sqlite_store import (
+    SCHEMA,
+    SCHEMA_VERSION,
+    backfill_rollups,
+    initialize_db,
+    migrate,
+)
+
+
+def _index_names(conn):
+    rows = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index'"
+    ).fetchall()
+    return {r[0] for r in rows}
+
+
+def test_initialize_db_sets_current_schema_version(temp_db):
+    conn = sqlite3.connect(temp_db)
+    try:
+        (version,) = conn.execute("PRAGMA user_version").fetchone()
+        assert version == SCHEMA_VERSION
+        assert "idx_geiger_readings_unpushed" in _index_names(conn)
+    finally:
+        conn.close()
+
+
+def test_migrate_upgrades_legacy_database(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute(SCHEMA)
+    conn.execute(
+        """
+        INSERT INTO geiger_readings (
+            raw, counts_per_second, counts_per_minute,
+            microsieverts_per_hour, mode, device_id, timestamp, pushed
+        ) VALUES ('RAW', 1, 60, 0.1, 'SLOW', 'legacy', '2025-01-01T00:00:00', 0)
+        """
+    )
+    conn.commit()
+
+    assert migrate(conn) == SCHEMA_VERSION
+    assert "idx_geiger_readings_unpushed" in _index_names(conn)
+
+    # Existing data survives and migrating again is a no-op
+    assert migrate(conn) == SCHEMA_VERSION
+    (count,) = conn.execute("SELECT COUNT(*) FROM geiger_readings").fetchone()
+    assert count == 1
+    conn.close()
+
+
+def test_unpushed_lookup_uses_partial_index(temp_db):
+    initialize_db(temp_db)
+    conn = sqlite3.connect(temp_db)
+    try:
+        plan = conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT id FROM geiger_readings
+            WHERE pushed = 0 AND id > 0
+            ORDER BY id ASC LIMIT 100
+            """
+        ).fetchall()
+    finally:
+        conn.close()
+
+    assert any("idx_geiger_readings_unpushed" in row[-1] for row in plan)
+
+
+def test_time_window_page_uses_timestamp_index_without_sort(temp_db):
+    conn = sqlite3.connect(temp_db)
+    try:
+        plan = conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT * FROM geiger_readings
+            WHERE timestamp >= ? AND timestamp < ?
+              AND timestamp <= ? AND (timestamp < ? OR id < ?)
+            ORDER BY timestamp DESC, id DESC LIMIT 100
+            """,
+            ("a", "z", "m", "m", 10),
+        ).fetchall()
+    finally:
+        conn.close()
+
+    details = " ".join(row[-1] for row in plan)
+    assert "idx_geiger_readings_timestamp" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_migration_backfills_rollups_from_existing_rows(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute(SCHEMA)
+    conn.executemany(
+        """
+        INSERT INTO geiger_readings (
+            raw, counts_per_second, counts_per_minute,
+            microsieverts_per_hour, mode, device_id, timestamp, pushed
+        ) VALUES ('RAW', 1, ?, 0.1, 'SLOW', 'legacy', ?, 1)
+        """,
+        [
+            (60, "2025-01-01T00:00:10+00:00"),
+            (120, "2025-01-01T00:00:50.5+00:00"),
+            (90, "2025-01-01T00:01:00+00:00"),
+        ],
+    )
+    conn.commit()
+
+    migrate(conn)
+    rows = conn.execute(
+        """
+        SELECT bucket_start, count, cpm_min, cpm_max
+        FROM geiger_rollups
+        WHERE bucket_seconds = 60
+        ORDER BY bucket_start
+        """
+    ).fetchall()
+    conn.close()
+
+    assert rows == [(1735689600, 2, 60, 120), (1735689660, 1, 90, 90)]
+
+
+def test_rollup_backfill_commits_in_chunks_and_resumes(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute(SCHEMA)
+    conn.executemany(
+        """
+        INSERT INTO geiger_readings (
+            raw, counts_per_second, counts_per_minute,
+            microsieverts_per_hour, mode, device_id, timestamp, pushed
+        ) VALUES ('RAW', 1, ?, 0.1, 'SLOW', 'legacy', '2025-01-01T00:00:10', 1)
+        """,
+        [(60 + i,) for i in range(5)],
+    )
+    conn.commit()
+
+    # Schema migrated, backfill interrupted before its first chunk
+    monkeypatch.setattr(sqlite_store, "backfill_rollups", lambda conn: 0)
+    migrate(conn)
+    monkeypatch.undo()
+    assert conn.execute("SELECT COUNT(*) FROM geiger_rollups").fetchone() == (0,)
+
+    assert backfill_rollups(conn, chunk_rows=2) == 3
+    assert backfill_rollups(conn, chunk_rows=2) == 0
+    (pending,) = conn.execute("SELECT COUNT(*) FROM geiger_rollups_backfill").fetchone()
+    row = conn.execute(
+        """
+        SELECT count, cpm_min, cpm_max
+        FROM geiger_rollups
+        WHERE bucket_seconds = 60
+        """
+    ).fetchone()
+    conn.close()
+
+    assert pending == 0
+    assert row == (5, 60, 64)
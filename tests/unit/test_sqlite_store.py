@@ -0,0 +1,68 @@
+# filename: tests/unit/test_sqlite_store.py
+
+from datetime import datetime, timezone
+
+from app.models import GeigerRecord
+from app.sqlite_store import (
+    SQLiteStore,
+    connect,
+    get_store,
+    get_unpushed_records,
+    insert_record,
+    mark_records_pushed,
+)
+
+
+def _record(cps, pushed=False):
+    return GeigerRecord(
+        id=None,
+        raw="RAW",
+        counts_per_second=cps,
+        counts_per_minute=cps * 60,
+        microsieverts_per_hour=0.1,
+        mode="SLOW",
+        device_id="test",
+        timestamp=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        pushed=pushed,
+    )
+
+
+def test_connect_applies_canonical_pragmas(temp_db):
+    conn = connect(temp_db)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -8192
+    finally:
+        conn.close()
+
+
+def test_store_round_trip(temp_db):
+    store = SQLiteStore(temp_db)
+    try:
+        first = store.insert_record(_record(1))
+        second = store.insert_record(_record(2, pushed=True))
+
+        assert (first, second) == (1, 2)
+        assert store.max_id() == 2
+        assert [r.id for r in store.get_unpushed_records()] == [1]
+
+        store.mark_records_pushed([1])
+        assert store.get_unpushed_records() == []
+    finally:
+        store.close()
+
+
+def test_module_functions_share_one_store(temp_db):
+    insert_record(temp_db, _record(1))
+    insert_record(temp_db, _record(2))
+
+    store = get_store(temp_db)
+    assert get_store(temp_db) is store
+
+    unpushed = get_unpushed_records(temp_db)
+    assert [r.counts_per_second for r in unpushed] == [1, 2]
+
+    mark_records_pushed(temp_db, [r.id for r in unpushed])
+    assert get_unpushed_records(temp_db) == []
@@ -0,0 +1,188 @@
+# filename: tests/unit/test_telemetry.py
+
+import json
+import logging
+import queue
+import threading
+
+from app.ingestion.geiger_reader import build_parser, build_telemetry_handler
+from app.logging import setup_console_logging, shutdown_logging
+from app.logging_telemetry import TelemetryHandler, TelemetryWorker
+from app.telemetry_spool import TelemetrySpool
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeSession:
+    connect_timeout = 1.0
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self.batches = []
+        self.posted = threading.Event()
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status == 200:
+            self.batches.append(json.loads(data))
+        self.posted.set()
+        return FakeResponse(status)
+
+
+def _worker(session, batch_size=3, linger=60.0, maxsize=100):
+    q = queue.Queue(maxsize=maxsize)
+    worker = TelemetryWorker(
+        q,
+        "http://telemetry",
+        "t",
+        batch_size=batch_size,
+        session=session,
+        linger=linger,
+    )
+    return q, worker
+
+
+def test_batch_sent_when_full_without_waiting_for_linger():
+    session = FakeSession()
+    q, worker = _worker(session, batch_size=3, linger=60.0)
+    worker.start()
+    for i in range(3):
+        q.put({"n": i})
+
+    assert session.posted.wait(2.0)
+    assert session.batches == [[{"n": 0}, {"n": 1}, {"n": 2}]]
+    assert worker.stop(2.0)
+
+
+def test_partial_batch_sent_after_linger():
+    session = FakeSession()
+    q, worker = _worker(session, batch_size=100, linger=0.05)
+    worker.start()
+    q.put({"n": 0})
+
+    assert session.posted.wait(2.0)
+    assert session.batches == [[{"n": 0}]]
+    assert worker.stats()["sent"] == 1
+    assert worker.stop(2.0)
+
+
+def test_stop_wakes_idle_worker_and_flushes_queue():
+    session = FakeSession()
+    q, worker = _worker(session, batch_size=2, linger=60.0)
+    for i in range(5):
+        q.put({"n": i})
+
+    # Not started yet: everything is still queued, stop drains it
+    worker.start()
+    assert worker.stop(2.0)
+
+    sent = [e["n"] for batch in session.batches for e in batch]
+    assert sent == [0, 1, 2, 3, 4]
+    assert worker.stats()["sent"] == 5
+    assert worker.stats()["dropped"] == 0
+
+
+def test_failed_batch_is_retried_not_lost():
+    session = FakeSession(statuses=[500])
+    q, worker = _worker(session, batch_size=1, linger=0.0)
+    worker._deliver([{"n": 0}])
+
+    assert session.batches == [[{"n": 0}]]
+    assert worker.retried == 1
+    assert worker.sent == 1
+
+
+def test_unsent_events_counted_as_dropped_on_stop():
+    session = FakeSession(statuses=[500] * 10)
+    q, worker = _worker(session, batch_size=2, linger=60.0)
+    for i in range(3):
+        q.put({"n": i})
+    worker.start()
+
+    assert worker.stop(0.5)
+    assert worker.sent == 0
+    assert worker.dropped == 3
+
+
+def test_handler_counts_queue_overflow():
+    session = FakeSession()
+    handler = TelemetryHandler("http://telemetry", "t", session=session, linger=0.0)
+    try:
+        # The worker keeps waiting on its own queue; nothing drains this one
+        handler.q = queue.Queue(maxsize=1)
+        record = logging.LogRecord("x", logging.INFO, __file__, 1, "m", (), None)
+        handler.emit(record)
+        handler.emit(record)
+        assert handler.stats()["dropped"] == 1
+    finally:
+        handler.close()
+
+
+def test_outage_spools_to_disk_and_drains_in_order(tmp_path):
+    session = FakeSession(statuses=[500])
+    spool = TelemetrySpool(str(tmp_path))
+    q = queue.Queue(maxsize=100)
+    worker = TelemetryWorker(
+        q, "http://telemetry", "t", batch_size=2, session=session, spool=spool
+    )
+    worker._backoff = 0.01
+
+    # The first send fails: the batch goes to disk, not back into memory
+    worker._deliver([{"n": 0}, {"n": 1}])
+    assert len(spool) == 2
+    for i in range(2, 5):
+        q.put({"n": i})
+
+    while len(spool):
+        worker._drain_spool()
+
+    sent = [e["n"] for batch in session.batches for e in batch]
+    assert sent == [0, 1, 2, 3, 4]
+    assert worker.stats()["spooled"] == 5
+    assert worker.stats()["spool_pending"] == 0
+
+
+def test_handler_overflow_goes_to_spool(tmp_path):
+    handler = TelemetryHandler(
+        "http://telemetry", "t", session=FakeSession(), spool_dir=str(tmp_path)
+    )
+    # The worker keeps waiting on its own queue; nothing drains this one
+    handler.q = queue.Queue(maxsize=1)
+    record = logging.LogRecord("x", logging.INFO, __file__, 1, "m", (), None)
+    handler.emit(record)
+    handler.emit(record)
+
+    stats = handler.stats()
+    assert stats["dropped"] == 0
+    assert stats["spool_pending"] == 1
+    handler.close()
+
+
+def test_agent_cli_attaches_telemetry_handler(tmp_path):
+    base = ["--device-type", "mightyohm", "--db", "x.db", "--api-url", "u"]
+    base += ["--device-id", "pi"]
+    parser = build_parser()
+    assert build_telemetry_handler(parser.parse_args(base)) is None
+
+    args = parser.parse_args(
+        base
+        + ["--telemetry-url", "http://telemetry", "--telemetry-token", "t"]
+        + ["--telemetry-spool-dir", str(tmp_path / "spool")]
+        + ["--telemetry-encoding", "gzip"]
+    )
+    session = FakeSession()
+    handler = build_telemetry_handler(args, session=session)
+    try:
+        assert handler.worker.spool is not None
+        assert handler.wire_stats()["encoding"] == "gzip"
+        setup_console_logging("INFO", handlers=[handler])
+        logging.getLogger("pi_log.test").warning("agent_started")
+    finally:
+        shutdown_logging()
+        handler.close()
+
+    events = [e for batch in session.batches for e in batch]
+    assert [e["msg"] for e in events] == ["agent_started"]
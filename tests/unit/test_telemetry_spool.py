@@ -0,0 +1,87 @@
+# filename: tests/unit/test_telemetry_spool.py
+
+import os
+
+from app.telemetry_spool import TelemetrySpool
+
+
+def _events(start, n):
+    return [{"n": i, "msg": "push_ok"} for i in range(start, start + n)]
+
+
+def _segments(path):
+    return sorted(p for p in os.listdir(path) if p.endswith(".seg"))
+
+
+def test_read_does_not_consume_until_ack(tmp_path):
+    spool = TelemetrySpool(str(tmp_path))
+    spool.append(_events(0, 5))
+
+    events, position = spool.read(3)
+    assert [e["n"] for e in events] == [0, 1, 2]
+    # Not acked: the same batch comes back
+    assert spool.read(3)[0] == events
+    assert len(spool) == 5
+
+    spool.ack(position)
+    events, position = spool.read(10)
+    assert [e["n"] for e in events] == [3, 4]
+    assert len(spool) == 2
+
+
+def test_backlog_survives_restart(tmp_path):
+    spool = TelemetrySpool(str(tmp_path), segment_bytes=64, max_bytes=1 << 20)
+    spool.append(_events(0, 10))
+    _events_read, position = spool.read(4)
+    spool.ack(position)
+    spool.close()
+
+    reopened = TelemetrySpool(str(tmp_path), segment_bytes=64, max_bytes=1 << 20)
+    assert len(reopened) == 6
+    events, _position = reopened.read(100)
+    assert [e["n"] for e in events] == [4, 5, 6, 7, 8, 9]
+
+
+def test_segments_roll_and_are_compacted(tmp_path):
+    spool = TelemetrySpool(str(tmp_path), segment_bytes=64, max_bytes=1 << 20)
+    for i in range(10):
+        spool.append(_events(i, 1))
+    assert len(_segments(tmp_path)) > 3
+
+    events, position = spool.read(100)
+    assert [e["n"] for e in events] == list(range(10))
+    spool.ack(position)
+
+    # Fully drained: a single empty segment remains
+    assert len(spool) == 0
+    assert len(_segments(tmp_path)) == 1
+    assert spool.size_bytes == 0
+
+
+def test_size_limit_drops_oldest_segment(tmp_path):
+    spool = TelemetrySpool(str(tmp_path), segment_bytes=64, max_bytes=128)
+    for i in range(10):
+        spool.append(_events(i, 1))
+
+    assert spool.size_bytes <= 128 + 64
+    assert spool.dropped > 0
+    events, _position = spool.read(100)
+    assert len(events) == len(spool) == 10 - spool.dropped
+    # What survives is the newest, in order
+    assert [e["n"] for e in events] == list(range(spool.dropped, 10))
+
+
+def test_torn_tail_is_truncated_on_open(tmp_path):
+    spool = TelemetrySpool(str(tmp_path))
+    spool.append(_events(0, 2))
+    spool.close()
+
+    with open(tmp_path / _segments(tmp_path)[-1], "ab") as f:
+        f.write(b'{"n": 2, "msg": "pu')
+
+    reopened = TelemetrySpool(str(tmp_path))
+    assert len(reopened) == 2
+    reopened.append(_events(3, 1))
+    events, _position = reopened.read(10)
+    assert [e["n"] for e in events] == [0, 1, 3]
+    assert reopened.corrupt == 0
@@ -0,0 +1,134 @@
+# filename: tests/unit/test_wire.py
+
+import gzip
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app.ingestion.api_client import PushClient
+from app.models import GeigerRecord
+from app.wire import (
+    COLUMNAR_CONTENT_TYPE,
+    BodyEncoder,
+    from_columnar,
+    to_columnar,
+)
+
+
+def _records(n):
+    now = datetime.now(timezone.utc)
+    return [
+        GeigerRecord(i, "RAW", 10 + i, 600 + i, 0.1, "slow", "pi-log", now)
+        for i in range(n)
+    ]
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class FakeSession:
+    connect_timeout = 1.0
+
+    def __init__(self, responses=()):
+        self.responses = list(responses)
+        self.requests = []
+
+    def post(self, url, data=None, headers=None, **kwargs):
+        self.requests.append((data, headers))
+        return self.responses.pop(0) if self.responses else FakeResponse(200)
+
+
+def _decode(data, headers):
+    if headers.get("Content-Encoding") == "gzip":
+        data = gzip.decompress(data)
+    return json.loads(data)
+
+
+def test_columnar_round_trips_to_logexp_payloads():
+    records = _records(3)
+    columns = to_columnar(records)
+
+    assert columns["count"] == 3
+    assert columns["counts_per_second"] == [10, 11, 12]
+    assert columns["mode"] == ["SLOW"] * 3
+    assert from_columnar(columns) == [r.to_logexp_payload() for r in records]
+
+
+def test_small_bodies_are_not_compressed():
+    wire = BodyEncoder("gzip", min_size=100)
+
+    data, headers = wire.encode(b"[]")
+    assert data == b"[]" and "Content-Encoding" not in headers
+
+    body = json.dumps([{"cps": i} for i in range(50)]).encode()
+    data, headers = wire.encode(body)
+    assert headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(data) == body
+    assert wire.bytes_sent < wire.bytes_raw
+
+
+def test_415_steps_down_encoding_then_format():
+    session = FakeSession([FakeResponse(415), FakeResponse(415)])
+    wire = BodyEncoder("gzip", "columnar", min_size=0)
+    records = _records(5)
+
+    resp = wire.post(session, "http://x", lambda: wire.encode_records(records))
+
+    assert resp.status_code == 200
+    sent = [h for _data, h in session.requests]
+    assert sent[0]["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in sent[1]
+    assert sent[1]["Content-Type"] == COLUMNAR_CONTENT_TYPE
+    assert sent[2]["Content-Type"] == "application/json"
+    # The same batch arrives, in the format the server understands
+    data, headers = session.requests[2]
+    assert _decode(data, headers) == [r.to_logexp_payload() for r in records]
+    # Remembered for the next request
+    assert (wire.encoding, wire.batch_format) == ("identity", "rows")
+
+
+def test_415_with_accept_encoding_about_format_keeps_compression():
+    session = FakeSession([FakeResponse(415, {"Accept-Encoding": "gzip"})])
+    wire = BodyEncoder("gzip", "columnar", min_size=0)
+
+    wire.post(session, "http://x", lambda: wire.encode_records(_records(5)))
+
+    assert (wire.encoding, wire.batch_format) == ("gzip", "rows")
+
+
+def test_unknown_encoding_rejected():
+    with pytest.raises(ValueError):
+        BodyEncoder("brotli")
+
+
+def test_push_batch_sends_columnar_gzip(tmp_path):
+    session = FakeSession()
+    client = PushClient(
+        api_url="http://example.com/ingest",
+        api_token="TOKEN",
+        device_id="pi-log",
+        db_path=str(tmp_path / "test.db"),
+        session=session,
+        content_encoding="gzip",
+        batch_format="columnar",
+    )
+    try:
+        records = _records(20)
+        assert client.push_batch(records)
+    finally:
+        client.close()
+
+    data, headers = session.requests[0]
+    assert headers["Authorization"] == "Bearer TOKEN"
+    assert headers["Content-Type"] == COLUMNAR_CONTENT_TYPE
+    assert from_columnar(_decode(data, headers)) == [
+        r.to_logexp_payload() for r in records
+    ]